@@ -0,0 +1,34 @@
+import os
+import schedule_runner
+
+# gunicorn settings for the backend, read from this directory by startup.sh.
+#
+# The schedule run event stream (/api/schedule/run/<id>/events) keeps its request open until the run
+# finishes, which would tie up a sync worker for the whole run. Requests are therefore served by threads,
+# so an open stream only holds one thread; each worker serves up to `threads` requests at a time.
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+
+
+# Runs are executed by a pool inside a worker (see schedule_runner), so runs still queued or running when
+# the server went down will never finish; fail them before the workers start
+def on_starting(server):
+    try:
+        count = schedule_runner.fail_orphaned_runs()
+    except Exception as e:
+        server.log.error(f"Could not fail orphaned schedule runs: {e}")
+        return
+    if count:
+        server.log.info(f"Marked {count} orphaned schedule runs failed")
+
+
+# A worker that exits (recycled after max_requests, killed after a timeout or crashed) takes its pool and
+# the runs in it along; fail the runs it queued rather than leave them running until the next restart
+def child_exit(server, worker):
+    try:
+        count = schedule_runner.fail_worker_runs(worker.pid)
+    except Exception as e:
+        server.log.error(f"Could not fail the schedule runs of worker {worker.pid}: {e}")
+        return
+    if count:
+        server.log.info(f"Marked {count} schedule runs of worker {worker.pid} failed")
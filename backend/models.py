@@ -8,6 +8,36 @@ class Schedule(db.Model):
     end_time = db.Column(db.DateTime, nullable=False)
     resources_used = db.Column(db.String, nullable=False)
 
+class ScheduleRun(db.Model):
+    __tablename__ = 'schedule_run'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    started_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime)
+    status = db.Column(db.String(20), nullable=False)  # QUEUED, RUNNING, SUCCEEDED or FAILED
+    error = db.Column(db.Text)
+    progress = db.Column(db.String(20))  # Current phase while running
+    stop_requested = db.Column(db.Boolean, default=False)  # Set by the API; the run keeps its best incumbent
+    log = db.Column(db.Text)  # Log of the run, written by runs started from the API
+    worker_pid = db.Column(db.Integer)  # Server worker whose pool executes a run started from the API
+    engine = db.Column(db.String(20))
+    task_count = db.Column(db.Integer)
+    makespan = db.Column(db.Integer)
+    best_bound = db.Column(db.Float)
+    gap = db.Column(db.Float)
+    solver_status = db.Column(db.String(20))
+    solver_wall_time = db.Column(db.Float)
+    conflicts = db.Column(db.BigInteger)
+    branches = db.Column(db.BigInteger)
+    variables = db.Column(db.Integer)
+    constraints = db.Column(db.Integer)
+    intervals = db.Column(db.Integer)
+    peak_rss_mb = db.Column(db.Float)  # Over the run's phases, in the scheduling process
+    peak_rss_scope = db.Column(db.String(10))  # "phase", or "process" when peak_rss_mb is the process's peak
+    worker_peak_rss_mb = db.Column(db.Float)  # Largest pool process of a decomposed solve
+    phases = db.Column(db.Text)  # JSON list of {name, seconds, baseline_rss_mb, peak_rss_mb, peak_scope}
+    solver_stats = db.Column(db.Text)  # JSON
+    solver_config = db.Column(db.Text)  # JSON
+
 class Calendar(db.Model):
     __tablename__ = 'calendar'
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -15,6 +45,27 @@ class Calendar(db.Model):
     start_time = db.Column(db.Time, nullable=False)
     end_time = db.Column(db.Time, nullable=False)
 
+# Working hours of a resource that does not work the shop's hours; a resource with rows here is off on
+# the weekdays it has no row for
+class ResourceCalendar(db.Model):
+    __tablename__ = 'resource_calendar'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    resource_id = db.Column(db.Integer, db.ForeignKey('resource.id'), nullable=False)
+    weekday = db.Column(db.Integer, nullable=False)
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=False)
+    resource = db.relationship('Resource', backref='calendar')
+
+# Dated unavailability: leave or maintenance of one resource, or without a resource a shop-wide holiday
+class CalendarException(db.Model):
+    __tablename__ = 'calendar_exception'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    resource_id = db.Column(db.Integer, db.ForeignKey('resource.id'))
+    start_time = db.Column(db.DateTime, nullable=False)
+    end_time = db.Column(db.DateTime, nullable=False)
+    reason = db.Column(db.String(255))
+    resource = db.relationship('Resource', backref='calendar_exceptions')
+
 class Resource(db.Model):
     __tablename__ = 'resource'
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -25,6 +76,7 @@ class ResourceGroup(db.Model):
     __tablename__ = 'resource_group'
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(50), nullable=False)
+    interchangeable = db.Column(db.Boolean, nullable=False, default=False)  # Members are identical to the scheduler
 
 class ResourceGroupAssociation(db.Model):
     __tablename__ = 'resource_group_association'
@@ -73,6 +125,8 @@ class Job(db.Model):
     customer = db.Column(db.String(100), nullable=False)
     completed = db.Column(db.Boolean, nullable=False, default=False)
     blocked = db.Column(db.Boolean, nullable=False, default=False)
+    # The scheduler only reads open jobs
+    __table_args__ = (db.Index('ix_job_open', 'job_number', postgresql_where=db.text('NOT completed AND NOT blocked')),)
 
 class Task(db.Model):
     __tablename__ = 'task'
@@ -86,6 +140,8 @@ class Task(db.Model):
     resources = db.Column(db.String(255))
     completed = db.Column(db.Boolean, nullable=False, default=False)
     job = db.relationship('Job', backref='tasks')
+    # The scheduler only reads incomplete tasks, joined to their job
+    __table_args__ = (db.Index('ix_task_open_job_number', 'job_number', postgresql_where=db.text('NOT completed')),)
 
 class Material(db.Model):
     __tablename__ = 'material'
@@ -1,7 +1,12 @@
 from app import app, db, logger
 from datetime import datetime
-from models import Schedule, Calendar, Resource, ResourceGroup, ResourceGroupAssociation, Template, TemplateMaterial, TemplateTask, Job, Task, Material
-from flask import jsonify, request
+import json
+import os
+from models import Schedule, ScheduleRun, Calendar, ResourceCalendar, CalendarException, Resource, ResourceGroup, ResourceGroupAssociation, Template, TemplateMaterial, TemplateTask, Job, Task, Material
+from flask import Response, jsonify, request, stream_with_context
+import time
+from schedule_runner import get_runner
+from solver_config import SolverConfig, parse_flag
 
 @app.route('/api/schedule', methods=['GET'])
 def get_schedule():
@@ -19,6 +24,146 @@ def get_schedule():
         logger.error(f"Error fetching schedule: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def schedule_run_to_dict(r):
+    return {
+        'id': r.id,
+        'started_at': r.started_at.isoformat(),
+        'finished_at': r.finished_at.isoformat() if r.finished_at else None,
+        'status': r.status,
+        'error': r.error,
+        'progress': r.progress,
+        'stop_requested': bool(r.stop_requested),
+        'engine': r.engine,
+        'task_count': r.task_count,
+        'makespan': r.makespan,
+        'best_bound': r.best_bound,
+        'gap': r.gap,
+        'solver_status': r.solver_status,
+        'solver_wall_time': r.solver_wall_time,
+        'conflicts': r.conflicts,
+        'branches': r.branches,
+        'variables': r.variables,
+        'constraints': r.constraints,
+        'intervals': r.intervals,
+        'peak_rss_mb': r.peak_rss_mb,
+        'peak_rss_scope': r.peak_rss_scope,
+        'worker_peak_rss_mb': r.worker_peak_rss_mb,
+        'phases': json.loads(r.phases) if r.phases else [],
+        'solver_stats': json.loads(r.solver_stats) if r.solver_stats else {},
+        'solver_config': json.loads(r.solver_config) if r.solver_config else {}
+    }
+
+@app.route('/api/schedule_run', methods=['GET'], endpoint='get_schedule_runs')
+def get_schedule_runs():
+    try:
+        limit = request.args.get('limit', 50, type=int)
+        logger.info("Fetching schedule run statistics")
+        runs = ScheduleRun.query.order_by(ScheduleRun.started_at.desc()).limit(limit).all()
+        return jsonify([schedule_run_to_dict(r) for r in runs])
+    except Exception as e:
+        logger.error(f"Error fetching schedule runs: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/schedule_run/<int:id>', methods=['GET'], endpoint='get_schedule_run')
+def get_schedule_run(id):
+    try:
+        run = ScheduleRun.query.get_or_404(id)
+        return jsonify(schedule_run_to_dict(run))
+    except Exception as e:
+        logger.error(f"Error fetching schedule run {id}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/schedule/run', methods=['POST'], endpoint='start_schedule_run')
+def start_schedule_run():
+    try:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object")
+        params = {
+            'start_date': data.get('start_date') or datetime.now().strftime('%Y-%m-%d'),
+            'incremental': parse_flag(False if data.get('incremental') is None else data['incremental']),
+            'warm_start': parse_flag(True if data.get('warm_start') is None else data['warm_start']),
+            'solver': SolverConfig.coerce(data.get('solver') or {})
+        }
+        if data.get('freeze_hours') is not None:
+            params['freeze_hours'] = float(data['freeze_hours'])
+        # Reject bad dates and solver settings before queueing, as the worker would only fail on them later
+        datetime.strptime(params['start_date'], '%Y-%m-%d')
+        SolverConfig.from_env().updated(params['solver'])
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f"Invalid run parameters: {str(e)}"}), 400
+    try:
+        run = ScheduleRun(started_at=datetime.now(), status='QUEUED', progress='queued',
+                          solver_config=json.dumps(params['solver']), worker_pid=os.getpid())
+        db.session.add(run)
+        db.session.commit()
+        try:
+            get_runner().submit(run.id, params)
+        except Exception as e:
+            run.status, run.error, run.finished_at = 'FAILED', str(e), datetime.now()
+            db.session.commit()
+            raise
+        logger.info(f"Queued schedule run {run.id}")
+        return jsonify({'id': run.id, 'status': run.status}), 202
+    except Exception as e:
+        logger.error(f"Error queueing schedule run: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/schedule/run/<int:id>', methods=['GET'], endpoint='get_schedule_run_status')
+def get_schedule_run_status(id):
+    try:
+        run = ScheduleRun.query.get_or_404(id)
+        return jsonify(dict(schedule_run_to_dict(run), log=run.log.splitlines() if run.log else []))
+    except Exception as e:
+        logger.error(f"Error fetching schedule run {id}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/schedule/run/<int:id>/stop', methods=['POST'], endpoint='stop_schedule_run')
+def stop_schedule_run(id):
+    try:
+        run = ScheduleRun.query.get_or_404(id)
+        if run.status not in ('QUEUED', 'RUNNING'):
+            return jsonify({'error': f"Run {id} has already finished", 'status': run.status}), 409
+        run.stop_requested = True
+        db.session.commit()
+        logger.info(f"Stop requested for schedule run {id}")
+        return jsonify({'id': run.id, 'status': run.status, 'stop_requested': True}), 202
+    except Exception as e:
+        logger.error(f"Error stopping schedule run {id}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# Seconds between checks of a run's row by the event stream
+RUN_EVENT_INTERVAL = 1.0
+
+# Server-sent events for one run: an event whenever its status, phase or incumbent changes, with the log
+# lines added since the previous event, until the run has finished; a "gone" event ends the stream when
+# the run is deleted meanwhile. The stream holds its worker thread for the whole run, hence the threaded
+# gunicorn workers (see gunicorn.conf.py).
+@app.route('/api/schedule/run/<int:id>/events', methods=['GET'], endpoint='get_schedule_run_events')
+def get_schedule_run_events(id):
+    ScheduleRun.query.get_or_404(id)
+
+    def events():
+        sent, lines_sent = None, 0
+        while True:
+            db.session.expire_all()
+            run = db.session.get(ScheduleRun, id)
+            if run is None:
+                yield f"event: gone\ndata: {json.dumps({'id': id})}\n\n"
+                return
+            state = schedule_run_to_dict(run)
+            lines = run.log.splitlines() if run.log else []
+            if state != sent or len(lines) > lines_sent:
+                yield f"data: {json.dumps(dict(state, log=lines[lines_sent:]))}\n\n"
+                sent, lines_sent = state, len(lines)
+            if run.status not in ('QUEUED', 'RUNNING'):
+                yield "event: end\ndata: {}\n\n"
+                return
+            time.sleep(RUN_EVENT_INTERVAL)
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/working_hours', methods=['GET'])
 def get_working_hours():
     try:
@@ -93,6 +238,140 @@ def delete_calendar(id):
         logger.error(f"Error deleting calendar entry: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# Resource Calendar Endpoints
+@app.route('/api/resource_calendar', methods=['GET'], endpoint='get_resource_calendar')
+def get_resource_calendar():
+    try:
+        logger.info("Fetching resource calendar data")
+        entries = ResourceCalendar.query.all()
+        return jsonify([{
+            'id': c.id,
+            'resource_id': c.resource_id,
+            'weekday': c.weekday,
+            'start_time': c.start_time.strftime('%H:%M'),
+            'end_time': c.end_time.strftime('%H:%M')
+        } for c in entries])
+    except Exception as e:
+        logger.error(f"Error fetching resource calendar: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/resource_calendar', methods=['POST'], endpoint='add_resource_calendar')
+def add_resource_calendar():
+    try:
+        data = request.get_json()
+        new_entry = ResourceCalendar(
+            resource_id=data['resource_id'],
+            weekday=data['weekday'],
+            start_time=datetime.strptime(data['start_time'], '%H:%M').time(),
+            end_time=datetime.strptime(data['end_time'], '%H:%M').time()
+        )
+        db.session.add(new_entry)
+        db.session.commit()
+        logger.info("Added new resource calendar entry")
+        return jsonify({'message': 'Resource calendar entry added successfully', 'id': new_entry.id}), 201
+    except Exception as e:
+        logger.error(f"Error adding resource calendar entry: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/resource_calendar/<int:id>', methods=['PUT'], endpoint='update_resource_calendar')
+def update_resource_calendar(id):
+    try:
+        data = request.get_json()
+        entry = ResourceCalendar.query.get_or_404(id)
+        entry.resource_id = data['resource_id']
+        entry.weekday = data['weekday']
+        entry.start_time = datetime.strptime(data['start_time'], '%H:%M').time()
+        entry.end_time = datetime.strptime(data['end_time'], '%H:%M').time()
+        db.session.commit()
+        logger.info(f"Updated resource calendar entry with id {id}")
+        return jsonify({'message': 'Resource calendar entry updated successfully'})
+    except Exception as e:
+        logger.error(f"Error updating resource calendar entry: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/resource_calendar/<int:id>', methods=['DELETE'], endpoint='delete_resource_calendar')
+def delete_resource_calendar(id):
+    try:
+        entry = ResourceCalendar.query.get_or_404(id)
+        db.session.delete(entry)
+        db.session.commit()
+        logger.info(f"Deleted resource calendar entry with id {id}")
+        return jsonify({'message': 'Resource calendar entry deleted successfully'})
+    except Exception as e:
+        logger.error(f"Error deleting resource calendar entry: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+# Calendar Exception Endpoints (holidays, maintenance, leave); resource_id null means the whole shop
+def calendar_exception_to_dict(c):
+    return {
+        'id': c.id,
+        'resource_id': c.resource_id,
+        'start_time': c.start_time.isoformat(),
+        'end_time': c.end_time.isoformat(),
+        'reason': c.reason
+    }
+
+@app.route('/api/calendar_exception', methods=['GET'], endpoint='get_calendar_exceptions')
+def get_calendar_exceptions():
+    try:
+        logger.info("Fetching calendar exceptions")
+        exceptions = CalendarException.query.order_by(CalendarException.start_time).all()
+        return jsonify([calendar_exception_to_dict(c) for c in exceptions])
+    except Exception as e:
+        logger.error(f"Error fetching calendar exceptions: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/calendar_exception', methods=['POST'], endpoint='add_calendar_exception')
+def add_calendar_exception():
+    try:
+        data = request.get_json()
+        new_exception = CalendarException(
+            resource_id=data.get('resource_id'),
+            start_time=datetime.fromisoformat(data['start_time']),
+            end_time=datetime.fromisoformat(data['end_time']),
+            reason=data.get('reason')
+        )
+        if new_exception.end_time <= new_exception.start_time:
+            return jsonify({'error': 'end_time must be after start_time'}), 400
+        db.session.add(new_exception)
+        db.session.commit()
+        logger.info("Added new calendar exception")
+        return jsonify({'message': 'Calendar exception added successfully', 'id': new_exception.id}), 201
+    except Exception as e:
+        logger.error(f"Error adding calendar exception: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/calendar_exception/<int:id>', methods=['PUT'], endpoint='update_calendar_exception')
+def update_calendar_exception(id):
+    try:
+        data = request.get_json()
+        exception = CalendarException.query.get_or_404(id)
+        exception.resource_id = data.get('resource_id')
+        exception.start_time = datetime.fromisoformat(data['start_time'])
+        exception.end_time = datetime.fromisoformat(data['end_time'])
+        exception.reason = data.get('reason')
+        if exception.end_time <= exception.start_time:
+            db.session.rollback()
+            return jsonify({'error': 'end_time must be after start_time'}), 400
+        db.session.commit()
+        logger.info(f"Updated calendar exception with id {id}")
+        return jsonify({'message': 'Calendar exception updated successfully'})
+    except Exception as e:
+        logger.error(f"Error updating calendar exception: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/calendar_exception/<int:id>', methods=['DELETE'], endpoint='delete_calendar_exception')
+def delete_calendar_exception(id):
+    try:
+        exception = CalendarException.query.get_or_404(id)
+        db.session.delete(exception)
+        db.session.commit()
+        logger.info(f"Deleted calendar exception with id {id}")
+        return jsonify({'message': 'Calendar exception deleted successfully'})
+    except Exception as e:
+        logger.error(f"Error deleting calendar exception: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 # Resource Endpoints
 @app.route('/api/resource', methods=['GET'], endpoint='get_resources')
 def get_resources():
@@ -156,6 +435,7 @@ def get_resource_groups():
         return jsonify([{
             'id': g.id,
             'name': g.name,
+            'interchangeable': bool(g.interchangeable),
             'resource_ids': [assoc.resource_id for assoc in g.resource_associations]
         } for g in groups])
     except Exception as e:
@@ -164,9 +444,13 @@ def get_resource_groups():
 
 @app.route('/api/resource_group', methods=['POST'], endpoint='add_resource_group')
 def add_resource_group():
+    data = request.get_json()
     try:
-        data = request.get_json()
-        new_group = ResourceGroup(name=data['name'])
+        interchangeable = parse_flag(False if data.get('interchangeable') is None else data['interchangeable'])
+    except ValueError as e:
+        return jsonify({'error': f"Invalid interchangeable: {str(e)}"}), 400
+    try:
+        new_group = ResourceGroup(name=data['name'], interchangeable=interchangeable)
         db.session.add(new_group)
         db.session.commit()
         logger.info("Added new resource group")
@@ -177,10 +461,16 @@ def add_resource_group():
 
 @app.route('/api/resource_group/<int:id>', methods=['PUT'], endpoint='update_resource_group')
 def update_resource_group(id):
+    data = request.get_json()
+    try:
+        interchangeable = None if data.get('interchangeable') is None else parse_flag(data['interchangeable'])
+    except ValueError as e:
+        return jsonify({'error': f"Invalid interchangeable: {str(e)}"}), 400
     try:
-        data = request.get_json()
         group = ResourceGroup.query.get_or_404(id)
         group.name = data['name']
+        if interchangeable is not None:
+            group.interchangeable = interchangeable
         # Update associated resources
         ResourceGroupAssociation.query.filter_by(group_id=id).delete()
         for resource_id in data.get('resource_ids', []):
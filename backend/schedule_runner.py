@@ -0,0 +1,157 @@
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+from datetime import datetime
+
+# The scheduler modules live in the repository root, one level above the backend
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# How runs are executed: "process" (default) in a pool of worker processes so the solver never blocks
+# the web workers, or "thread" in a background thread of this process, for local testing. Runs in threads
+# keep their logs apart (see run_log.capture_log).
+RUN_MODE = os.getenv("SCHEDULER_RUN_MODE", "process")
+# Number of runs executed at the same time; each run already uses all solver workers
+RUN_WORKERS = int(os.getenv("SCHEDULER_RUN_WORKERS", "1"))
+# Seconds between progress, incumbent and log updates written to schedule_run (and between checks for a
+# stop request) while a run is in progress
+PROGRESS_INTERVAL = 1.0
+# Log lines kept for each run
+RUN_LOG_LINES = 2000
+
+
+# Function to execute one queued run; runs in a worker process (or thread) and reports through the
+# run's schedule_run row. dedicated_process says the run has its process to itself (a pool worker runs
+# one run at a time), so its phases measure their own peak memory (see run_stats.RunStats).
+def execute_run(run_id, params, dedicated_process=False):
+    import schedule_jobs
+    from database import get_engine
+    from schedule_store import stop_requested, update_run
+    from run_log import RingBufferHandler
+    from run_stats import RunStats
+    from solver_config import SolverConfig
+
+    handler = RingBufferHandler(capacity=RUN_LOG_LINES)
+    stats = RunStats(dedicated_process=dedicated_process)
+    finished = threading.Event()
+    stop_event = threading.Event()
+
+    def publish():
+        row = stats.to_row()
+        update_run(get_engine(), run_id, {
+            "status": "RUNNING",
+            "started_at": stats.started_at,
+            "progress": stats.current_phase,
+            "makespan": row["makespan"],
+            "best_bound": row["best_bound"],
+            "gap": row["gap"],
+            "log": handler.getvalue(),
+        }, active_only=True)
+        if not stop_event.is_set() and stop_requested(get_engine(), run_id):
+            stop_event.set()
+
+    def publish_periodically():
+        while not finished.wait(PROGRESS_INTERVAL):
+            publish()
+
+    publish()
+    publisher = threading.Thread(target=publish_periodically, daemon=True)
+    publisher.start()
+    try:
+        solver_config = SolverConfig.from_env().updated(params.get("solver", {}))
+        schedule = schedule_jobs.schedule_jobs(
+            datetime.strptime(params["start_date"], "%Y-%m-%d"), handler,
+            incremental=params.get("incremental", False),
+            freeze_hours=params.get("freeze_hours", schedule_jobs.DEFAULT_FREEZE_HOURS),
+            warm_start=params.get("warm_start", True),
+            solver_config=solver_config, stats=stats, run_id=run_id, stop_event=stop_event,
+        )
+    finally:
+        finished.set()
+        publisher.join()
+        update_run(get_engine(), run_id, {"log": handler.getvalue()})
+    return {"ok": schedule is not None, "task_count": stats.task_count}
+
+
+# Function to mark a run failed when it died outside schedule_jobs (e.g. a crashed worker process)
+def _mark_failed(run_id, error):
+    from database import get_engine
+    from schedule_store import update_run
+    update_run(get_engine(), run_id, {"status": "FAILED", "error": str(error), "finished_at": datetime.now()},
+               active_only=True)
+
+
+# Function to fail the runs a previous server left QUEUED or RUNNING: the pool that was to finish them
+# went away with it. Called once when the server starts, before any worker accepts runs (see
+# gunicorn.conf.py), so runs queued by this server are never touched. Returns the number of runs failed.
+def fail_orphaned_runs():
+    from database import make_engine
+    from schedule_store import fail_active_runs
+    # A short-lived engine: the gunicorn master forks its workers afterwards and must not hand them
+    # open connections
+    engine = make_engine()
+    try:
+        return fail_active_runs(engine, "The server restarted before the run finished", datetime.now())
+    finally:
+        engine.dispose()
+
+
+# Function to fail the runs queued by a server worker that has exited (recycled, killed or crashed): its
+# pool went away with it. Called in the gunicorn master (see gunicorn.conf.py); runs record the process id
+# of the worker that queued them. Returns the number of runs failed.
+def fail_worker_runs(worker_pid):
+    from database import make_engine
+    from schedule_store import fail_active_runs
+    # A short-lived engine, as in fail_orphaned_runs
+    engine = make_engine()
+    try:
+        return fail_active_runs(engine, "The server worker running it exited before the run finished",
+                                datetime.now(), worker_pid=worker_pid)
+    finally:
+        engine.dispose()
+
+
+# Queue of scheduling runs backed by a process pool (or a thread for local testing).
+#
+# The pool stands in for a job queue: runs are executed in submission order, RUN_WORKERS at a time,
+# and everything a client needs (status, progress, incumbent makespan, log) goes through schedule_run,
+# as does a stop request in the other direction.
+class ScheduleRunner:
+    def __init__(self, mode=RUN_MODE, workers=RUN_WORKERS):
+        if mode == "thread":
+            self.pool = ThreadPoolExecutor(max_workers=workers)
+        else:
+            # Spawned workers do not inherit the web server's threads, locks or open connections
+            self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.mode = mode
+        self.futures = {}
+
+    def submit(self, run_id, params):
+        future = self.pool.submit(execute_run, run_id, params, self.mode == "process")
+        self.futures[run_id] = future
+        future.add_done_callback(lambda done: self._done(run_id, done))
+        return future
+
+    def _done(self, run_id, future):
+        self.futures.pop(run_id, None)
+        if future.exception() is not None:
+            _mark_failed(run_id, future.exception())
+
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait=wait)
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+# Function to get this process's runner, created on first use
+def get_runner():
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = ScheduleRunner()
+        return _runner
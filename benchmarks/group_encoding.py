@@ -0,0 +1,95 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ortools.sat.python import cp_model
+from scheduler_model import build_model
+from solver_config import SolverConfig
+
+# Compares the resource-group encodings in scheduler_model.build_model on a synthetic shop:
+#   selector            member-id IntVar + reified equalities per member (the old encoding)
+#   boolean             one boolean per member with an exactly-one constraint
+#   boolean+cumulative  the boolean encoding plus a redundant cumulative per group
+#
+#   python benchmarks/group_encoding.py --jobs 60 --groups 4 --group-size 4 --time-limit 20
+
+ENCODINGS = [("selector", "selector", False), ("boolean", "boolean", False),
+             ("boolean+cumulative", "boolean", True)]
+
+
+# Function to generate chains of tasks where most tasks need one member of a group
+def make_instance(jobs, groups, group_size, seed):
+    rnd = random.Random(seed)
+    resource_mapping = {}
+    resource_group_mapping = {}
+    for g in range(groups):
+        members = []
+        for k in range(group_size):
+            name = f"G{g}R{k}"
+            resource_mapping[name] = len(resource_mapping) + 1
+            members.append(resource_mapping[name])
+        resource_group_mapping[f"Group{g}"] = members
+
+    tasks = []
+    for j in range(jobs):
+        previous = None
+        for t in range(rnd.randint(2, 6)):
+            g = rnd.randrange(groups)
+            choice = rnd.random()
+            if choice < 0.7:
+                resources = [f"Group{g}"]
+            elif choice < 0.9:
+                resources = [f"Group{g}", f"Group{(g + 1) % groups}"]
+            else:
+                resources = [f"G{g}R{rnd.randrange(group_size)}"]
+            tasks.append({
+                "task_id": (f"J{j}", f"J{j}-{(t + 1) * 10}"),
+                "duration": rnd.randint(10, 240),
+                "resources": resources,
+                "predecessor_indices": [previous] if previous is not None else [],
+            })
+            previous = len(tasks) - 1
+    return tasks, resource_mapping, resource_group_mapping
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resource-group encodings")
+    parser.add_argument("--jobs", type=int, default=60)
+    parser.add_argument("--groups", type=int, default=4)
+    parser.add_argument("--group-size", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--time-limit", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    tasks, resource_mapping, resource_group_mapping = make_instance(args.jobs, args.groups, args.group_size, args.seed)
+    config = SolverConfig(max_time_in_seconds=args.time_limit)
+    if args.workers:
+        config.num_workers = args.workers
+    print(f"{len(tasks)} tasks, {args.groups} groups of {args.group_size}, {config.num_workers} workers, "
+          f"{args.time_limit:g}s limit")
+    print(f"{'encoding':<20} {'vars':>7} {'constraints':>11} {'build s':>8} {'solve s':>8} {'status':>9} "
+          f"{'makespan':>9} {'bound':>9}")
+
+    for label, encoding, cumulative in ENCODINGS:
+        build_start = time.perf_counter()
+        built = build_model(tasks, resource_mapping, resource_group_mapping, hint_source="greedy",
+                            group_encoding=encoding, group_cumulative=cumulative, log=lambda *_: None)
+        build_time = time.perf_counter() - build_start
+        proto = built["model"].Proto()
+
+        solver = config.apply(cp_model.CpSolver())
+        status = solver.Solve(built["model"])
+        feasible = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        makespan = solver.Value(built["makespan"]) if feasible else "-"
+        print(f"{label:<20} {len(proto.variables):>7} {len(proto.constraints):>11} {build_time:>8.2f} "
+              f"{solver.WallTime():>8.2f} {solver.StatusName(status):>9} {makespan:>9} "
+              f"{int(solver.BestObjectiveBound()):>9}")
+
+
+if __name__ == "__main__":
+    main()
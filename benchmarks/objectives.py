@@ -0,0 +1,88 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.group_encoding import make_instance
+from greedy_scheduler import greedy_schedule
+from objectives import OBJECTIVES
+from scheduler_model import solve_schedule
+from solver_config import SolverConfig
+
+# Compares the scheduling objectives on a synthetic shop with promised dates and job values. Each
+# objective is solved once with the same time limit; the table shows what every schedule scores on
+# all objectives, so the trade-offs between them are visible side by side. The greedy list schedules
+# with the critical-path and least-slack rules come first as the baseline the solver starts from.
+#
+#   python benchmarks/objectives.py --jobs 500 --time-limit 60
+#   python benchmarks/objectives.py --objectives tardiness tardiness,makespan
+
+DEFAULT_OBJECTIVES = list(OBJECTIVES) + ["tardiness,makespan", "late_jobs,tardiness"]
+
+
+# Function to give every job a due minute and a weight. Due dates are spread over the estimated
+# length of the schedule (total work divided by the number of resources), scaled by tightness, and
+# never before the job's own chain of tasks could finish.
+def add_due_dates(tasks, resource_count, tightness, seed):
+    rnd = random.Random(seed)
+    load = sum(task["duration"] for task in tasks) / max(resource_count, 1)
+    jobs = {}
+    for task in tasks:
+        jobs.setdefault(task["task_id"][0], []).append(task)
+    for job_tasks in jobs.values():
+        chain = sum(task["duration"] for task in job_tasks)
+        due = chain + int(rnd.uniform(0, load * tightness))
+        weight = rnd.randint(1, 100)
+        for task in job_tasks:
+            task["due"] = due
+            task["weight"] = weight
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scheduling objectives")
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--groups", type=int, default=6)
+    parser.add_argument("--group-size", type=int, default=4)
+    parser.add_argument("--tightness", type=float, default=1.5,
+                        help="Due dates are spread over this fraction of the estimated schedule length")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--time-limit", type=float, default=60.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--objectives", nargs="+", default=DEFAULT_OBJECTIVES)
+    args = parser.parse_args()
+
+    tasks, resource_mapping, resource_group_mapping = make_instance(args.jobs, args.groups, args.group_size, args.seed)
+    add_due_dates(tasks, len(resource_mapping), args.tightness, args.seed)
+    print(f"{len(tasks)} tasks in {args.jobs} jobs, {len(resource_mapping)} resources, {args.time_limit:g}s limit")
+    print(f"{'objective':<24} {'status':>9} {'solve s':>8} {'makespan':>9} {'tardiness':>10} {'late':>5} "
+          f"{'w. completion':>14}")
+
+    for priority in ("critical_path", "due_date"):
+        solve_start = time.perf_counter()
+        result = greedy_schedule(tasks, resource_mapping, resource_group_mapping, priority=priority)
+        print_row(f"greedy {priority}", result, time.perf_counter() - solve_start)
+
+    for objective in args.objectives:
+        config = SolverConfig(max_time_in_seconds=args.time_limit, objective=objective)
+        if args.workers:
+            config.num_workers = args.workers
+        solve_start = time.perf_counter()
+        result = solve_schedule(tasks, resource_mapping, resource_group_mapping, config, log=lambda *_: None)
+        print_row(objective, result, time.perf_counter() - solve_start)
+
+
+def print_row(label, result, solve_time):
+    if not result["feasible"]:
+        print(f"{label:<24} {result['status']:>9} {solve_time:>8.2f}")
+        return
+    values = result["objectives"]
+    print(f"{label:<24} {result['status']:>9} {solve_time:>8.2f} {values['makespan']:>9} "
+          f"{values['tardiness']:>10} {values['late_jobs']:>5} {values['weighted_completion']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import csv
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from instance_generator import DEFAULT_START_DATE, generate_instance, jobs_for_tasks
+from objectives import parse_objective
+from run_stats import peak_rss_mb, relative_gap
+from scheduling_core import prepare_problem, solve_problem
+from solver_config import SolverConfig
+
+# Scaling curves for the scheduling core on generated instances, without a database.
+#
+# Every size runs in a fresh process, so the peak memory reported is that size's own. A row records the
+# time to generate and prepare the instance (task table, calendar and downtime), the model build time
+# and the solver time, the objective, bound and gap, the model size and the process's peak memory
+# (and that of the pool processes of a decomposed solve).
+# Keep the CSV of a baseline run and compare later runs against the same sizes, seed and solver flags.
+#
+#   python benchmarks/scaling.py --time-limit 30 --csv scaling.csv
+#   python benchmarks/scaling.py --sizes 50 500 5000 --engine greedy
+#   python benchmarks/scaling.py --part-time 0.2 --holidays 5 --objective tardiness
+
+DEFAULT_SIZES = [50, 100, 200, 500, 1000, 2000, 5000]
+
+CSV_COLUMNS = (
+    "size", "tasks", "jobs", "resources", "engine", "objective", "status", "generate_s", "prepare_s", "build_s",
+    "solve_s", "total_s", "objective_value", "best_bound", "gap", "makespan", "variables", "constraints",
+    "intervals", "components", "peak_rss_mb", "baseline_rss_mb", "worker_peak_rss_mb",
+)
+
+
+# Function to generate, prepare and solve one instance; runs in its own process and returns a CSV row
+def run_size(size, instance_options, solver_config):
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+    options = dict(instance_options)
+    data = generate_instance(jobs=jobs_for_tasks(size, options["tasks_per_job"]), **options)
+    generated = time.perf_counter()
+
+    # The same preparation and solve as schedule_jobs, in scheduling_core
+    problem = prepare_problem(data, options["start_date"], warm_start=False)
+    tasks = problem["tasks"]
+    prepared = time.perf_counter()
+
+    result = solve_problem(problem, solver_config)
+    finished = time.perf_counter()
+
+    objective = best_bound = gap = None
+    if result["feasible"]:
+        name = parse_objective(solver_config.objective)[0]
+        objective = result["objectives"][name]
+        # The greedy engine's bound is a bound on the makespan only
+        if result["engine"] != "greedy" or name == "makespan":
+            best_bound = result.get("best_bound")
+            gap = relative_gap(objective, best_bound)
+    build_time = result.get("build_time", 0.0)
+    return {
+        "size": size,
+        "tasks": len(tasks),
+        "jobs": len(data["jobs"]),
+        "resources": len(data["resources"]),
+        "engine": result["engine"],
+        "objective": solver_config.objective,
+        "status": result["status"],
+        "generate_s": round(generated - started, 4),
+        "prepare_s": round(prepared - generated, 4),
+        # Component models are built in parallel processes, so their summed build time can exceed the wall time
+        "build_s": round(build_time, 4),
+        "solve_s": round(result.get("wall_time", finished - prepared), 4),
+        "total_s": round(finished - started, 4),
+        "objective_value": objective,
+        "best_bound": best_bound,
+        "gap": round(gap, 6) if gap is not None else None,
+        "makespan": result.get("makespan"),
+        "variables": result.get("variables"),
+        "constraints": result.get("constraints"),
+        "intervals": result.get("intervals"),
+        "components": result.get("component_count", result.get("window_count", 1)),
+        "peak_rss_mb": peak_rss_mb(),
+        "baseline_rss_mb": baseline,
+        "worker_peak_rss_mb": result.get("worker_peak_rss_mb"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark how the scheduler scales with instance size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Approximate task counts")
+    parser.add_argument("--csv", default="scaling.csv", help="CSV file to write (- for stdout only)")
+    instance = parser.add_argument_group("instance")
+    instance.add_argument("--instance-seed", type=int, default=1)
+    instance.add_argument("--tasks-per-job", type=int, nargs=2, default=(2, 8), metavar=("MIN", "MAX"))
+    instance.add_argument("--predecessor-density", type=float, default=0.6)
+    instance.add_argument("--groups", type=int, default=6)
+    instance.add_argument("--group-size", type=int, nargs=2, default=(2, 5), metavar=("MIN", "MAX"))
+    instance.add_argument("--standalone", type=int, default=4)
+    instance.add_argument("--interchangeable", type=float, default=0.0)
+    instance.add_argument("--part-time", type=float, default=0.0)
+    instance.add_argument("--holidays", type=int, default=0)
+    instance.add_argument("--due-tightness", type=float, default=1.5)
+    SolverConfig.add_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        solver_config = SolverConfig(max_time_in_seconds=30.0).updated(args)
+    except ValueError as e:
+        parser.error(str(e))
+    instance_options = {
+        "tasks_per_job": tuple(args.tasks_per_job),
+        "predecessor_density": args.predecessor_density,
+        "groups": args.groups,
+        "group_size": tuple(args.group_size),
+        "standalone": args.standalone,
+        "interchangeable": args.interchangeable,
+        "part_time": args.part_time,
+        "holidays": args.holidays,
+        "due_tightness": args.due_tightness,
+        "seed": args.instance_seed,
+        "start_date": DEFAULT_START_DATE,
+    }
+    print(f"Solver parameters: {solver_config.describe()}")
+    print(f"{'size':>6} {'tasks':>6} {'status':>9} {'prepare s':>9} {'build s':>8} {'solve s':>8} {'objective':>11} "
+          f"{'gap':>7} {'peak MB':>8}")
+
+    rows = []
+    context = multiprocessing.get_context("spawn")
+    for size in args.sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            row = pool.submit(run_size, size, instance_options, solver_config).result()
+        rows.append(row)
+        gap = f"{100 * row['gap']:.1f}%" if row["gap"] is not None else "-"
+        objective = f"{row['objective_value']:.0f}" if row["objective_value"] is not None else "-"
+        print(f"{row['size']:>6} {row['tasks']:>6} {row['status']:>9} {row['prepare_s']:>9.3f} {row['build_s']:>8.3f} "
+              f"{row['solve_s']:>8.2f} {objective:>11} {gap:>7} {row['peak_rss_mb']:>8}")
+
+    if args.csv != "-":
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Wrote {len(rows)} rows to {args.csv}")
+    else:
+        writer = csv.DictWriter(sys.stdout, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+import numpy as np
+from run_log import get_logger
+
+logger = get_logger(__name__)
+
+# Number of calendar days indexed up front; the index grows on demand for longer horizons
+DEFAULT_INDEX_DAYS = 365
+# Hard limit on how far the index may grow, to guard against calendars with no working days
+MAX_INDEX_DAYS = 365 * 20
+
+
+# Precomputed mapping between the solver's compressed "working minutes" axis and real datetimes.
+#
+# For every working day from start_date onwards we store the day's date, the minute of the day
+# at which work starts and the cumulative number of working minutes up to the end of that day.
+# Converting an elapsed offset is then a binary search over the cumulative array instead of a
+# day-by-day walk from start_date. Dates in closed_dates (shop-wide holidays) are left out like
+# weekdays without working hours.
+class CalendarIndex:
+    def __init__(self, start_date, working_hours, days=DEFAULT_INDEX_DAYS, closed_dates=()):
+        self.start_date = start_date
+        self.working_hours = working_hours
+        self.closed_dates = set(closed_dates)
+        self.days = 0
+        self.day_offsets = []  # Days since start_date of each working day
+        self.day_starts = []  # Minute of the day at which work starts
+        self.cum_ends = []  # Cumulative working minutes at the end of each working day
+        self._extend(days)
+
+    # Index further calendar days until at least `days` days from start_date are covered
+    def _extend(self, days):
+        days = min(days, MAX_INDEX_DAYS)
+        total = self.cum_ends[-1] if self.cum_ends else 0
+        for day in range(self.days, days):
+            day_date = self.start_date + timedelta(days=day)
+            start_minutes, end_minutes = self.working_hours.get(day_date.isoweekday(), (0, 0))  # 1 = Monday
+            if start_minutes == end_minutes:  # Non-working day
+                continue
+            if self.closed_dates and day_date.date() in self.closed_dates:
+                continue
+            total += end_minutes - start_minutes
+            self.day_offsets.append(day)
+            self.day_starts.append(start_minutes)
+            self.cum_ends.append(total)
+        self.days = max(self.days, days)
+        self._arrays = None
+
+    # Make sure the index reaches the given elapsed offset; returns False if it cannot
+    def ensure_covers(self, elapsed_minutes):
+        while not self.cum_ends or self.cum_ends[-1] < elapsed_minutes:
+            if self.days >= MAX_INDEX_DAYS:
+                return False
+            self._extend(max(self.days * 2, DEFAULT_INDEX_DAYS))
+        return True
+
+    # The index as numpy arrays: day offsets, day start minutes, cumulative ends and cumulative begins
+    def as_arrays(self):
+        if self._arrays is None:
+            self._arrays = (
+                np.asarray(self.day_offsets, dtype=np.int64),
+                np.asarray(self.day_starts, dtype=np.int64),
+                np.asarray(self.cum_ends, dtype=np.int64),
+                np.asarray([0] + self.cum_ends[:-1], dtype=np.int64),
+            )
+        return self._arrays
+
+    # Convert one elapsed working-minute offset to a datetime in O(log days)
+    def to_datetime(self, elapsed_minutes):
+        elapsed_minutes = max(int(elapsed_minutes), 0)
+        if not self.ensure_covers(elapsed_minutes):
+            logger.warning("Could not find a working day within %d days from %s; returning start_date", self.days, self.start_date)
+            return self.start_date
+
+        # First working day whose cumulative end reaches the offset; an offset that lands exactly
+        # on the end of a day stays on that day rather than rolling over to the next one
+        k = bisect_left(self.cum_ends, elapsed_minutes)
+        day_begin = self.cum_ends[k - 1] if k > 0 else 0
+        minutes_into_day = self.day_starts[k] + (elapsed_minutes - day_begin)
+        return self.start_date + timedelta(days=self.day_offsets[k], minutes=minutes_into_day)
+
+    # Convert a whole array of elapsed offsets in one call; returns numpy datetime64[m] values
+    def to_datetime64(self, elapsed_minutes):
+        elapsed = np.maximum(np.asarray(elapsed_minutes, dtype=np.int64), 0)
+        if elapsed.size and not self.ensure_covers(int(elapsed.max())):
+            logger.warning("Could not find a working day within %d days from %s; clamping to the last indexed day", self.days, self.start_date)
+        day_offsets, day_starts, cum_ends, cum_begins = self.as_arrays()
+        if not len(cum_ends):
+            return np.full(elapsed.shape, np.datetime64(self.start_date, "m"))
+
+        k = np.minimum(np.searchsorted(cum_ends, elapsed, side="left"), len(cum_ends) - 1)
+        minutes = day_offsets[k] * 24 * 60 + day_starts[k] + (elapsed - cum_begins[k])
+        return np.datetime64(self.start_date, "m") + minutes.astype("timedelta64[m]")
+
+    # Batch conversion returning plain datetime objects, e.g. for rows written to the database
+    def to_datetimes(self, elapsed_minutes):
+        return self.to_datetime64(elapsed_minutes).tolist()
+
+    # Convert a datetime back to an elapsed working-minute offset (the inverse of to_datetime).
+    # Times outside working hours snap to the nearest working minute; anything before start_date is 0.
+    def to_elapsed(self, moment):
+        days_since_start = (moment - self.start_date).days
+        if moment < self.start_date or days_since_start < 0:
+            return 0
+        while self.days <= days_since_start and self.days < MAX_INDEX_DAYS:
+            self._extend(max(self.days * 2, DEFAULT_INDEX_DAYS))
+
+        # Last working day on or before the moment's day
+        k = bisect_right(self.day_offsets, days_since_start) - 1
+        if k < 0:
+            return 0
+        day_begin = self.cum_ends[k - 1] if k > 0 else 0
+        if self.day_offsets[k] < days_since_start:  # Non-working day: snap to the end of the previous working day
+            return self.cum_ends[k]
+
+        day_date = self.start_date + timedelta(days=days_since_start)
+        minute_of_day = int((moment - day_date).total_seconds() // 60)
+        day_length = self.cum_ends[k] - day_begin
+        return day_begin + min(max(minute_of_day - self.day_starts[k], 0), day_length)
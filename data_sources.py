@@ -0,0 +1,219 @@
+import json
+import os
+import pandas as pd
+from database import get_engine, make_engine
+from fetch_data import QUERY_DTYPES, fetch_data, prepare_data
+from run_log import get_logger
+from schedule_store import SCHEDULE_COLUMNS, save_run, save_schedule, update_run
+
+logger = get_logger(__name__)
+
+# Where the scheduler reads its input and writes its results.
+#
+# A source has load(include_schedule, include_blocked) returning the input data in the form fetch_data
+# returns (or None on failure); only the database leaves blocked jobs out unless include_blocked is set,
+# the other sources hand out every job they hold and the scheduler skips the blocked ones. A sink has
+# write_schedule(schedule) and record_run(row, run_id=None). The scheduling core (scheduling_core) never
+# touches either, so the same run works against
+#   DatabaseSource / DatabaseSink   PostgreSQL or a SQLite file (any SQLAlchemy URL; the default is the
+#                                   DB_* / DATABASE_URL settings of database.py)
+#   SnapshotSource / SnapshotSink   a directory with one CSV (or Parquet, when pyarrow is installed) file
+#                                   per table, as written by write_snapshot
+#   MemorySource / MemorySink       data already in memory, e.g. from instance_generator, and results
+#                                   kept in memory; nothing is written anywhere
+# open_source and open_sink pick one from a command-line style specification.
+
+# Tables of a snapshot, in the order fetch_data reads them; the last three may be missing
+SNAPSHOT_TABLES = ("jobs", "tasks", "resources", "resource_groups", "resource_group_assoc", "calendar",
+                   "resource_calendar", "calendar_exception", "schedule")
+
+# Datetime columns of each table, parsed when a snapshot is read
+SNAPSHOT_DATES = {
+    "jobs": ["promised_date"],
+    "calendar_exception": ["start_time", "end_time"],
+    "schedule": ["start_time", "end_time"],
+}
+
+# Text columns of each table, read from CSV as strings so that numeric-looking job and task numbers and
+# resource names keep matching the predecessor and resource lists
+SNAPSHOT_TEXT = {
+    "jobs": ["job_number"],
+    "tasks": ["task_number", "job_number", "predecessors", "resources"],
+    "resources": ["name", "type"],
+    "resource_groups": ["name"],
+    "calendar_exception": ["reason"],
+    "schedule": ["task_number", "resources_used"],
+}
+
+SNAPSHOT_FORMATS = ("csv", "parquet")
+
+
+# Reads the open work from the scheduler database
+class DatabaseSource:
+    def __init__(self, url=None):
+        self.url = url
+        self.description = f"database {url}" if url else "database"
+        self._engine = None
+
+    def engine(self):
+        if self._engine is None:
+            self._engine = make_engine(self.url) if self.url else get_engine()
+        return self._engine
+
+    def load(self, include_schedule=True, include_blocked=False):
+        return fetch_data(include_schedule=include_schedule, db_engine=self.engine(), include_blocked=include_blocked)
+
+
+# Writes the schedule and the run records to the scheduler database
+class DatabaseSink:
+    def __init__(self, url=None):
+        self.url = url
+        self.description = f"database {url}" if url else "database"
+        self._engine = None
+
+    def engine(self):
+        if self._engine is None:
+            self._engine = make_engine(self.url) if self.url else get_engine()
+        return self._engine
+
+    def write_schedule(self, schedule):
+        save_schedule(self.engine(), schedule)
+
+    def record_run(self, row, run_id=None):
+        if run_id is None:
+            save_run(self.engine(), row)
+        else:
+            update_run(self.engine(), run_id, row)
+
+
+# Reads a snapshot directory written by write_snapshot (or by hand: one file per table, with the
+# database's column names and comma-separated resources and predecessors)
+class SnapshotSource:
+    def __init__(self, path):
+        self.path = path
+        self.description = f"snapshot {path}"
+
+    def load(self, include_schedule=True, include_blocked=False):
+        try:
+            frames = {}
+            for name in SNAPSHOT_TABLES:
+                if name == "schedule" and not include_schedule:
+                    continue
+                frame = _read_table(self.path, name)
+                if frame is not None:
+                    frames[name] = frame
+            logger.info("Read snapshot %s: %s", self.path,
+                        ", ".join(f"{len(frame)} {name}" for name, frame in frames.items()))
+            return prepare_data(frames)
+        except Exception as e:
+            logger.exception("Error reading snapshot %s: %s", self.path, e)
+            return None
+
+
+# Writes the schedule to schedule.<fmt> in a directory and appends run records to schedule_run.jsonl
+class SnapshotSink:
+    def __init__(self, path, fmt="csv"):
+        if fmt not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Unknown snapshot format {fmt!r}; expected one of {list(SNAPSHOT_FORMATS)}")
+        self.path = path
+        self.fmt = fmt
+        self.description = f"snapshot {path}"
+
+    def write_schedule(self, schedule):
+        os.makedirs(self.path, exist_ok=True)
+        _write_table(pd.DataFrame(schedule, columns=list(SCHEDULE_COLUMNS)), self.path, "schedule", self.fmt)
+
+    def record_run(self, row, run_id=None):
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, "schedule_run.jsonl"), "a") as f:
+            f.write(json.dumps({"run_id": run_id, **row}, default=str) + "\n")
+
+
+# Hands out data that is already in memory; every load returns a fresh copy of the tables, as the
+# scheduler adds columns to them
+class MemorySource:
+    def __init__(self, data, description="memory"):
+        self.data = data
+        self.description = description
+
+    def load(self, include_schedule=True, include_blocked=False):
+        data = {name: value.copy() if isinstance(value, pd.DataFrame) else value for name, value in self.data.items()}
+        if not include_schedule:
+            data["schedule"] = pd.DataFrame(columns=list(SCHEDULE_COLUMNS))
+        return data
+
+
+# Keeps the last schedule and every run record in memory
+class MemorySink:
+    def __init__(self):
+        self.description = "memory"
+        self.schedule = None
+        self.runs = []
+
+    def write_schedule(self, schedule):
+        self.schedule = schedule
+
+    def record_run(self, row, run_id=None):
+        self.runs.append(dict(row, run_id=run_id))
+
+
+# Function to choose a source: None or "db" for the configured database, a SQLAlchemy URL (anything
+# with "://", e.g. sqlite:///scheduler.db) for another database, otherwise a snapshot directory
+def open_source(spec=None):
+    if spec is None or spec == "db":
+        return DatabaseSource()
+    if "://" in spec:
+        return DatabaseSource(spec)
+    return SnapshotSource(spec)
+
+
+# Function to choose a sink: as open_source, plus "none" to keep the results in memory only
+def open_sink(spec=None):
+    if spec is None or spec == "db":
+        return DatabaseSink()
+    if spec == "none":
+        return MemorySink()
+    if "://" in spec:
+        return DatabaseSink(spec)
+    return SnapshotSink(spec)
+
+
+# Function to write input data (as returned by a source) to a snapshot directory that SnapshotSource
+# reads back; resources and predecessors are written as comma-separated strings like in the database
+def write_snapshot(data, path, fmt="csv"):
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Unknown snapshot format {fmt!r}; expected one of {list(SNAPSHOT_FORMATS)}")
+    os.makedirs(path, exist_ok=True)
+    for name in SNAPSHOT_TABLES:
+        frame = data.get(name)
+        if frame is None:
+            continue
+        if name == "tasks":
+            frame = frame.copy()
+            for column in ("resources", "predecessors"):
+                frame[column] = frame[column].apply(lambda x: ",".join(x) if isinstance(x, list) else x)
+        _write_table(frame, path, name, fmt)
+    logger.info("Wrote snapshot %s (%s)", path, fmt)
+
+
+# Function to read one table of a snapshot, or None when the directory has no file for it
+def _read_table(path, name):
+    parquet_path = os.path.join(path, f"{name}.parquet")
+    csv_path = os.path.join(path, f"{name}.csv")
+    if os.path.exists(parquet_path):
+        frame = pd.read_parquet(parquet_path)
+    elif os.path.exists(csv_path):
+        frame = pd.read_csv(csv_path, parse_dates=SNAPSHOT_DATES.get(name, []),
+                            dtype={column: "object" for column in SNAPSHOT_TEXT.get(name, [])})
+    else:
+        return None
+    dtypes = {column: dtype for column, dtype in QUERY_DTYPES.get(name, {}).items() if column in frame.columns}
+    return frame.astype(dtypes)
+
+
+# Function to write one table of a snapshot
+def _write_table(frame, path, name, fmt):
+    if fmt == "parquet":
+        frame.to_parquet(os.path.join(path, f"{name}.parquet"), index=False)
+    else:
+        frame.to_csv(os.path.join(path, f"{name}.csv"), index=False)
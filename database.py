@@ -0,0 +1,47 @@
+import os
+import threading
+import sqlalchemy as sa
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+
+# Function to build the database URL: PostgreSQL from the DB_HOST, DB_NAME, DB_USER, DB_PASS and DB_PORT
+# variables the scheduler has always used when DB_HOST is set, otherwise DATABASE_URL (the variable the
+# Flask backend uses)
+def database_url():
+    if not os.getenv("DB_HOST") and os.getenv("DATABASE_URL"):
+        return os.getenv("DATABASE_URL")
+    return (f"postgresql+psycopg2://{os.getenv('DB_USER')}:{os.getenv('DB_PASS')}@{os.getenv('DB_HOST')}:"
+            f"{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}")
+
+
+# Function to create a SQLAlchemy engine for the scheduler.
+# The scheduler's queries name the "public" schema, so a SQLite database file (handy for local testing)
+# is attached to itself under that name.
+def make_engine(url=None, **kwargs):
+    url = sa.engine.make_url(url or database_url())
+    engine = sa.create_engine(url, **kwargs)
+    if url.get_backend_name() == "sqlite" and url.database and url.database != ":memory:":
+        path = os.path.abspath(url.database)
+
+        @sa.event.listens_for(engine, "connect")
+        def attach_public(dbapi_connection, connection_record):
+            dbapi_connection.execute("ATTACH DATABASE ? AS public", (path,))
+
+    return engine
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+# Function to get this process's shared scheduler engine, created on first use rather than at import,
+# so modules that only solve in memory never need database settings
+def get_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = make_engine()
+        return _engine
@@ -1,120 +1,195 @@
 import sqlalchemy as sa
-from sqlalchemy import create_engine
-from dotenv import load_dotenv
-import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
+import logging
+from run_log import get_logger
+from database import get_engine
+
+logger = get_logger(__name__)
+
+# Number of queries fetch_data runs at the same time, each on its own pooled connection (the engine's
+# pool holds 5)
+FETCH_WORKERS = 4
+
+# Only open work is read: jobs that are neither completed nor blocked and their incomplete tasks, so a
+# run reads the same amount of data however much history the database holds. The task query joins to
+# job so closed jobs' tasks never leave the database. The _WITH_BLOCKED variants also read the blocked
+# jobs, for what-if scenarios that unblock them (see scenarios.py).
+JOBS_QUERY = """
+    SELECT id, job_number, promised_date, quantity, price_each, completed, blocked
+    FROM public.job
+    WHERE NOT completed AND NOT blocked;
+"""
+JOBS_WITH_BLOCKED_QUERY = """
+    SELECT id, job_number, promised_date, quantity, price_each, completed, blocked
+    FROM public.job
+    WHERE NOT completed;
+"""
+TASKS_QUERY = """
+    SELECT t.id, t.task_number, t.job_number, t.setup_time, t.time_each, t.predecessors, t.resources, t.completed
+    FROM public.task t
+    JOIN public.job j ON j.job_number = t.job_number
+    WHERE NOT t.completed AND NOT j.completed AND NOT j.blocked
+    ORDER BY t.id;
+"""
+TASKS_WITH_BLOCKED_QUERY = """
+    SELECT t.id, t.task_number, t.job_number, t.setup_time, t.time_each, t.predecessors, t.resources, t.completed
+    FROM public.task t
+    JOIN public.job j ON j.job_number = t.job_number
+    WHERE NOT t.completed AND NOT j.completed
+    ORDER BY t.id;
+"""
+RESOURCES_QUERY = "SELECT id, name, type FROM public.resource;"
+RESOURCE_GROUP_ASSOC_QUERY = "SELECT resource_id, group_id FROM public.resource_group_association;"
+CALENDAR_QUERY = "SELECT weekday, start_time, end_time FROM public.calendar;"
+SCHEDULE_QUERY = "SELECT task_number, start_time, end_time, resources_used FROM public.schedule;"
+# Per-resource hours and dated exceptions; both tables are optional
+RESOURCE_CALENDAR_QUERY = "SELECT resource_id, weekday, start_time, end_time FROM public.resource_calendar;"
+CALENDAR_EXCEPTION_QUERY = "SELECT resource_id, start_time, end_time, reason FROM public.calendar_exception;"
+
+# Explicit dtypes so pandas does not have to infer them (and upcast nullable integers to object)
+QUERY_DTYPES = {
+    "jobs": {"id": "int64", "quantity": "float64", "price_each": "float64"},
+    "tasks": {"id": "int64", "setup_time": "float64", "time_each": "float64"},
+    "resources": {"id": "int64"},
+    "resource_groups": {"id": "int64"},
+    "resource_group_assoc": {"resource_id": "int64", "group_id": "int64"},
+    "calendar": {"weekday": "int64"},
+    "resource_calendar": {"resource_id": "int64", "weekday": "int64"},
+    "calendar_exception": {"resource_id": "Int64"},
+}
+
+
+# Function to run one query on its own pooled connection
+def _read_query(engine, name, query):
+    with engine.connect() as conn:
+        return pd.read_sql_query(sa.text(query), conn, dtype=QUERY_DTYPES.get(name))
+
+
+# Function to build the resource_group query; databases created before the interchangeable flag
+# existed do not have that column
+def _resource_groups_query(engine):
+    columns = {column["name"] for column in sa.inspect(engine).get_columns("resource_group", schema="public")}
+    if "interchangeable" in columns:
+        return "SELECT id, name, interchangeable FROM public.resource_group;"
+    return "SELECT id, name, FALSE AS interchangeable FROM public.resource_group;"
+
+
+# Function to add the queries for the per-resource calendar tables that exist; databases created before
+# resource calendars existed have neither table, and every resource then works the shop's hours
+def _calendar_queries(engine):
+    inspector = sa.inspect(engine)
+    queries = {}
+    if inspector.has_table("resource_calendar", schema="public"):
+        queries["resource_calendar"] = RESOURCE_CALENDAR_QUERY
+    if inspector.has_table("calendar_exception", schema="public"):
+        queries["calendar_exception"] = CALENDAR_EXCEPTION_QUERY
+    return queries
+
+
+# Function to connect to the database and fetch the open work to schedule.
+# The independent queries run concurrently on pooled connections. include_schedule=False skips the
+# previously saved schedule when neither warm start nor incremental mode needs it; include_blocked=True
+# also reads the blocked jobs and their tasks (the scheduler itself leaves them out).
+def fetch_data(include_schedule=True, db_engine=None, include_blocked=False):
+    db_engine = db_engine or get_engine()
+    try:
+        queries = {
+            "jobs": JOBS_WITH_BLOCKED_QUERY if include_blocked else JOBS_QUERY,
+            "tasks": TASKS_WITH_BLOCKED_QUERY if include_blocked else TASKS_QUERY,
+            "resources": RESOURCES_QUERY,
+            "resource_groups": _resource_groups_query(db_engine),
+            "resource_group_assoc": RESOURCE_GROUP_ASSOC_QUERY,
+            "calendar": CALENDAR_QUERY,
+            **_calendar_queries(db_engine),
+        }
+        if include_schedule:
+            queries["schedule"] = SCHEDULE_QUERY
+
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            futures = {name: pool.submit(_read_query, db_engine, name, query) for name, query in queries.items()}
+            frames = {name: future.result() for name, future in futures.items()}
+        logger.info("Fetched open work: %s", ", ".join(f"{len(frame)} {name}" for name, frame in frames.items()))
+        return prepare_data(frames)
 
-# Load environment variables from .env file
-load_dotenv()
+    except Exception as e:
+        logger.exception("Error fetching data: %s", e)
+        return None
 
-# Retrieve database credentials from environment variables
-DB_HOST = os.getenv("DB_HOST")
-DB_NAME = os.getenv("DB_NAME")
-DB_USER = os.getenv("DB_USER")
-DB_PASS = os.getenv("DB_PASS")
-DB_PORT = os.getenv("DB_PORT")
 
-# Create SQLAlchemy engine
-connection_string = f"postgresql+psycopg2://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(connection_string)
+# Function to turn the tables as read from the database (or a snapshot of them, see data_sources) into
+# the scheduler's input: resource and predecessor lists parsed and the name-to-id mappings built.
+# frames maps table name -> DataFrame; the optional tables may be missing.
+def prepare_data(frames):
+    jobs_df = frames["jobs"]
+    tasks_df = frames["tasks"]
+    resources_df = frames["resources"]
+    resource_groups_df = frames["resource_groups"]
+    resource_group_assoc_df = frames["resource_group_assoc"]
+    calendar_df = frames["calendar"]
+    schedule_df = frames.get("schedule", pd.DataFrame(columns=["task_number", "start_time", "end_time", "resources_used"]))
+    resource_calendar_df = frames.get("resource_calendar",
+                                      pd.DataFrame(columns=["resource_id", "weekday", "start_time", "end_time"]))
+    calendar_exception_df = frames.get("calendar_exception",
+                                       pd.DataFrame(columns=["resource_id", "start_time", "end_time", "reason"]))
+
+    # Create a mapping of resource names to IDs
+    resource_mapping = dict(zip(resources_df["name"], resources_df["id"]))
+
+    # Create a mapping of resource group names to their list of resource IDs
+    group_members = resource_group_assoc_df.groupby("group_id")["resource_id"].agg(list)
+    resource_group_mapping = {
+        group_name: group_members.get(group_id, [])
+        for group_id, group_name in zip(resource_groups_df["id"], resource_groups_df["name"])
+    }
+
+    # Groups whose members the scheduler may treat as identical; older snapshots have no such column
+    if "interchangeable" not in resource_groups_df.columns:
+        resource_groups_df["interchangeable"] = False
+    interchangeable_groups = set(
+        resource_groups_df.loc[resource_groups_df["interchangeable"].fillna(False).astype(bool), "name"]
+    )
 
-# Function to connect to the database and fetch data
-def fetch_data():
-    try:
-        # Establish connection using SQLAlchemy
-        with engine.connect() as conn:
-            print("Successfully connected to the database!")
-
-            # Fetch data into Pandas DataFrames
-            jobs_df = pd.read_sql_query("SELECT * FROM public.job;", conn)
-            tasks_df = pd.read_sql_query("SELECT * FROM public.task;", conn)
-            resources_df = pd.read_sql_query("SELECT * FROM public.resource;", conn)
-            resource_groups_df = pd.read_sql_query("SELECT * FROM public.resource_group;", conn)
-            resource_group_assoc_df = pd.read_sql_query("SELECT * FROM public.resource_group_association;", conn)
-            calendar_df = pd.read_sql_query("SELECT * FROM public.calendar;", conn)
-            schedule_df = pd.read_sql_query("SELECT * FROM public.schedule;", conn)
-
-            # Inspect the resources field in tasks_df
-            print("\nUnique values in tasks.resources:")
-            print(tasks_df["resources"].unique())
-
-            # Create a mapping of resource names to IDs
-            resource_mapping = dict(zip(resources_df["name"], resources_df["id"]))
-            print("\nResource Name to ID Mapping:")
-            print(resource_mapping)
-
-            # Create a mapping of resource group names to their list of resource IDs
-            resource_group_mapping = {}
-            for _, group in resource_groups_df.iterrows():
-                group_name = group["name"]
-                # Find all associations for this group
-                group_assocs = resource_group_assoc_df[
-                    resource_group_assoc_df["group_id"] == group["id"]
-                ]
-                # Get the resource IDs for this group
-                resource_ids = group_assocs["resource_id"].tolist()
-                resource_group_mapping[group_name] = resource_ids
-            print("\nResource Group Name to Resource IDs Mapping:")
-            print(resource_group_mapping)
-
-            # Preprocess tasks: Convert numeric fields and parse resources/predecessors
-            tasks_df["setup_time"] = pd.to_numeric(tasks_df["setup_time"], errors="coerce")
-            tasks_df["time_each"] = pd.to_numeric(tasks_df["time_each"], errors="coerce")
-            # Parse resources (e.g., "Pieter,GroupA" -> ["Pieter", "GroupA"])
-            tasks_df["resources"] = tasks_df["resources"].apply(
-                lambda x: [r.strip() for r in x.split(",")] if isinstance(x, str) and x else []
-            )
-            # Parse predecessors (e.g., "24356-120, 24356-270" -> ["24356-120", "24356-270"])
-            tasks_df["predecessors"] = tasks_df["predecessors"].apply(
-                lambda x: [] if pd.isna(x) or (isinstance(x, str) and x.lower() == "nan")
-                else [p.strip() for p in x.split(",")] if isinstance(x, str) and x else []
-            )
-
-            # Print summaries
-            print("\nJobs DataFrame:")
-            print(jobs_df.head())
-            print(f"Total jobs: {len(jobs_df)}")
-
-            print("\nTasks DataFrame:")
-            print(tasks_df.head())
-            print(f"Total tasks: {len(tasks_df)}")
-
-            print("\nResources DataFrame:")
-            print(resources_df.head())
-            print(f"Total resources: {len(resources_df)}")
-
-            print("\nResource Groups DataFrame:")
-            print(resource_groups_df.head())
-            print(f"Total resource groups: {len(resource_groups_df)}")
-
-            print("\nResource Group Associations DataFrame:")
-            print(resource_group_assoc_df.head())
-            print(f"Total resource group associations: {len(resource_group_assoc_df)}")
-
-            print("\nCalendar DataFrame:")
-            print(calendar_df.head())
-            print(f"Total calendar entries: {len(calendar_df)}")
-
-            print("\nSchedule DataFrame:")
-            print(schedule_df.head())
-            print(f"Total schedule entries: {len(schedule_df)}")
-
-            return {
-                "jobs": jobs_df,
-                "tasks": tasks_df,
-                "resources": resources_df,
-                "resource_groups": resource_groups_df,
-                "resource_group_assoc": resource_group_assoc_df,
-                "calendar": calendar_df,
-                "schedule": schedule_df,
-                "resource_mapping": resource_mapping,
-                "resource_group_mapping": resource_group_mapping
-            }
+    # Preprocess tasks: Convert numeric fields and parse resources/predecessors
+    tasks_df["setup_time"] = pd.to_numeric(tasks_df["setup_time"], errors="coerce")
+    tasks_df["time_each"] = pd.to_numeric(tasks_df["time_each"], errors="coerce")
+    # Parse resources (e.g., "Pieter,GroupA" -> ["Pieter", "GroupA"])
+    tasks_df["resources"] = tasks_df["resources"].apply(
+        lambda x: [r.strip() for r in x.split(",")] if isinstance(x, str) and x else []
+    )
+    # Parse predecessors (e.g., "24356-120, 24356-270" -> ["24356-120", "24356-270"])
+    tasks_df["predecessors"] = tasks_df["predecessors"].apply(
+        lambda x: [] if pd.isna(x) or (isinstance(x, str) and x.lower() == "nan")
+        else [p.strip() for p in x.split(",")] if isinstance(x, str) and x else []
+    )
+
+    # Table previews are only formatted when debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Resource name to id mapping: %s", resource_mapping)
+        logger.debug("Resource group name to resource ids mapping: %s", resource_group_mapping)
+        for name, frame in (("Jobs", jobs_df), ("Tasks", tasks_df), ("Resources", resources_df),
+                            ("Resource groups", resource_groups_df),
+                            ("Resource group associations", resource_group_assoc_df),
+                            ("Calendar", calendar_df), ("Resource calendars", resource_calendar_df),
+                            ("Calendar exceptions", calendar_exception_df), ("Schedule", schedule_df)):
+            logger.debug("%s (%d rows):\n%s", name, len(frame), frame.head())
+
+    return {
+        "jobs": jobs_df,
+        "tasks": tasks_df,
+        "resources": resources_df,
+        "resource_groups": resource_groups_df,
+        "resource_group_assoc": resource_group_assoc_df,
+        "calendar": calendar_df,
+        "resource_calendar": resource_calendar_df,
+        "calendar_exception": calendar_exception_df,
+        "schedule": schedule_df,
+        "resource_mapping": resource_mapping,
+        "resource_group_mapping": resource_group_mapping,
+        "interchangeable_groups": interchangeable_groups
+    }
 
-    except Exception as e:
-        print(f"Error fetching data: {e}")
-        return None
 
 # Function to analyze the data
 def analyze_data(data):
@@ -152,16 +227,15 @@ def analyze_data(data):
     print("\nCalendar Constraints by Day:")
     print(calendar_df.groupby("weekday")[["start_time", "end_time"]].first())
 
-    # 5. Check for invalid predecessors
-    print("\nTasks with Invalid Predecessors:")
-    invalid_predecessors = tasks_df[tasks_df["predecessors"].apply(len) > 0].apply(
-        lambda row: any(
-            p not in tasks_df[tasks_df["job_number"] == row["job_number"]]["task_number"].values
-            for p in row["predecessors"]
-        ),
+    # 5. Check for tasks waiting on open predecessors. Only open work is fetched, so a predecessor that is
+    # not among the fetched tasks is completed (or its job is closed) and counts as satisfied.
+    print("\nTasks Waiting on Open Predecessors:")
+    open_tasks = set(zip(tasks_df["job_number"], tasks_df["task_number"]))
+    waiting = tasks_df.apply(
+        lambda row: any((row["job_number"], p) in open_tasks for p in row["predecessors"]),
         axis=1
-    )
-    print(tasks_df[tasks_df["predecessors"].apply(len) > 0][invalid_predecessors])
+    ).astype(bool)
+    print(tasks_df[waiting][["job_number", "task_number", "predecessors"]])
 
 if __name__ == "__main__":
     # Fetch the data
@@ -5,7 +5,7 @@ import { Table, Button, Form, Row, Col, FormControl } from 'react-bootstrap';
 const AddEditResourceGroups = () => {
   const [groups, setGroups] = useState([]);
   const [resources, setResources] = useState([]);
-  const [newGroup, setNewGroup] = useState({ name: '', resource_ids: [] });
+  const [newGroup, setNewGroup] = useState({ name: '', resource_ids: [], interchangeable: false });
   const [editingId, setEditingId] = useState(null);
   const [loading, setLoading] = useState(false);
 
@@ -39,10 +39,11 @@ const AddEditResourceGroups = () => {
     try {
       const response = await axios.post('http://localhost:5000/api/resource_group', {
         name: newGroup.name,
-        resource_ids: newGroup.resource_ids
+        resource_ids: newGroup.resource_ids,
+        interchangeable: newGroup.interchangeable
       });
       setGroups([...groups, { id: response.data.id, ...newGroup }]);
-      setNewGroup({ name: '', resource_ids: [] });
+      setNewGroup({ name: '', resource_ids: [], interchangeable: false });
     } catch (error) {
       console.error('Error adding resource group:', error);
     }
@@ -50,18 +51,19 @@ const AddEditResourceGroups = () => {
 
   const handleEdit = (group) => {
     setEditingId(group.id);
-    setNewGroup({ name: group.name, resource_ids: group.resource_ids });
+    setNewGroup({ name: group.name, resource_ids: group.resource_ids, interchangeable: !!group.interchangeable });
   };
 
   const handleUpdate = async (id) => {
     try {
       await axios.put(`http://localhost:5000/api/resource_group/${id}`, {
         name: newGroup.name,
-        resource_ids: newGroup.resource_ids
+        resource_ids: newGroup.resource_ids,
+        interchangeable: newGroup.interchangeable
       });
       setGroups(groups.map(g => (g.id === id ? { id, ...newGroup } : g)));
       setEditingId(null);
-      setNewGroup({ name: '', resource_ids: [] });
+      setNewGroup({ name: '', resource_ids: [], interchangeable: false });
     } catch (error) {
       console.error('Error updating resource group:', error);
     }
@@ -111,6 +113,15 @@ const AddEditResourceGroups = () => {
               </FormControl>
             </Form.Group>
           </Col>
+          <Col className="align-self-end">
+            <Form.Check
+              type="checkbox"
+              id="interchangeable"
+              label="Interchangeable"
+              checked={newGroup.interchangeable}
+              onChange={(e) => setNewGroup({ ...newGroup, interchangeable: e.target.checked })}
+            />
+          </Col>
           <Col className="align-self-end">
             <Button
               variant="primary"
@@ -127,6 +138,7 @@ const AddEditResourceGroups = () => {
           <tr>
             <th>Name</th>
             <th>Resources</th>
+            <th>Interchangeable</th>
             <th>Actions</th>
           </tr>
         </thead>
@@ -135,6 +147,7 @@ const AddEditResourceGroups = () => {
             <tr key={group.id}>
               <td>{group.name}</td>
               <td>{group.resource_ids.map(id => resources.find(r => r.id === id)?.name).join(', ') || 'None'}</td>
+              <td>{group.interchangeable ? 'Yes' : 'No'}</td>
               <td>
                 <Button variant="warning" onClick={() => handleEdit(group)} className="me-2">Edit</Button>
                 <Button variant="danger" onClick={() => handleDelete(group.id)}>Delete</Button>
@@ -0,0 +1,283 @@
+from bisect import bisect_right, insort
+import heapq
+import time
+from task_bounds import topological_order, earliest_starts, tails
+from task_table import task_arrays
+from objectives import evaluate_objectives, parse_objective
+from resource_calendars import merge_intervals
+
+# Greedy list-scheduling engine.
+#
+# Understands the same task dicts (or TaskTable), resource and resource-group mappings, frozen tasks and blocked
+# intervals as the CP-SAT model in scheduler_model and returns a result of the same shape, so it can
+# be used on its own for quick what-ifs, as a fallback when CP-SAT finds no solution in time, and as
+# the solution hint for the CP-SAT solve.
+
+# Priority rules for picking the next task among those whose predecessors are placed; lower sorts first.
+# Each takes the task index and the per-task durations, due minutes (inf for none) and tails.
+PRIORITY_RULES = {
+    "critical_path": lambda i, durations, dues, task_tails: -task_tails[i],  # Longest remaining chain first
+    "shortest": lambda i, durations, dues, task_tails: durations[i],
+    "longest": lambda i, durations, dues, task_tails: -durations[i],
+    "fifo": lambda i, durations, dues, task_tails: i,  # Job book order
+    # Least slack first: the latest start that still meets the job's due minute; jobs without one last
+    "due_date": lambda i, durations, dues, task_tails: dues[i] - task_tails[i],
+}
+
+
+# Function to find the earliest start >= start at which a resource is free for `duration` minutes.
+# busy is a sorted list of (start, end) intervals that do not overlap.
+def _earliest_fit(busy, start, duration):
+    k = bisect_right(busy, (start, float("inf"))) - 1
+    if k >= 0 and busy[k][1] > start:
+        start = busy[k][1]
+    k += 1
+    while k < len(busy) and busy[k][0] < start + duration:
+        start = max(start, busy[k][1])
+        k += 1
+    return start
+
+
+# Function to find the end of the first of the sorted, disjoint intervals that overlaps [start, end), or None
+def _first_overlap(intervals, start, end):
+    k = bisect_right(intervals, (start, float("inf"))) - 1
+    if k < 0 or intervals[k][1] <= start:
+        k += 1
+    if k < len(intervals) and intervals[k][0] < end:
+        return intervals[k][1]
+    return None
+
+
+# Function to list the stretches of [start, end) that the sorted, disjoint intervals leave free
+def _gaps(intervals, start, end):
+    gaps = []
+    position = start
+    k = max(bisect_right(intervals, (start, float("inf"))) - 1, 0)
+    while k < len(intervals) and intervals[k][0] < end:
+        if intervals[k][1] > position:
+            if intervals[k][0] > position:
+                gaps.append((position, intervals[k][0]))
+            position = intervals[k][1]
+        k += 1
+    if position < end:
+        gaps.append((position, end))
+    return gaps
+
+
+# Function to place the segments of a paused task one after the other: each goes at the earliest time,
+# from the end of the previous one, at which none of the resources has downtime. Returns [(start, end)].
+def _place_segments(durations, resource_ids, downtime, start):
+    placed = []
+    for duration in durations:
+        candidate = start
+        while True:
+            fit = candidate
+            for res_id in resource_ids:
+                fit = max(fit, _earliest_fit(downtime.get(res_id, []), fit, duration))
+            if fit == candidate:
+                break
+            candidate = fit
+        placed.append((candidate, candidate + duration))
+        start = candidate + duration
+    return placed
+
+
+# Function to place all segments of a task that pauses over downtime (see scheduling_core.split_paused_tasks).
+# The task holds its resources from the start of its first segment to the end of its last, so only
+# downtime may fall in between, never other work. Each group gets the member with which the task ends
+# first. Returns the segments and the resource ids.
+def _place_paused(durations, fixed, groups, downtime, work, start):
+    while True:
+        resource_ids = list(fixed)
+        for members in groups:
+            options = [
+                (_place_segments(durations, resource_ids + [res_id], downtime, start)[-1][1], res_id)
+                for res_id in members if res_id not in resource_ids
+            ]
+            if options:
+                resource_ids.append(min(options)[1])
+        segments = _place_segments(durations, resource_ids, downtime, start)
+        # Starting any earlier than the end of work the task would enclose still encloses it
+        clash = max((_first_overlap(work.get(res_id, []), segments[0][0], segments[-1][1]) or 0
+                     for res_id in resource_ids), default=0)
+        if not clash:
+            return segments, resource_ids
+        start = max(start, clash)
+
+
+# Function to split a task's resource names into fixed resource ids and candidate lists for groups
+def _requirements(task, resource_mapping, resource_group_mapping):
+    fixed = []
+    groups = []
+    for res in task["resources"]:
+        if res in resource_mapping:
+            if resource_mapping[res] != -1:
+                fixed.append(resource_mapping[res])
+        elif res in resource_group_mapping and resource_group_mapping[res]:
+            groups.append(resource_group_mapping[res])
+    return fixed, groups
+
+
+# Function to build a feasible schedule with a serial list-scheduling pass.
+#
+# Tasks are taken in priority order as soon as all their predecessors are placed. Each one goes at the
+# earliest time, at or after its predecessors and release time, when its fixed resources are free,
+# filling gaps left earlier on the axis, and takes the member of each resource group that frees up first.
+# The segments of a paused task are placed together when the first one is taken (see _place_paused).
+# busy_intervals is work placed outside these tasks (see scheduler_model.build_model), which a paused
+# task may not hold its resources over, unlike the downtime in blocked_intervals.
+# Durations, release minutes and predecessors are read from task_arrays(tasks), or from arrays when the
+# caller already has them; the task rows are read once, for their resources, due minutes and segments.
+def greedy_schedule(tasks, resource_mapping, resource_group_mapping, frozen_tasks=None, blocked_intervals=None,
+                    priority="critical_path", task_tails=None, busy_intervals=None, arrays=None):
+    started = time.time()
+    frozen_tasks = frozen_tasks or {}
+    blocked_intervals = blocked_intervals or {}
+    busy_intervals = busy_intervals or {}
+    if priority not in PRIORITY_RULES:
+        raise ValueError(f"Unknown priority rule {priority!r}; expected one of {list(PRIORITY_RULES)}")
+    rule = PRIORITY_RULES[priority]
+    arrays = arrays if arrays is not None else task_arrays(tasks)
+    order, successors = topological_order(tasks, arrays)
+    if task_tails is None:
+        task_tails = tails(tasks, frozen_tasks, order, successors, arrays)
+    durations, releases, pred_offsets, pred_indices = (array.tolist() for array in arrays)
+
+    busy = {res_id: sorted(intervals) for res_id, intervals in blocked_intervals.items()}
+    downtime = {res_id: list(intervals) for res_id, intervals in busy.items()}
+    # Resource id -> the stretches tasks hold it, without the downtime
+    work = {res_id: sorted(intervals) for res_id, intervals in busy_intervals.items()}
+    for res_id, intervals in busy_intervals.items():
+        busy[res_id] = merge_intervals(busy.get(res_id, []) + intervals)
+    requirements = []  # Task index -> (fixed resource ids, candidate lists for groups)
+    dues = []
+    segment_chain = {}  # Task index -> indices of the segments of its task, in order
+    segments = {}  # Task id -> the same list
+    for i, task in enumerate(tasks):
+        requirements.append(_requirements(task, resource_mapping, resource_group_mapping))
+        dues.append(task.get("due", float("inf")))
+        if "segment" in task:
+            segment_chain[i] = segments.setdefault(task["task_id"], [])
+            segment_chain[i].append(i)
+    count = len(durations)
+    starts = [0] * count
+    ends = [0] * count
+    assignments = [[] for _ in range(count)]
+    placed = [False] * count
+
+    for i, frozen in frozen_tasks.items():
+        starts[i] = frozen["start"]
+        ends[i] = frozen["end"]
+        assignments[i] = list(frozen["resource_ids"])
+        placed[i] = True
+        if frozen["end"] > frozen["start"]:
+            for res_id in frozen["resource_ids"]:
+                insort(busy.setdefault(res_id, []), (frozen["start"], frozen["end"]))
+                insort(work.setdefault(res_id, []), (frozen["start"], frozen["end"]))
+
+    pending = [0] * count
+    for i in range(count):
+        if placed[i]:
+            continue
+        pending[i] = sum(1 for pred_index in pred_indices[pred_offsets[i]:pred_offsets[i + 1]]
+                         if not placed[pred_index])
+    ready = [(rule(i, durations, dues, task_tails), i) for i in range(count) if not placed[i] and pending[i] == 0]
+    heapq.heapify(ready)
+
+    while ready:
+        _, i = heapq.heappop(ready)
+        duration = durations[i]
+        earliest = releases[i]
+        for pred_index in pred_indices[pred_offsets[i]:pred_offsets[i + 1]]:
+            earliest = max(earliest, ends[pred_index])
+
+        fixed, groups = requirements[i]
+        if i in segment_chain:
+            chain = segment_chain[i]
+            placed_segments, resource_ids = _place_paused([durations[k] for k in chain], fixed, groups,
+                                                          downtime, work, earliest)
+            held = (placed_segments[0][0], placed_segments[-1][1])
+            for res_id in resource_ids:
+                for gap in _gaps(busy.get(res_id, []), *held):
+                    insort(busy.setdefault(res_id, []), gap)
+                insort(work.setdefault(res_id, []), held)
+            for k, (start, end) in zip(chain, placed_segments):
+                starts[k] = start
+                ends[k] = end
+                assignments[k] = [int(res_id) for res_id in resource_ids]
+                placed[k] = True
+            for k in chain:
+                for succ in successors[k]:
+                    if not placed[succ]:
+                        pending[succ] -= 1
+                        if pending[succ] == 0:
+                            heapq.heappush(ready, (rule(succ, durations, dues, task_tails), succ))
+            continue
+
+        start = earliest
+        while True:
+            candidate = start
+            for res_id in fixed:
+                candidate = max(candidate, _earliest_fit(busy.get(res_id, []), candidate, duration))
+            chosen = []
+            for members in groups:
+                options = [
+                    (_earliest_fit(busy.get(res_id, []), candidate, duration), res_id)
+                    for res_id in members if res_id not in fixed and res_id not in chosen
+                ]
+                if not options:
+                    continue
+                fit, res_id = min(options)
+                candidate = max(candidate, fit)
+                chosen.append(res_id)
+            if candidate == start:  # Every resource fits at this start
+                break
+            start = candidate
+
+        starts[i] = start
+        ends[i] = start + duration
+        assignments[i] = [int(res_id) for res_id in fixed + chosen]
+        placed[i] = True
+        if duration > 0:
+            for res_id in assignments[i]:
+                insort(busy.setdefault(res_id, []), (start, start + duration))
+                insort(work.setdefault(res_id, []), (start, start + duration))
+        for succ in successors[i]:
+            if not placed[succ]:
+                pending[succ] -= 1
+                if pending[succ] == 0:
+                    heapq.heappush(ready, (rule(succ, durations, dues, task_tails), succ))
+
+    # Critical-path lower bound, for comparing the greedy makespan with what is achievable
+    earliest = earliest_starts(tasks, frozen_tasks, order, arrays)
+    lower_bound = max((earliest[i] + task_tails[i] for i in range(count) if i not in frozen_tasks), default=0)
+    return {
+        "status": "FEASIBLE",
+        "feasible": True,
+        "engine": "greedy",
+        "wall_time": time.time() - started,
+        "task_count": count,
+        "makespan": max(ends, default=0),
+        "best_bound": float(lower_bound),
+        "starts": starts,
+        "ends": ends,
+        "assignments": assignments,
+        "objectives": evaluate_objectives(tasks, ends),
+    }
+
+
+# Function to build the greedy schedule that suits an objective. For a job-based objective the
+# least-slack rule is tried as well and whichever schedule scores better on the objective is returned.
+def greedy_for_objective(tasks, resource_mapping, resource_group_mapping, frozen_tasks=None, blocked_intervals=None,
+                         priority="critical_path", objective="makespan", busy_intervals=None, arrays=None):
+    arrays = arrays if arrays is not None else task_arrays(tasks)
+    result = greedy_schedule(tasks, resource_mapping, resource_group_mapping, frozen_tasks, blocked_intervals,
+                             priority=priority, busy_intervals=busy_intervals, arrays=arrays)
+    name = parse_objective(objective)[0]
+    if name != "makespan" and priority != "due_date":
+        alternative = greedy_schedule(tasks, resource_mapping, resource_group_mapping, frozen_tasks,
+                                      blocked_intervals, priority="due_date", busy_intervals=busy_intervals,
+                                      arrays=arrays)
+        if alternative["objectives"][name] < result["objectives"][name]:
+            result = alternative
+    return result
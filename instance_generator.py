@@ -0,0 +1,147 @@
+import random
+from datetime import datetime, time, timedelta
+import pandas as pd
+
+# Synthetic scheduling instances for benchmarks and offline runs.
+#
+# generate_instance returns a dict in the same form as fetch_data.fetch_data, so anything that takes
+# fetched data can take a generated instance instead of the database. The shop has resource groups of
+# machines or people plus a few standalone resources, works Monday to Friday (Friday mornings only,
+# like the default calendar), and every job is a routing of tasks with a quantity and a promised date.
+# The same seed and knobs always give the same instance.
+
+# Monday the generated schedules start on; promised dates and holidays are relative to it
+DEFAULT_START_DATE = datetime(2025, 1, 6)
+
+# Shop calendar: weekday -> (start, end); weekdays not listed are days off
+DEFAULT_WORKING_HOURS = {1: (time(7, 0), time(16, 0)), 2: (time(7, 0), time(16, 0)), 3: (time(7, 0), time(16, 0)),
+                         4: (time(7, 0), time(16, 0)), 5: (time(7, 0), time(12, 0))}
+
+
+# Function to generate one instance.
+#   jobs                  number of open jobs
+#   tasks_per_job         (min, max) tasks in a job's routing
+#   predecessor_density   probability that a task waits for each earlier task of its job; 1 gives a strict
+#                         chain (plus redundant edges), 0 independent tasks
+#   groups, group_size    number of resource groups and (min, max) members per group
+#   standalone            resources outside every group, named directly by tasks
+#   interchangeable       fraction of groups marked interchangeable
+#   part_time             fraction of resources with their own, shorter hours (resource_calendar rows);
+#                         a task longer than such a resource's shift only fits after the computed calendar
+#   holidays              shop-wide closed days within the first months (calendar_exception rows)
+#   due_tightness         promised dates are spread over this multiple of the estimated schedule length
+def generate_instance(jobs=100, tasks_per_job=(2, 8), predecessor_density=0.6, groups=6, group_size=(2, 5),
+                      standalone=4, interchangeable=0.0, part_time=0.0, holidays=0, due_tightness=1.5, seed=1,
+                      start_date=DEFAULT_START_DATE):
+    if groups < 1:
+        raise ValueError("groups must be at least 1")
+    rnd = random.Random(seed)
+
+    # Resources: each group is one kind of machine or trade, the standalone resources are people
+    resources = []
+    resource_groups = []
+    resource_group_assoc = []
+    for g in range(groups):
+        kind = "M" if g % 2 == 0 else "H"
+        resource_groups.append({"id": g + 1, "name": f"Group{g}", "interchangeable": rnd.random() < interchangeable})
+        for k in range(rnd.randint(*group_size)):
+            resources.append({"id": len(resources) + 1, "name": f"G{g}R{k}", "type": kind})
+            resource_group_assoc.append({"resource_id": len(resources), "group_id": g + 1})
+    for k in range(standalone):
+        resources.append({"id": len(resources) + 1, "name": f"Person{k}", "type": "H"})
+    group_names = [group["name"] for group in resource_groups]
+    resource_names = [resource["name"] for resource in resources]
+    standalone_names = resource_names[len(resource_names) - standalone:] if standalone else []
+
+    # Jobs and their routings
+    job_rows = []
+    task_rows = []
+    job_work = []
+    for j in range(jobs):
+        job_number = f"J{j + 1:05d}"
+        quantity = rnd.randint(1, 20)
+        task_numbers = []
+        work = 0
+        for t in range(rnd.randint(*tasks_per_job)):
+            task_number = f"{job_number}-{(t + 1) * 10}"
+            choice = rnd.random()
+            if choice < 0.6 or not standalone_names:
+                task_resources = [rnd.choice(group_names)]
+            elif choice < 0.8:
+                task_resources = [rnd.choice(group_names), rnd.choice(standalone_names)]
+            else:
+                task_resources = [rnd.choice(standalone_names)]
+            setup_time = 5 * rnd.randint(0, 12)
+            time_each = float(rnd.randint(1, 30))
+            work += setup_time + time_each * quantity
+            task_rows.append({
+                "id": len(task_rows) + 1,
+                "task_number": task_number,
+                "job_number": job_number,
+                "setup_time": float(setup_time),
+                "time_each": time_each,
+                "predecessors": [p for p in task_numbers if rnd.random() < predecessor_density],
+                "resources": task_resources,
+                "completed": False,
+            })
+            task_numbers.append(task_number)
+        job_work.append(work)
+        job_rows.append({
+            "id": j + 1,
+            "job_number": job_number,
+            "promised_date": None,
+            "quantity": quantity,
+            "price_each": float(rnd.randint(10, 2000)),
+            "completed": False,
+            "blocked": False,
+        })
+
+    # Promised dates: spread over the estimated schedule length in working days (total work divided by
+    # the number of resources, at 8 working hours a day), never before the job's own work could be done
+    schedule_days = sum(job_work) / max(len(resources), 1) / (8 * 60)
+    for job, work in zip(job_rows, job_work):
+        days = work / (8 * 60) + rnd.uniform(0, schedule_days * due_tightness)
+        job["promised_date"] = start_date + timedelta(days=int(days * 7 / 5) + 1)
+
+    calendar = pd.DataFrame([{"weekday": day, "start_time": start, "end_time": end}
+                             for day, (start, end) in DEFAULT_WORKING_HOURS.items()])
+
+    # Part-time resources work mornings on three weekdays
+    resource_calendar = pd.DataFrame(
+        [{"resource_id": resource["id"], "weekday": day, "start_time": time(7, 0), "end_time": time(12, 0)}
+         for resource in resources if rnd.random() < part_time for day in (1, 2, 3)],
+        columns=["resource_id", "weekday", "start_time", "end_time"],
+    )
+    holiday_dates = sorted(rnd.sample(range(1, 120), min(holidays, 119)))
+    calendar_exception = pd.DataFrame(
+        [{"resource_id": pd.NA, "start_time": start_date + timedelta(days=day),
+          "end_time": start_date + timedelta(days=day + 1), "reason": "Holiday"} for day in holiday_dates],
+        columns=["resource_id", "start_time", "end_time", "reason"],
+    ).astype({"resource_id": "Int64"})
+
+    resources_df = pd.DataFrame(resources, columns=["id", "name", "type"])
+    resource_groups_df = pd.DataFrame(resource_groups, columns=["id", "name", "interchangeable"])
+    resource_group_assoc_df = pd.DataFrame(resource_group_assoc, columns=["resource_id", "group_id"])
+    group_members = resource_group_assoc_df.groupby("group_id")["resource_id"].agg(list)
+    return {
+        "jobs": pd.DataFrame(job_rows),
+        "tasks": pd.DataFrame(task_rows),
+        "resources": resources_df,
+        "resource_groups": resource_groups_df,
+        "resource_group_assoc": resource_group_assoc_df,
+        "calendar": calendar,
+        "resource_calendar": resource_calendar,
+        "calendar_exception": calendar_exception,
+        "schedule": pd.DataFrame(columns=["task_number", "start_time", "end_time", "resources_used"]),
+        "resource_mapping": dict(zip(resources_df["name"], resources_df["id"])),
+        "resource_group_mapping": {
+            name: group_members.get(group_id, []) for group_id, name in zip(resource_groups_df["id"],
+                                                                            resource_groups_df["name"])
+        },
+        "interchangeable_groups": set(resource_groups_df.loc[resource_groups_df["interchangeable"], "name"]),
+    }
+
+
+# Function to pick the number of jobs that gives about `tasks` tasks with the given routing lengths
+def jobs_for_tasks(tasks, tasks_per_job=(2, 8)):
+    return max(1, round(tasks / ((tasks_per_job[0] + tasks_per_job[1]) / 2)))
@@ -0,0 +1,36 @@
+import argparse
+import glob
+import os
+from database import make_engine
+
+# Schema changes for the scheduler database, one SQL file per change in migrations/, applied in file-name
+# order. Every statement is written to be re-runnable (IF NOT EXISTS), so the whole set is applied on each
+# deployment (see startup.sh) and no table of applied versions is kept. The SQL is for PostgreSQL.
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+
+# Function to list the migration files in the order they are applied
+def migration_files():
+    return sorted(glob.glob(os.path.join(MIGRATIONS_DIR, "*.sql")))
+
+
+# Function to apply every migration, each in its own transaction, so a failing file leaves the ones
+# before it in place
+def migrate(engine, log=print):
+    for path in migration_files():
+        with open(path) as f:
+            sql = f.read()
+        with engine.begin() as conn:
+            conn.exec_driver_sql(sql)
+        log(f"Applied {os.path.basename(path)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bring the scheduler database schema up to date")
+    parser.add_argument("--url", help="SQLAlchemy database URL (default: the DB_* settings or DATABASE_URL)")
+    args = parser.parse_args(argv)
+    migrate(make_engine(args.url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+-- Groups whose members the scheduler may treat as identical (see scheduler_model._pooled_groups)
+ALTER TABLE public.resource_group ADD COLUMN IF NOT EXISTS interchangeable BOOLEAN NOT NULL DEFAULT FALSE;
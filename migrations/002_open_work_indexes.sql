@@ -0,0 +1,3 @@
+-- Partial indexes for fetch_data, which only reads open jobs and their incomplete tasks
+CREATE INDEX IF NOT EXISTS ix_job_open ON public.job (job_number) WHERE NOT completed AND NOT blocked;
+CREATE INDEX IF NOT EXISTS ix_task_open_job_number ON public.task (job_number) WHERE NOT completed;
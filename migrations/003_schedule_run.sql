@@ -0,0 +1,23 @@
+-- One row per scheduling run, written by schedule_store.save_run
+CREATE TABLE IF NOT EXISTS public.schedule_run (
+    id SERIAL PRIMARY KEY,
+    started_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP,
+    status VARCHAR(20) NOT NULL,
+    engine VARCHAR(20),
+    task_count INTEGER,
+    makespan INTEGER,
+    best_bound DOUBLE PRECISION,
+    gap DOUBLE PRECISION,
+    solver_status VARCHAR(20),
+    solver_wall_time DOUBLE PRECISION,
+    conflicts BIGINT,
+    branches BIGINT,
+    variables INTEGER,
+    constraints INTEGER,
+    intervals INTEGER,
+    peak_rss_mb DOUBLE PRECISION,
+    phases TEXT,
+    solver_stats TEXT,
+    solver_config TEXT
+);
@@ -0,0 +1,2 @@
+-- Why a failed run failed
+ALTER TABLE public.schedule_run ADD COLUMN IF NOT EXISTS error TEXT;
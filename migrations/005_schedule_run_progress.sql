@@ -0,0 +1,3 @@
+-- Runs queued through the API: the current phase while running and the run's log
+ALTER TABLE public.schedule_run ADD COLUMN IF NOT EXISTS progress VARCHAR(20);
+ALTER TABLE public.schedule_run ADD COLUMN IF NOT EXISTS log TEXT;
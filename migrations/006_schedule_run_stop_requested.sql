@@ -0,0 +1,2 @@
+-- Set through the API to stop a run early; the run keeps its best incumbent
+ALTER TABLE public.schedule_run ADD COLUMN IF NOT EXISTS stop_requested BOOLEAN DEFAULT FALSE;
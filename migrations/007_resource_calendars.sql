@@ -0,0 +1,18 @@
+-- Working hours of resources that do not work the shop's hours; a resource with rows here is off on the
+-- weekdays it has no row for
+CREATE TABLE IF NOT EXISTS public.resource_calendar (
+    id SERIAL PRIMARY KEY,
+    resource_id INTEGER NOT NULL REFERENCES public.resource (id),
+    weekday INTEGER NOT NULL,
+    start_time TIME NOT NULL,
+    end_time TIME NOT NULL
+);
+
+-- Dated unavailability: leave or maintenance of one resource, or without a resource a shop-wide holiday
+CREATE TABLE IF NOT EXISTS public.calendar_exception (
+    id SERIAL PRIMARY KEY,
+    resource_id INTEGER REFERENCES public.resource (id),
+    start_time TIMESTAMP NOT NULL,
+    end_time TIMESTAMP NOT NULL,
+    reason VARCHAR(255)
+);
@@ -0,0 +1,2 @@
+-- Peak memory of the pool processes of a decomposed solve; peak_rss_mb only covers the scheduling process
+ALTER TABLE public.schedule_run ADD COLUMN IF NOT EXISTS worker_peak_rss_mb DOUBLE PRECISION;
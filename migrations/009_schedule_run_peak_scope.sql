@@ -0,0 +1,2 @@
+-- Whether peak_rss_mb is the peak of the run's phases ('phase') or of the process that hosted it ('process')
+ALTER TABLE public.schedule_run ADD COLUMN IF NOT EXISTS peak_rss_scope VARCHAR(10);
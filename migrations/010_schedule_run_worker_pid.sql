@@ -0,0 +1,2 @@
+-- Process id of the server worker whose pool executes a run, so the runs of a worker that exits can be failed
+ALTER TABLE public.schedule_run ADD COLUMN IF NOT EXISTS worker_pid INTEGER;
@@ -0,0 +1,132 @@
+from ortools.sat.python import cp_model
+
+# Scheduling objectives.
+#
+# Every task dict carries its job number in task_id[0]. Tasks of a job with a promised date have a
+# "due" entry, the minute on the elapsed (calendar) axis by which the job should be finished, and every
+# task may have a "weight", the job's relative value (1 when missing). A job completes when the last of
+# its tasks ends.
+#   makespan             end of the last task
+#   tardiness            sum over jobs of weight * minutes finished after the due minute
+#   late_jobs            number of jobs finished after their due minute
+#   weighted_completion  sum over jobs of weight * completion minute
+# A lexicographic objective lists several names, most important first, e.g. "tardiness,makespan":
+# the first is minimized, then the next one without letting the first get worse, and so on.
+
+OBJECTIVES = ("makespan", "tardiness", "late_jobs", "weighted_completion")
+
+# Objectives that add up over independent parts of a schedule; makespan is the maximum over the parts
+ADDITIVE_OBJECTIVES = ("tardiness", "late_jobs", "weighted_completion")
+
+
+# Function to split an objective specification ("tardiness,makespan" or a list of names) into names
+def parse_objective(spec):
+    names = [name.strip() for name in spec.split(",")] if isinstance(spec, str) else list(spec)
+    names = [name for name in names if name]
+    if not names:
+        raise ValueError("objective must name at least one objective")
+    for name in names:
+        if name not in OBJECTIVES:
+            raise ValueError(f"Unknown objective {name!r}; expected one of {list(OBJECTIVES)}")
+    if len(set(names)) < len(names):
+        raise ValueError(f"objective lists an objective twice: {','.join(names)}")
+    return names
+
+
+# Function to group tasks by job: job number -> (final task indices, due minute or None, weight).
+# The final tasks are the job's tasks that no other task of the same job waits for; the job's
+# completion is the latest of their ends.
+def job_groups(tasks):
+    job_task_indices = {}
+    jobs = []
+    waits = []  # (task index, predecessor index) pairs
+    first_tasks = {}
+    for i, task in enumerate(tasks):
+        job = task["task_id"][0]
+        jobs.append(job)
+        job_task_indices.setdefault(job, []).append(i)
+        first_tasks.setdefault(job, task)
+        waits.extend((i, pred_index) for pred_index in task["predecessor_indices"])
+    waited_for = {pred_index for i, pred_index in waits if jobs[pred_index] == jobs[i]}
+
+    groups = {}
+    for job, indices in job_task_indices.items():
+        final = [i for i in indices if i not in waited_for]
+        first = first_tasks[job]
+        groups[job] = (final, first.get("due"), first.get("weight", 1))
+    return groups
+
+
+# Function to add the terms for the named objectives to a model. Returns (terms, auxiliaries): terms
+# maps objective name -> linear expression, auxiliaries lists the helper variables for hint_objective_terms.
+# Tardiness and lateness are only bounded from below, which is all a minimization needs; the values of
+# a solution are recomputed exactly by evaluate_objectives.
+def add_objective_terms(model, tasks, task_ends, makespan, names, horizon):
+    terms = {"makespan": makespan}
+    auxiliaries = [("completion", makespan, list(range(len(tasks))), None)]
+    if set(names) <= {"makespan"}:
+        return terms, auxiliaries
+
+    tardiness_vars, tardiness_weights = [], []
+    late_vars = []
+    completion_vars, completion_weights = [], []
+    for job, (final, due, weight) in job_groups(tasks).items():
+        if len(final) == 1:
+            completion = task_ends[final[0]]
+        else:
+            completion = model.NewIntVar(0, horizon, f"completion_{job}")
+            model.AddMaxEquality(completion, [task_ends[i] for i in final])
+            auxiliaries.append(("completion", completion, final, None))
+        completion_vars.append(completion)
+        completion_weights.append(weight)
+        if due is None:
+            continue
+        if "tardiness" in names:
+            tardiness = model.NewIntVar(0, max(horizon - due, 0), f"tardiness_{job}")
+            model.Add(tardiness >= completion - due)
+            auxiliaries.append(("tardiness", tardiness, final, due))
+            tardiness_vars.append(tardiness)
+            tardiness_weights.append(weight)
+        if "late_jobs" in names:
+            late = model.NewBoolVar(f"late_{job}")
+            model.Add(completion <= due).OnlyEnforceIf(late.Not())
+            auxiliaries.append(("late", late, final, due))
+            late_vars.append(late)
+
+    terms["tardiness"] = cp_model.LinearExpr.WeightedSum(tardiness_vars, tardiness_weights)
+    terms["late_jobs"] = cp_model.LinearExpr.Sum(late_vars)
+    terms["weighted_completion"] = cp_model.LinearExpr.WeightedSum(completion_vars, completion_weights)
+    return terms, auxiliaries
+
+
+# Function to hint the helper variables of add_objective_terms from hinted task ends (task index -> end
+# minute). A solution hint that leaves these out is only partial, and CP-SAT may settle for a worse
+# completion of it than the hinted schedule itself.
+def hint_objective_terms(model, auxiliaries, ends):
+    for kind, var, final, due in auxiliaries:
+        if not all(i in ends for i in final):
+            continue
+        completion = max((ends[i] for i in final), default=0)
+        if kind == "completion":
+            model.AddHint(var, completion)
+        elif kind == "tardiness":
+            model.AddHint(var, max(completion - due, 0))
+        else:
+            model.AddHint(var, completion > due)
+
+
+# Function to compute every objective for a schedule given the end minute of each task
+def evaluate_objectives(tasks, ends):
+    values = {"makespan": max(ends, default=0), "tardiness": 0, "late_jobs": 0, "weighted_completion": 0}
+    for final, due, weight in job_groups(tasks).values():
+        completion = max(ends[i] for i in final)
+        values["weighted_completion"] += weight * completion
+        if due is not None and completion > due:
+            values["tardiness"] += weight * (completion - due)
+            values["late_jobs"] += 1
+    return values
+
+
+# Function to combine the values (or bounds) of one objective over independent parts of a schedule
+def combine_objective(name, values):
+    return sum(values) if name in ADDITIVE_OBJECTIVES else max(values, default=0)
@@ -0,0 +1,260 @@
+import argparse
+import cProfile
+import json
+import os
+import sys
+import time
+from datetime import datetime
+import numpy as np
+from resource_calendars import ResourceCalendars
+from run_log import get_logger, set_level
+from run_stats import RunStats
+from solver_config import SolverConfig
+from task_table import TaskTable
+
+logger = get_logger(__name__)
+
+# Snapshots of a prepared problem (scheduling_core.prepare_problem), to replay and profile a run offline.
+#
+# A snapshot is a directory with meta.json and one .npy file per array below. load_problem memory-maps
+# the arrays: the tasks become a TaskTable over the mapped arrays and their resource names and the job
+# order are decoded row by row when read, so loading skips the database, the pandas preprocessing and the
+# calendar expansion of a normal run and reads little more than the small frozen, hint and downtime
+# arrays. Strings are fixed-width unicode arrays,
+# variable-length lists are stored in CSR form (values plus offsets, row i is
+# values[offsets[i]:offsets[i + 1]]) and missing numbers are -1.
+#   tasks        job_numbers, task_numbers, durations, due, weight, pred_offsets/pred_indices,
+#                resource_offsets/resource_codes (indices into resource_names)
+#   resources    resource_names (resources, then groups, then any unknown names tasks use), resource_ids
+#                (-1 for names that are not a resource), group_names, group_offsets/group_members
+#   job order    job_order_offsets/job_order_tasks, the order the rolling horizon takes the jobs in
+#   frozen,      frozen_tasks, frozen_start, frozen_end, frozen_start_time, frozen_end_time and
+#   hints        frozen_resource_offsets/frozen_resource_ids; the same with hint_ for the task hints
+#   downtime     blocked_resources, blocked_starts, blocked_ends, the blocked intervals after frozen
+#                work was taken out of them
+# meta.json has the start date, the calendars (shop hours, resource hours and exceptions), the solver
+# parameters of the run and the counts. A snapshot is taken with
+#   python schedule_jobs.py --save-problem DIR ...
+# and replayed, with the run's solver parameters unless flags override them, with
+#   python problem_snapshot.py DIR [--time-limit 30] [--profile solve.prof]
+
+SNAPSHOT_VERSION = 1
+
+
+# Function to write a prepared problem, and the solver parameters it was solved with, to a directory
+def save_problem(problem, path, solver_config=None):
+    os.makedirs(path, exist_ok=True)
+    tasks = problem["tasks"]
+    calendars = problem["calendars"]
+    resource_mapping = problem["resource_mapping"]
+    resource_group_mapping = problem["resource_group_mapping"]
+
+    # Names tasks use that are neither a resource nor a group are kept too, so the replay warns about them
+    resource_names = list(dict.fromkeys(
+        list(resource_mapping) + list(resource_group_mapping) + [name for task in tasks for name in task["resources"]]))
+    resource_codes = {name: code for code, name in enumerate(resource_names)}
+    arrays = {
+        "job_numbers": np.array([task["task_id"][0] for task in tasks], dtype=str),
+        "task_numbers": np.array([task["task_id"][1] for task in tasks], dtype=str),
+        "durations": np.array([task["duration"] for task in tasks], dtype=np.int64),
+        "due": np.array([task.get("due", -1) for task in tasks], dtype=np.int64),
+        "weight": np.array([task.get("weight", -1) for task in tasks], dtype=np.int64),
+        "resource_names": np.array(resource_names, dtype=str),
+        "resource_ids": np.array([resource_mapping.get(name, -1) for name in resource_names], dtype=np.int64),
+        "group_names": np.array(list(resource_group_mapping), dtype=str),
+    }
+    arrays["pred_offsets"], arrays["pred_indices"] = _csr([task["predecessor_indices"] for task in tasks])
+    arrays["resource_offsets"], arrays["resource_codes"] = _csr(
+        [[resource_codes[name] for name in task["resources"]] for task in tasks])
+    arrays["group_offsets"], arrays["group_members"] = _csr(list(resource_group_mapping.values()))
+    arrays["job_order_offsets"], arrays["job_order_tasks"] = _csr(problem["job_order"])
+    for prefix, previous in (("frozen", problem["frozen_tasks"]), ("hint", problem["task_hints"])):
+        indices = sorted(previous)
+        arrays[f"{prefix}_tasks"] = np.array(indices, dtype=np.int64)
+        arrays[f"{prefix}_start"] = np.array([previous[i]["start"] for i in indices], dtype=np.int64)
+        arrays[f"{prefix}_end"] = np.array([previous[i]["end"] for i in indices], dtype=np.int64)
+        arrays[f"{prefix}_start_time"] = np.array([previous[i]["start_time"] for i in indices], dtype="datetime64[us]")
+        arrays[f"{prefix}_end_time"] = np.array([previous[i]["end_time"] for i in indices], dtype="datetime64[us]")
+        arrays[f"{prefix}_resource_offsets"], arrays[f"{prefix}_resource_ids"] = _csr(
+            [previous[i]["resource_ids"] for i in indices])
+    blocked = [(res_id, start, end) for res_id, intervals in sorted(problem["blocked_intervals"].items())
+               for start, end in intervals]
+    arrays["blocked_resources"] = np.array([res_id for res_id, _, _ in blocked], dtype=np.int64)
+    arrays["blocked_starts"] = np.array([start for _, start, _ in blocked], dtype=np.int64)
+    arrays["blocked_ends"] = np.array([end for _, _, end in blocked], dtype=np.int64)
+
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "start_date": problem["start_date"].isoformat(),
+        "resources": [int(res_id) for res_id in problem["resource_ids"]],
+        "interchangeable_groups": sorted(problem["interchangeable_groups"]),
+        "working_hours": {int(day): list(hours) for day, hours in calendars.working_hours.items()},
+        "resource_hours": {int(res_id): {int(day): list(span) for day, span in hours.items()}
+                           for res_id, hours in calendars.resource_hours.items()},
+        "exceptions": [(None if res_id is None else int(res_id), start.isoformat(), end.isoformat())
+                       for res_id, start, end in calendars.exceptions],
+        "calendar_version": calendars.version,
+        "horizon": problem["downtime_horizon"],
+        "solver_config": solver_config.to_dict() if solver_config is not None else None,
+        "counts": {"tasks": len(tasks), "frozen": len(problem["frozen_tasks"]), "hints": len(problem["task_hints"]),
+                   "blocked_intervals": len(blocked)},
+    }
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    logger.info("Saved problem snapshot %s: %d tasks, %d frozen, %d hinted, %d blocked intervals", path,
+                len(tasks), len(problem["frozen_tasks"]), len(problem["task_hints"]), len(blocked))
+
+
+# Function to load a snapshot written by save_problem. Returns (problem, solver_config); solver_config is
+# None when the snapshot was saved without one.
+def load_problem(path):
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if meta.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported problem snapshot version {meta.get('version')!r} in {path}")
+
+    def load(name):
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+
+    resource_names = load("resource_names").tolist()
+    resource_ids = load("resource_ids").tolist()
+    tasks = TaskTable(load("job_numbers"), load("task_numbers"), load("durations"),
+                      _CsrRows(load("resource_offsets"), load("resource_codes"), resource_names),
+                      load("pred_offsets"), load("pred_indices"), due=load("due"), weight=load("weight"))
+
+    previous = {}
+    for prefix in ("frozen", "hint"):
+        previous[prefix] = {
+            i: {"start": start, "end": end, "start_time": start_time, "end_time": end_time,
+                "resource_ids": res_ids}
+            for i, start, end, start_time, end_time, res_ids in zip(
+                load(f"{prefix}_tasks").tolist(), load(f"{prefix}_start").tolist(), load(f"{prefix}_end").tolist(),
+                load(f"{prefix}_start_time").astype(datetime).tolist(),
+                load(f"{prefix}_end_time").astype(datetime).tolist(),
+                _rows(load(f"{prefix}_resource_offsets"), load(f"{prefix}_resource_ids")))
+        }
+
+    blocked_intervals = {}
+    for res_id, start, end in zip(load("blocked_resources").tolist(), load("blocked_starts").tolist(),
+                                  load("blocked_ends").tolist()):
+        blocked_intervals.setdefault(res_id, []).append((start, end))
+
+    # The calendars are rebuilt from their definition; the downtime itself comes from the snapshot, and
+    # is only computed again if the solution runs past its horizon
+    start_date = datetime.fromisoformat(meta["start_date"])
+    calendars = ResourceCalendars(
+        start_date, {int(day): tuple(hours) for day, hours in meta["working_hours"].items()}, meta["resources"],
+        {int(res_id): {int(day): tuple(span) for day, span in hours.items()}
+         for res_id, hours in meta["resource_hours"].items()},
+        [(res_id, datetime.fromisoformat(start), datetime.fromisoformat(end))
+         for res_id, start, end in meta["exceptions"]],
+        meta["calendar_version"],
+    )
+
+    problem = {
+        "start_date": start_date,
+        "tasks": tasks,
+        "job_order": _CsrRows(load("job_order_offsets"), load("job_order_tasks")),
+        "resource_ids": meta["resources"],
+        "resource_mapping": {name: res_id for name, res_id in zip(resource_names, resource_ids) if res_id >= 0},
+        "resource_group_mapping": dict(zip(load("group_names").tolist(),
+                                           _rows(load("group_offsets"), load("group_members")))),
+        "interchangeable_groups": set(meta["interchangeable_groups"]),
+        "calendars": calendars,
+        "frozen_tasks": previous["frozen"],
+        "task_hints": previous["hint"],
+        "blocked_intervals": blocked_intervals,
+        "downtime_horizon": meta["horizon"],
+    }
+    solver_config = SolverConfig().updated(meta["solver_config"]) if meta["solver_config"] else None
+    return problem, solver_config
+
+
+# Function to pack lists of integers into CSR form: (offsets, values)
+def _csr(rows):
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in rows], out=offsets[1:])
+    values = np.fromiter((value for row in rows for value in row), dtype=np.int64, count=int(offsets[-1]))
+    return offsets, values
+
+
+# Read-only sequence over CSR arrays whose row i is values[offsets[i]:offsets[i + 1]] as a list, mapped
+# through names when given. Rows are decoded when they are read, so memory-mapped arrays stay unread
+# until the solver needs them.
+class _CsrRows:
+    def __init__(self, offsets, values, names=None):
+        self.offsets = offsets
+        self.values = values
+        self.names = names
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"Row {i} out of range for {len(self)} rows")
+        i %= len(self)
+        row = self.values[self.offsets[i]:self.offsets[i + 1]].tolist()
+        return [self.names[value] for value in row] if self.names is not None else row
+
+    def __iter__(self):
+        for row in _rows(self.offsets, self.values):
+            yield [self.names[value] for value in row] if self.names is not None else row
+
+
+# Function to unpack CSR arrays into a list of lists
+def _rows(offsets, values):
+    offsets = offsets.tolist()
+    values = values.tolist()
+    return [values[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+# Function to replay a snapshot from the command line: load it, solve it and report the timings, the
+# solver figures and optionally a cProfile of the solve
+def main(argv=None):
+    from scheduling_core import build_schedule, solve_problem
+
+    parser = argparse.ArgumentParser(description="Replay a saved scheduling problem")
+    parser.add_argument("path", help="Snapshot directory written with schedule_jobs.py --save-problem")
+    parser.add_argument("--profile", metavar="FILE", help="Write a cProfile of the solve to FILE")
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    SolverConfig.add_arguments(parser)
+    args = parser.parse_args(argv)
+    set_level(args.log_level)
+
+    load_start = time.perf_counter()
+    problem, solver_config = load_problem(args.path)
+    load_time = time.perf_counter() - load_start
+    try:
+        solver_config = (solver_config or SolverConfig.from_env()).updated(args)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Loaded {len(problem['tasks'])} tasks in {1000 * load_time:.1f} ms")
+
+    stats = RunStats(dedicated_process=True)
+    stats.task_count = len(problem["tasks"])
+    stats.begin("solve")
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler is not None:
+        profiler.enable()
+    result = solve_problem(problem, solver_config, stats)
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"Wrote profile to {args.profile}")
+    stats.begin("convert")
+    if result["feasible"]:
+        build_schedule(problem, result, solver_config)
+    stats.finish("SUCCEEDED" if result["feasible"] else "FAILED")
+    print(stats.summary())
+    return 0 if result["feasible"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import numpy as np
+from calendar_index import CalendarIndex
+from run_log import get_logger
+
+logger = get_logger(__name__)
+
+# Calendars kept in memory, most recently used last; a long-running process (the GUI or the backend's
+# worker) then reuses the index and downtime of an unchanged calendar across runs
+CACHE_SIZE = 8
+
+_cache = OrderedDict()
+
+
+# Per-resource calendars and dated exceptions, as stretches of the solver's axis a resource cannot work.
+#
+# The axis (see calendar_index.CalendarIndex) counts the shop's working minutes from the calendar table,
+# so a task that does not fit in one day simply carries on the next working morning. On top of that:
+#   resource_hours   resource id -> {weekday: (start minute, end minute)}, the hours of a resource that
+#                    does not work the shop's hours; weekdays missing from its map are days off
+#   exceptions       [(resource id or None, start datetime, end datetime)]: leave, maintenance,
+#                    breakdowns for one resource, or with None a holiday for the whole shop
+# A shop-wide exception that covers a whole working day takes that day out of the axis, exactly like a
+# weekday without working hours. Everything else becomes fixed intervals in each affected resource's
+# no-overlap constraint (blocked_intervals in scheduler_model). No task runs through such a stretch; a
+# task longer than the free stretches of its resources is split into segments that pause over them (see
+# scheduling_core.split_paused_tasks). Resource hours outside the shop's hours are clipped, as the axis
+# has no minutes there; resource_calendars warns about every resource that loses hours that way.
+#
+# Building the downtime is a few numpy operations per resource; the result is cached per calendar
+# version (a hash of the calendars) and start date, and extended when a run needs a longer horizon.
+class ResourceCalendars:
+    def __init__(self, start_date, working_hours, resource_ids, resource_hours=None, exceptions=(), version=None):
+        self.start_date = start_date
+        self.working_hours = working_hours
+        self.resource_ids = sorted(resource_ids)
+        self.resource_hours = resource_hours or {}
+        self.exceptions = list(exceptions)
+        self.version = version or calendar_version(working_hours, self.resource_ids, self.resource_hours,
+                                                   self.exceptions)
+        self.closed_dates = shop_closures(working_hours, self.exceptions)
+        self.index = CalendarIndex(start_date, working_hours, closed_dates=self.closed_dates)
+        self.horizon = 0
+        self._downtime = {}
+
+    # Downtime up to at least `horizon` elapsed minutes: resource id -> sorted, disjoint [(start, end), ...]
+    def downtime(self, horizon):
+        if horizon > self.horizon:
+            # Grow geometrically so a run that needs a little more does not rebuild everything each time
+            self._build(max(horizon, 2 * self.horizon))
+        return self._downtime
+
+    # Downtime covering `work` minutes of work plus the downtime that falls within it, so a schedule of
+    # that length is not pushed past the end of the computed calendar by the downtime itself
+    def downtime_for(self, work, rounds=10):
+        horizon = max(int(work), 1)
+        for _ in range(rounds):
+            downtime = self.downtime(horizon)
+            blocked = max((sum(min(end, horizon) - start for start, end in intervals if start < horizon)
+                           for intervals in downtime.values()), default=0)
+            if work + blocked <= horizon:
+                break
+            horizon = int(work + blocked)
+        return self.downtime(horizon)
+
+    def _build(self, horizon):
+        index = self.index
+        index.ensure_covers(horizon)
+        day_offsets, day_starts, cum_ends, cum_begins = index.as_arrays()
+        days = int(np.searchsorted(cum_ends, horizon, side="left")) + 1
+        day_offsets, day_starts, cum_ends, cum_begins = (day_offsets[:days], day_starts[:days], cum_ends[:days],
+                                                         cum_begins[:days])
+        weekdays = (np.datetime64(self.start_date, "D").astype(np.int64) + day_offsets + 3) % 7 + 1  # 1 = Monday
+        lengths = cum_ends - cum_begins
+
+        downtime = {}
+        for res_id, hours in self.resource_hours.items():
+            # Minutes of each working day before the resource starts and after it stops, clipped to the day
+            res_starts = np.array([hours.get(day, (0, 0))[0] for day in range(8)], dtype=np.int64)[weekdays]
+            res_ends = np.array([hours.get(day, (0, 0))[1] for day in range(8)], dtype=np.int64)[weekdays]
+            off = res_starts >= res_ends
+            before = np.where(off, lengths, np.clip(res_starts - day_starts, 0, lengths))
+            after = np.where(off, lengths, np.clip(res_ends - day_starts, 0, lengths))
+            intervals = [(begin, begin + minutes) for begin, minutes in zip(cum_begins.tolist(), before.tolist())
+                         if minutes > 0]
+            intervals += [(begin + minutes, end) for begin, minutes, end
+                          in zip(cum_begins.tolist(), after.tolist(), cum_ends.tolist()) if begin + minutes < end]
+            downtime[res_id] = intervals
+
+        for res_id, start, end in self.exceptions:
+            start, end = index.to_elapsed(start), index.to_elapsed(end)
+            if end <= start:  # Outside working hours, or on a day the shop is closed anyway
+                continue
+            for target in (self.resource_ids if res_id is None else [res_id]):
+                downtime.setdefault(target, []).append((start, end))
+
+        self._downtime = {res_id: merge_intervals(intervals) for res_id, intervals in downtime.items() if intervals}
+        self.horizon = int(cum_ends[-1]) if len(cum_ends) else horizon
+
+
+# Function to get the calendars for a run, reusing the cached ones when neither the calendars nor the
+# start date have changed since an earlier run in this process
+def resource_calendars(start_date, working_hours, resource_ids, resource_hours=None, exceptions=()):
+    resource_hours = resource_hours or {}
+    for res_id, days in clipped_hours(working_hours, resource_hours).items():
+        logger.warning("Resource %s works outside the shop's hours on weekdays %s; those hours are not scheduled",
+                       res_id, days)
+    version = calendar_version(working_hours, resource_ids, resource_hours, exceptions)
+    key = (version, start_date)
+    calendars = _cache.get(key)
+    if calendars is not None:
+        _cache.move_to_end(key)
+        logger.info("Calendar version %s reused from the cache", version)
+        return calendars
+
+    calendars = ResourceCalendars(start_date, working_hours, resource_ids, resource_hours, exceptions, version)
+    _cache[key] = calendars
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return calendars
+
+
+# Function to find the resources whose hours reach outside the shop's: resource id -> the weekdays (1 =
+# Monday) on which it starts before the shop opens, stops after it closes or works while it is closed
+def clipped_hours(working_hours, resource_hours):
+    clipped = {}
+    for res_id, hours in resource_hours.items():
+        days = []
+        for day, (start, end) in sorted(hours.items()):
+            shop_start, shop_end = working_hours.get(day, (0, 0))
+            if start < end and (shop_start >= shop_end or start < shop_start or end > shop_end):
+                days.append(day)
+        if days:
+            clipped[res_id] = days
+    return clipped
+
+
+# Function to fingerprint the calendars: any change to the shop hours, the resources, their hours or the
+# exceptions gives a different version
+def calendar_version(working_hours, resource_ids, resource_hours, exceptions):
+    content = json.dumps({
+        "working_hours": sorted((int(day), list(hours)) for day, hours in working_hours.items()),
+        "resources": sorted(int(res_id) for res_id in resource_ids),
+        "resource_hours": sorted(
+            (int(res_id), sorted((int(day), list(span)) for day, span in hours.items()))
+            for res_id, hours in resource_hours.items()
+        ),
+        "exceptions": sorted(
+            (-1 if res_id is None else int(res_id), start.isoformat(), end.isoformat())
+            for res_id, start, end in exceptions
+        ),
+    })
+    return hashlib.sha1(content.encode()).hexdigest()[:12]
+
+
+# Function to find the dates on which a shop-wide exception covers all of the day's working hours
+def shop_closures(working_hours, exceptions):
+    closed = set()
+    for res_id, start, end in exceptions:
+        if res_id is not None:
+            continue
+        day = datetime.combine(start.date(), datetime.min.time())
+        while day < end:
+            start_minutes, end_minutes = working_hours.get(day.isoweekday(), (0, 0))
+            if (start_minutes < end_minutes and start <= day + timedelta(minutes=start_minutes)
+                    and end >= day + timedelta(minutes=end_minutes)):
+                closed.add(day.date())
+            day += timedelta(days=1)
+    return closed
+
+
+# Function to find the longest stretch before `horizon` that none of the sorted, disjoint intervals covers
+def longest_free(intervals, horizon):
+    edges = [0]
+    for start, end in intervals:
+        edges.extend((start, end))
+    edges.append(max(horizon, edges[-1]))
+    return max(edges[k + 1] - edges[k] for k in range(0, len(edges), 2))
+
+
+# Function to sort intervals and join the ones that overlap or touch
+def merge_intervals(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+# Function to take the stretches in `busy` out of the downtime, e.g. frozen work that is already on the
+# floor during what is now a maintenance window. Returns the new downtime and the number of clashes.
+def release_busy(downtime, busy):
+    released = dict(downtime)
+    clashes = 0
+    for res_id, stretches in busy.items():
+        intervals = released.get(res_id)
+        if not intervals:
+            continue
+        for busy_start, busy_end in stretches:
+            remaining = []
+            for start, end in intervals:
+                if end <= busy_start or start >= busy_end:
+                    remaining.append((start, end))
+                    continue
+                clashes += 1
+                if start < busy_start:
+                    remaining.append((start, busy_start))
+                if end > busy_end:
+                    remaining.append((busy_end, end))
+            intervals = remaining
+        released[res_id] = intervals
+    return released, clashes
@@ -0,0 +1,119 @@
+import contextvars
+import logging
+import os
+from collections import deque
+
+# All scheduler modules log under this name, so one handler on it captures a whole run
+LOGGER_NAME = "scheduler"
+
+# Lines kept in memory for the GUI console; older lines are dropped
+DEFAULT_CAPACITY = 5000
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(message)s"
+LOG_DATE_FORMAT = "%H:%M:%S"
+
+# The runs whose capture_log is active where a record is logged, innermost last. A new thread starts
+# without any (see bind_run).
+_active_runs = contextvars.ContextVar("scheduler_runs", default=())
+
+
+# Function to get a module logger under the scheduler logger
+def get_logger(name):
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+# Function to set the scheduler log level from a name ("DEBUG", "INFO", ...), falling back to
+# SCHEDULER_LOG_LEVEL and then INFO. Per-task and per-resource detail is only produced at DEBUG.
+def set_level(level=None):
+    level = (level or os.environ.get("SCHEDULER_LOG_LEVEL") or "INFO").upper()
+    if not isinstance(logging.getLevelName(level), int):
+        raise ValueError(f"Unknown log level {level!r}")
+    logging.getLogger(LOGGER_NAME).setLevel(level)
+    return level
+
+
+# Logging handler that keeps the last `capacity` formatted lines in memory.
+#
+# Every line gets a sequence number, so a reader that remembers the last number it saw can fetch
+# only the newer lines instead of re-reading the whole buffer.
+class RingBufferHandler(logging.Handler):
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        super().__init__()
+        self.lines = deque(maxlen=capacity)
+        self.sequence = 0
+        self.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self.lock:
+            self.sequence += 1
+            self.lines.append((self.sequence, line))
+
+    # Lines after sequence number `after`, plus the newest sequence number
+    def since(self, after=0):
+        with self.lock:
+            return [line for sequence, line in self.lines if sequence > after], self.sequence
+
+    def getvalue(self):
+        with self.lock:
+            return "\n".join(line for _, line in self.lines)
+
+    def clear(self):
+        with self.lock:
+            self.lines.clear()
+
+
+# Filter that lets through the records logged while its run is active (see capture_log)
+class _RunFilter(logging.Filter):
+    def filter(self, record):
+        return self in _active_runs.get()
+
+
+# Function to wrap a callable that another thread will call (a solver callback, a relay thread) so that
+# what it logs goes to the runs active where it was wrapped
+def bind_run(function):
+    runs = _active_runs.get()
+
+    def bound(*args, **kwargs):
+        token = _active_runs.set(runs)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _active_runs.reset(token)
+    return bound
+
+
+# Context manager that attaches a handler (or a stream, wrapped in a StreamHandler) to the scheduler
+# logger for the duration of one run. The handler only receives the records logged in the context that
+# entered it, so runs in threads of one process keep their logs apart; threads the run starts itself
+# log into it through bind_run.
+class capture_log:
+    def __init__(self, target):
+        if target is None or isinstance(target, logging.Handler):
+            self.handler = target
+        else:
+            self.handler = logging.StreamHandler(target)
+            self.handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+        self.run = _RunFilter()
+        self.token = None
+
+    def __enter__(self):
+        logger = logging.getLogger(LOGGER_NAME)
+        if logger.level == logging.NOTSET:
+            set_level()
+        self.token = _active_runs.set(_active_runs.get() + (self.run,))
+        if self.handler is not None:
+            self.handler.addFilter(self.run)
+            logger.addHandler(self.handler)
+        return self.handler
+
+    def __exit__(self, *exc_info):
+        if self.handler is not None:
+            logging.getLogger(LOGGER_NAME).removeHandler(self.handler)
+            self.handler.removeFilter(self.run)
+        _active_runs.reset(self.token)
+        return False
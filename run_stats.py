@@ -0,0 +1,192 @@
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; memory figures are then left empty
+    resource = None
+
+# Solver figures copied from a solve result into the run record
+SOLVER_STAT_KEYS = (
+    "engine", "status", "makespan", "objective", "best_bound", "gap", "wall_time", "build_time",
+    "conflicts", "branches", "solutions", "stopped", "variables", "constraints", "intervals", "component_count",
+    "window_count", "objectives", "worker_peak_rss_mb", "precedence_violations",
+)
+
+
+# Function to read a memory figure of this process from /proc (Linux) in MB, or None where it has none
+def _proc_status_mb(field):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+# Function to read the peak resident memory of this process in MB: since the last reset_peak_rss where
+# /proc has it (Linux), otherwise since the process started (ru_maxrss is in KB on Linux)
+def peak_rss_mb():
+    peak = _proc_status_mb("VmHWM")
+    if peak is not None or resource is None:
+        return peak
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+# Function to read the current resident memory of this process in MB, or None where /proc is missing
+def current_rss_mb():
+    return _proc_status_mb("VmRSS")
+
+
+# Function to reset the peak resident memory of this process to its current size (Linux 4.0 and later),
+# so that peak_rss_mb reports the peak from here on. Returns False where the peak cannot be reset.
+# The peak belongs to the whole process, so only a process that runs nothing else may reset it.
+def reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+# Function to compute the relative gap between an objective value and its bound
+def relative_gap(objective, bound):
+    if objective is None or bound is None:
+        return None
+    return abs(objective - bound) / max(1.0, abs(objective))
+
+
+# Timings and solver statistics for one scheduling run.
+#
+# A run moves through phases (fetch, preprocess, solve, convert, write); begin(name) closes the current
+# phase and starts the next, recording each one's wall-clock time, the process's resident memory when it
+# began and its peak memory. With dedicated_process (a process that runs only this run, e.g. a backend
+# pool worker) the peak is reset when a phase begins, so it is the phase's own ("peak_scope": "phase").
+# Otherwise, or where the peak cannot be reset, it is left alone for the other runs and the host (GUI,
+# backend thread mode) and the figure is the process's peak so far ("peak_scope": "process").
+# Memory of the pool processes of a decomposed solve is not part of it; their largest peak comes with the
+# solver figures as worker_peak_rss_mb. The solver figures come from the solve result; while the solver
+# is still running, incumbent holds the latest improved solution it reported. to_row() gives the columns
+# of the schedule_run table.
+class RunStats:
+    def __init__(self, dedicated_process=False):
+        self.dedicated_process = dedicated_process
+        self.started_at = datetime.now()
+        self.finished_at = None
+        self.status = "RUNNING"
+        self.task_count = 0
+        self.phases = []
+        self.solver = {}
+        self.solver_config = {}
+        self.incumbent = {}
+        self.error = None
+        self._current = None
+
+    def begin(self, name):
+        self.end()
+        reset = self.dedicated_process and reset_peak_rss()
+        self._current = (name, time.perf_counter(), current_rss_mb(), "phase" if reset else "process")
+
+    def end(self):
+        if self._current is None:
+            return
+        name, started, baseline, scope = self._current
+        self._current = None
+        self.phases.append({
+            "name": name,
+            "seconds": round(time.perf_counter() - started, 4),
+            "baseline_rss_mb": baseline,
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_scope": scope,
+        })
+
+    @contextmanager
+    def phase(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def record_solver(self, result):
+        self.solver = {key: result[key] for key in SOLVER_STAT_KEYS if result.get(key) is not None}
+        if "gap" not in self.solver:
+            gap = relative_gap(result.get("objective", result.get("makespan")), result.get("best_bound"))
+            if gap is not None:
+                self.solver["gap"] = round(gap, 6)
+
+    def record_incumbent(self, event):
+        gap = relative_gap(event.get("objective"), event.get("bound"))
+        self.incumbent = {
+            "makespan": event.get("makespan"),
+            "best_bound": event.get("bound"),
+            "gap": round(gap, 6) if gap is not None else None,
+            "elapsed": round(event.get("elapsed", 0.0), 3),
+        }
+
+    # Name of the phase in progress, or None between phases
+    @property
+    def current_phase(self):
+        return self._current[0] if self._current else None
+
+    def finish(self, status):
+        self.end()
+        self.status = status
+        self.finished_at = datetime.now()
+
+    # Peak memory of this process over the run's phases, or None when no phase could be measured
+    @property
+    def peak_rss_mb(self):
+        return max((phase["peak_rss_mb"] for phase in self.phases if phase["peak_rss_mb"] is not None),
+                   default=None)
+
+    # "phase" when every phase's peak is its own, "process" when the peak is the process's so far
+    @property
+    def peak_rss_scope(self):
+        scopes = {phase["peak_scope"] for phase in self.phases if phase["peak_rss_mb"] is not None}
+        if not scopes:
+            return None
+        return "phase" if scopes == {"phase"} else "process"
+
+    def phase_seconds(self):
+        return {phase["name"]: phase["seconds"] for phase in self.phases}
+
+    def summary(self):
+        phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.phase_seconds().items())
+        solver = ", ".join(f"{key}={value:.4g}" if isinstance(value, float) else f"{key}={value}"
+                           for key, value in self.solver.items())
+        scope = " (process-wide)" if self.peak_rss_scope == "process" else ""
+        return f"Run {self.status}: {phases}; peak memory {self.peak_rss_mb} MB{scope}; {solver}"
+
+    def to_row(self):
+        figures = self.solver or self.incumbent
+        return {
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "status": self.status,
+            "error": self.error,
+            "progress": self.current_phase or self.status,
+            "engine": self.solver.get("engine"),
+            "task_count": self.task_count,
+            "makespan": figures.get("makespan"),
+            "best_bound": figures.get("best_bound"),
+            "gap": figures.get("gap"),
+            "solver_status": self.solver.get("status"),
+            "solver_wall_time": self.solver.get("wall_time"),
+            "conflicts": self.solver.get("conflicts"),
+            "branches": self.solver.get("branches"),
+            "variables": self.solver.get("variables"),
+            "constraints": self.solver.get("constraints"),
+            "intervals": self.solver.get("intervals"),
+            "peak_rss_mb": self.peak_rss_mb,
+            "peak_rss_scope": self.peak_rss_scope,
+            "worker_peak_rss_mb": self.solver.get("worker_peak_rss_mb"),
+            "phases": json.dumps(self.phases),
+            "solver_stats": json.dumps(self.solver),
+            "solver_config": json.dumps(self.solver_config),
+        }
@@ -0,0 +1,344 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import pandas as pd
+from data_sources import open_sink, open_source
+from resource_calendars import merge_intervals
+from run_log import capture_log, get_logger, set_level
+from run_stats import RunStats
+from scheduling_core import DEFAULT_FREEZE_HOURS, build_schedule, prepare_problem, set_due_dates, solve_problem
+from solver_config import SolverConfig
+
+logger = get_logger(__name__)
+
+# What-if scenarios: variants of the current problem, solved side by side without touching the live schedule.
+#
+# A scenario is {"name": ..., "deltas": [...]}, each delta a dict with a "type":
+#   add_resource      {"name", "groups": [group names], "like": resource whose hours and downtime it
+#                      shares (default: the shop's hours)}
+#   remove_resource   {"name"}; a resource that tasks name directly or that frozen work uses cannot be removed
+#   change_group      {"group", "add": [resource names], "remove": [resource names]}
+#   change_quantity   {"job", "quantity"}; the durations of the job's open tasks follow
+#   block_job         {"job"}
+#   unblock_job       {"job"}
+#   promised_date     {"job", "date": "YYYY-MM-DD" or a datetime}, e.g. to expedite a job
+# The input data is read and prepared once, with the blocked jobs included, and every scenario is
+# derived from that by dropping the tasks of its blocked jobs and patching the rest, which costs
+# milliseconds. Only the solves run in parallel, in a process pool. The results list the base (the problem
+# as it is) first, then the scenarios, each with its KPIs and the changes from the base:
+#   makespan, tardiness, late_jobs, weighted_completion   as in objectives
+#   utilization   work on the resources divided by their working minutes before the makespan
+# Nothing is written anywhere; promote() writes one scenario's schedule through a sink on request. It
+# writes the schedule only: the scenario's deltas are not applied to the jobs or resources themselves.
+#
+#   python scenarios.py scenarios.json --source snapshots/today --time-limit 30
+#   python scenarios.py scenarios.json --promote "second welder"
+
+DELTA_TYPES = ("add_resource", "remove_resource", "change_group", "change_quantity", "block_job", "unblock_job",
+               "promised_date")
+
+KPIS = ("makespan", "tardiness", "late_jobs", "weighted_completion", "utilization")
+
+
+# Function to read and prepare the input data once for any number of scenarios. All open jobs are
+# prepared, including blocked ones, so a scenario can unblock them; data must therefore be loaded with
+# include_blocked=True. Returns None (logged) on failure.
+def prepare_base(data, start_date, incremental=False, freeze_hours=DEFAULT_FREEZE_HOURS, warm_start=True):
+    jobs_df = data["jobs"][~data["jobs"]["completed"].astype(bool)].reset_index(drop=True)
+    # SQLite and CSV snapshots give the flag as 0/1; block_job and unblock_job set it to a bool
+    jobs_df["blocked"] = jobs_df["blocked"].astype(bool)
+    stats = RunStats()
+    problem = prepare_problem(dict(data, jobs=jobs_df.assign(blocked=False)), start_date, incremental, freeze_hours,
+                              warm_start, stats)
+    if problem is None:
+        logger.error("Could not prepare the base problem: %s", stats.error)
+        return None
+    tasks_df = data["tasks"]
+    work = {task_number: (setup_time, time_each) for task_number, setup_time, time_each in zip(
+        tasks_df["task_number"], pd.to_numeric(tasks_df["setup_time"], errors="coerce").fillna(0),
+        pd.to_numeric(tasks_df["time_each"], errors="coerce").fillna(0))}
+    return {"problem": problem, "jobs": jobs_df, "work": work}
+
+
+# Function to derive a scenario's problem from the prepared base. Raises ValueError for a delta that
+# does not apply (an unknown job or resource, or a change that leaves tasks without a resource).
+def apply_deltas(base, deltas):
+    problem = base["problem"]
+    calendars = problem["calendars"]
+    jobs_df = base["jobs"].copy()
+    resource_mapping = dict(problem["resource_mapping"])
+    resource_group_mapping = {name: list(members) for name, members in problem["resource_group_mapping"].items()}
+    blocked_intervals = dict(problem["blocked_intervals"])
+    calendar_of = dict(problem.get("calendar_of", {}))
+    job_numbers = set(jobs_df["job_number"])
+    quantities = {}
+
+    def job_row(delta):
+        if delta.get("job") not in job_numbers:
+            raise ValueError(f"Unknown or completed job {delta.get('job')!r}")
+        return jobs_df["job_number"] == delta["job"]
+
+    def resource_id(name):
+        if name not in resource_mapping:
+            raise ValueError(f"Unknown resource {name!r}")
+        return resource_mapping[name]
+
+    def group(name):
+        if name not in resource_group_mapping:
+            raise ValueError(f"Unknown resource group {name!r}")
+        return resource_group_mapping[name]
+
+    for delta in deltas:
+        kind = delta.get("type")
+        if kind == "add_resource":
+            name = delta.get("name")
+            if not name or name in resource_mapping or name in resource_group_mapping:
+                raise ValueError(f"add_resource needs a new resource name, got {name!r}")
+            res_id = max(list(resource_mapping.values()) + [0]) + 1
+            resource_mapping[name] = res_id
+            for group_name in delta.get("groups", []):
+                group(group_name).append(res_id)
+            if delta.get("like"):
+                like_id = resource_id(delta["like"])
+                downtime = blocked_intervals.get(like_id, [])
+                calendar_of[res_id] = calendar_of.get(like_id, like_id)
+            else:
+                # The shop's hours: only the shop-wide exceptions apply
+                closures = [(calendars.index.to_elapsed(start), calendars.index.to_elapsed(end))
+                            for res, start, end in calendars.exceptions if res is None]
+                downtime = merge_intervals((start, end) for start, end in closures if end > start)
+            if downtime:
+                blocked_intervals[res_id] = list(downtime)
+        elif kind == "remove_resource":
+            name = delta.get("name")
+            res_id = resource_id(name)
+            named = sum(1 for task in problem["tasks"] if name in task["resources"])
+            if named:
+                raise ValueError(f"Cannot remove resource {name!r}: {named} tasks name it directly")
+            if any(res_id in frozen["resource_ids"] for frozen in problem["frozen_tasks"].values()):
+                raise ValueError(f"Cannot remove resource {name!r}: frozen tasks use it")
+            del resource_mapping[name]
+            blocked_intervals.pop(res_id, None)
+            for members in resource_group_mapping.values():
+                if res_id in members:
+                    members.remove(res_id)
+        elif kind == "change_group":
+            members = group(delta.get("group"))
+            for name in delta.get("add", []):
+                if resource_id(name) not in members:
+                    members.append(resource_id(name))
+            for name in delta.get("remove", []):
+                if resource_id(name) in members:
+                    members.remove(resource_id(name))
+        elif kind == "change_quantity":
+            if not delta.get("quantity", 0) > 0:
+                raise ValueError(f"change_quantity needs a positive quantity, got {delta.get('quantity')!r}")
+            jobs_df.loc[job_row(delta), "quantity"] = delta["quantity"]
+            quantities[delta["job"]] = delta["quantity"]
+        elif kind in ("block_job", "unblock_job"):
+            jobs_df.loc[job_row(delta), "blocked"] = kind == "block_job"
+        elif kind == "promised_date":
+            date = delta.get("date")
+            date = datetime.strptime(date, "%Y-%m-%d") if isinstance(date, str) else date
+            jobs_df.loc[job_row(delta), "promised_date"] = pd.Timestamp(date)
+        else:
+            raise ValueError(f"Unknown delta type {kind!r}; expected one of {list(DELTA_TYPES)}")
+
+    # Keep the tasks of the scenario's eligible jobs; predecessors never cross jobs, so the kept tasks'
+    # predecessors are all kept too
+    eligible_jobs = jobs_df[~jobs_df["blocked"].astype(bool)]
+    eligible = set(eligible_jobs["job_number"])
+    kept = [i for i, task in enumerate(problem["tasks"]) if task["task_id"][0] in eligible]
+    new_index = {i: k for k, i in enumerate(kept)}
+    tasks = []
+    job_tasks = {}
+    for i in kept:
+        task = dict(problem["tasks"][i])
+        task["predecessor_indices"] = [new_index[p] for p in task["predecessor_indices"]]
+        job_number, task_number = task["task_id"]
+        if job_number in quantities and i not in problem["frozen_tasks"]:
+            setup_time, time_each = base["work"][task_number]
+            task["duration"] = int(max(1, setup_time + time_each * quantities[job_number]))
+        task.pop("due", None)
+        job_tasks.setdefault(job_number, []).append(len(tasks))
+        tasks.append(task)
+    set_due_dates(tasks, job_tasks, eligible_jobs, calendars.index)
+
+    # Tasks must still have a resource to run on
+    for name, members in resource_group_mapping.items():
+        if not members and any(name in task["resources"] for task in tasks):
+            raise ValueError(f"Resource group {name!r} has no members left but tasks need it")
+
+    return dict(
+        problem,
+        tasks=tasks,
+        job_order=[job_tasks.get(job_number, []) for job_number
+                   in eligible_jobs.sort_values("promised_date", na_position="last")["job_number"]],
+        resource_ids=sorted(resource_mapping.values()),
+        resource_mapping=resource_mapping,
+        resource_group_mapping=resource_group_mapping,
+        frozen_tasks={new_index[i]: frozen for i, frozen in problem["frozen_tasks"].items() if i in new_index},
+        task_hints={new_index[i]: hint for i, hint in problem["task_hints"].items() if i in new_index},
+        blocked_intervals=blocked_intervals,
+        calendar_of=calendar_of,
+    )
+
+
+# Function to solve every scenario and the base. data is the input data (as a source returns it);
+# scenarios is a list of {"name", "deltas"}. The scenarios are solved `workers` at a time (default:
+# one per core, at most one per scenario), each with an equal share of the solver's workers.
+# Returns the results, base first: {"name", "ok", "status", "engine", "error", "task_count",
+# "wall_time", "kpis", "changes", "schedule"}, or None when the base could not be prepared.
+def run_scenarios(data, start_date, scenarios, solver_config=None, incremental=False,
+                  freeze_hours=DEFAULT_FREEZE_HOURS, warm_start=True, workers=None):
+    solver_config = solver_config or SolverConfig.from_env()
+    names = [scenario.get("name") for scenario in scenarios]
+    if len(set(names)) < len(names) or "base" in names or not all(names):
+        raise ValueError("Every scenario needs a unique name other than 'base'")
+
+    base = prepare_base(data, start_date, incremental, freeze_hours, warm_start)
+    if base is None:
+        return None
+    problems = [("base", apply_deltas(base, []))]
+    problems += [(scenario["name"], apply_deltas(base, scenario.get("deltas", []))) for scenario in scenarios]
+
+    workers = min(len(problems), workers or os.cpu_count() or 1)
+    scenario_config = solver_config.updated({"num_workers": max(1, solver_config.num_workers // workers)})
+    logger.info("Solving %d scenarios and the base in %d processes", len(scenarios), workers)
+    # Spawned workers do not inherit this process's threads, locks or open connections
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(_solve_scenario, name, problem, scenario_config) for name, problem in problems]
+        results = [future.result() for future in futures]
+
+    base_kpis = results[0]["kpis"]
+    for result in results:
+        result["changes"] = {
+            kpi: round(result["kpis"][kpi] - base_kpis[kpi], 4) for kpi in KPIS
+            if result["kpis"].get(kpi) is not None and base_kpis.get(kpi) is not None
+        }
+        logger.info("Scenario %s: %s", result["name"], result["status"] if not result["ok"] else ", ".join(
+            f"{kpi}={result['kpis'][kpi]:g}" for kpi in KPIS))
+    return results
+
+
+# Function to write one scenario's schedule through a sink (default: the scheduler database)
+def promote(result, sink=None):
+    if not result["ok"]:
+        raise ValueError(f"Scenario {result['name']!r} has no schedule to promote")
+    sink = sink if sink is not None else open_sink()
+    sink.write_schedule(result["schedule"])
+    logger.info("Promoted the schedule of scenario %s (%s)", result["name"], sink.description)
+
+
+# Function to solve one scenario; runs in a worker process, one scenario at a time
+def _solve_scenario(name, problem, solver_config):
+    stats = RunStats(dedicated_process=True)
+    result = solve_problem(problem, solver_config, stats)
+    schedule = build_schedule(problem, result, solver_config) if result["feasible"] else None
+    kpis = dict(result.get("objectives") or {})
+    if result["feasible"]:
+        kpis["utilization"] = _utilization(problem, result)
+    return {
+        "name": name,
+        "ok": schedule is not None,
+        "status": result["status"],
+        "engine": result["engine"],
+        "error": None if schedule is not None else stats.error or "No solution found",
+        "task_count": len(problem["tasks"]),
+        "wall_time": result.get("wall_time"),
+        "kpis": kpis,
+        "schedule": schedule or [],
+    }
+
+
+# Function to compute the share of the resources' working minutes before the makespan that tasks use; a
+# task that pauses over downtime only uses its duration
+def _utilization(problem, result):
+    makespan = result["makespan"]
+    busy = available = 0
+    used = {}
+    for task, assigned in zip(problem["tasks"], result["assignments"]):
+        for res_id in assigned:
+            used[res_id] = used.get(res_id, 0) + task["duration"]
+    for res_id in problem["resource_ids"]:
+        downtime = sum(min(end, makespan) - start for start, end in problem["blocked_intervals"].get(res_id, [])
+                       if start < makespan)
+        available += max(makespan - downtime, 0)
+        busy += used.get(res_id, 0)
+    return round(busy / available, 4) if available else 0.0
+
+
+# Function to read the scenarios from a JSON file, solve them and print the comparison; returns the
+# process exit code
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare what-if scenarios without changing the live schedule")
+    parser.add_argument("scenarios", help='JSON file with a list of {"name": ..., "deltas": [...]}')
+    parser.add_argument("--source",
+                        help="Where to read the input: db (default), a database URL or a snapshot directory")
+    parser.add_argument("--start-date", type=lambda value: datetime.strptime(value, "%Y-%m-%d"),
+                        default=datetime.combine(datetime.now().date(), datetime.min.time()),
+                        help="Schedule start date as YYYY-MM-DD (default: today)")
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--freeze-hours", type=float, default=DEFAULT_FREEZE_HOURS)
+    parser.add_argument("--no-warm-start", action="store_false", dest="warm_start")
+    parser.add_argument("--processes", type=int, help="Scenarios solved at the same time (default: one per core)")
+    parser.add_argument("--promote", metavar="NAME", help="Write this scenario's schedule to the sink")
+    parser.add_argument("--sink", help="Where --promote writes: db (default), a database URL or a directory")
+    parser.add_argument("--json", action="store_true", help="Print the results, including the schedules, as JSON")
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    SolverConfig.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    set_level(args.log_level)
+    try:
+        solver_config = SolverConfig.from_env().updated(args)
+    except ValueError as e:
+        parser.error(str(e))
+    with open(args.scenarios) as f:
+        scenarios = json.load(f)
+
+    with capture_log(sys.stderr):
+        data = open_source(args.source).load(include_schedule=args.incremental or args.warm_start,
+                                             include_blocked=True)
+        if data is None:
+            print("Failed to fetch data", file=sys.stderr)
+            return 1
+        try:
+            results = run_scenarios(data, args.start_date, scenarios, solver_config, args.incremental,
+                                    args.freeze_hours, args.warm_start, args.processes)
+        except ValueError as e:
+            print(f"Invalid scenario: {e}", file=sys.stderr)
+            return 1
+        if results is None:
+            return 1
+        if args.promote:
+            chosen = [result for result in results if result["name"] == args.promote]
+            if not chosen:
+                print(f"No scenario named {args.promote!r}", file=sys.stderr)
+                return 1
+            promote(chosen[0], open_sink(args.sink))
+
+    if args.json:
+        json.dump(results, sys.stdout, default=str, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    print(f"{'scenario':<24} {'status':>9} {'tasks':>6} {'makespan':>15} {'tardiness':>17} {'late':>9} "
+          f"{'utilization':>15}")
+    for result in results:
+        if not result["ok"]:
+            print(f"{result['name']:<24} {result['status']:>9} {result['task_count']:>6}")
+            continue
+        kpis, changes = result["kpis"], result["changes"]
+        print(f"{result['name']:<24} {result['status']:>9} {result['task_count']:>6} "
+              f"{kpis['makespan']:>8} {changes.get('makespan', 0):>+6} {kpis['tardiness']:>9} "
+              f"{changes.get('tardiness', 0):>+7} {kpis['late_jobs']:>4} {changes.get('late_jobs', 0):>+4} "
+              f"{kpis['utilization']:>7.1%} {100 * changes.get('utilization', 0):>+6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import csv
+from io import StringIO
+import sqlalchemy as sa
+
+# Columns written for every schedule entry (the id column is filled by the database)
+SCHEDULE_COLUMNS = ("task_number", "start_time", "end_time", "resources_used")
+
+INSERT_SCHEDULE = sa.text("""
+    INSERT INTO public.schedule (task_number, start_time, end_time, resources_used)
+    VALUES (:task_number, :start_time, :end_time, :resources_used);
+""")
+
+# Columns written for every scheduling run; see run_stats.RunStats.to_row
+SCHEDULE_RUN_COLUMNS = (
+    "started_at", "finished_at", "status", "error", "progress", "engine", "task_count", "makespan", "best_bound", "gap",
+    "solver_status", "solver_wall_time", "conflicts", "branches", "variables", "constraints", "intervals",
+    "peak_rss_mb", "peak_rss_scope", "worker_peak_rss_mb", "phases", "solver_stats", "solver_config",
+)
+
+INSERT_SCHEDULE_RUN = sa.text(f"""
+    INSERT INTO public.schedule_run ({", ".join(SCHEDULE_RUN_COLUMNS)})
+    VALUES ({", ".join(":" + column for column in SCHEDULE_RUN_COLUMNS)});
+""")
+
+
+# Function to replace the contents of public.schedule with a new schedule in one transaction.
+#
+# The old rows are deleted and the new rows loaded inside the same transaction, so readers of
+# /api/schedule keep seeing the previous schedule until the commit and never an empty table.
+# DELETE is used rather than TRUNCATE because TRUNCATE takes an exclusive lock that would block
+# those readers for the duration of the write.
+def save_schedule(engine, schedule):
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2":
+            _copy_schedule(conn, schedule)
+        else:
+            _insert_schedule(conn, schedule)
+
+
+# PostgreSQL path: stream all rows into a staging table with COPY FROM STDIN, then swap them in.
+# COPY reads an unquoted empty CSV field as NULL, so resources_used (NOT NULL, empty for tasks
+# without resources) is listed under FORCE_NOT_NULL to keep it an empty string.
+def _copy_schedule(conn, schedule):
+    columns = ", ".join(SCHEDULE_COLUMNS)
+    conn.execute(sa.text(f"""
+        CREATE TEMP TABLE schedule_staging ON COMMIT DROP AS
+        SELECT {columns} FROM public.schedule WITH NO DATA;
+    """))
+
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    for entry in schedule:
+        writer.writerow([entry[column] for column in SCHEDULE_COLUMNS])
+    buffer.seek(0)
+
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY schedule_staging ({columns}) FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (resources_used))",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+    conn.execute(sa.text("DELETE FROM public.schedule;"))
+    conn.execute(sa.text(f"INSERT INTO public.schedule ({columns}) SELECT {columns} FROM schedule_staging;"))
+
+
+# Fallback for other drivers: one executemany round trip for all rows
+def _insert_schedule(conn, schedule):
+    conn.execute(sa.text("DELETE FROM public.schedule;"))
+    if schedule:
+        conn.execute(INSERT_SCHEDULE, [{column: entry[column] for column in SCHEDULE_COLUMNS} for entry in schedule])
+
+
+# Function to append one run record to public.schedule_run
+def save_run(engine, row):
+    with engine.begin() as conn:
+        conn.execute(INSERT_SCHEDULE_RUN, {column: row.get(column) for column in SCHEDULE_RUN_COLUMNS})
+
+
+# Function to check whether a stop was requested for a run (POST /api/schedule/run/<id>/stop)
+def stop_requested(engine, run_id):
+    with engine.connect() as conn:
+        value = conn.execute(sa.text("SELECT stop_requested FROM public.schedule_run WHERE id = :run_id"),
+                             {"run_id": run_id}).scalar()
+    return bool(value)
+
+
+# Function to mark every run that is still queued or running failed, or only those queued by the server
+# worker with process id worker_pid; returns how many there were
+def fail_active_runs(engine, error, finished_at, worker_pid=None):
+    query = ("UPDATE public.schedule_run SET status = 'FAILED', error = :error, finished_at = :finished_at "
+             "WHERE status IN ('QUEUED', 'RUNNING')")
+    if worker_pid is not None:
+        query += " AND worker_pid = :worker_pid"
+    with engine.begin() as conn:
+        result = conn.execute(sa.text(query), {"error": error, "finished_at": finished_at, "worker_pid": worker_pid})
+    return result.rowcount
+
+
+# Function to update columns of an existing run record, e.g. one queued by the backend.
+# With active_only=True the update is skipped once the run has finished, so a late progress update
+# can never overwrite the final status.
+def update_run(engine, run_id, values, active_only=False):
+    columns = [column for column in values if column in SCHEDULE_RUN_COLUMNS or column == "log"]
+    if not columns:
+        return
+    query = f"UPDATE public.schedule_run SET {', '.join(f'{column} = :{column}' for column in columns)} WHERE id = :run_id"
+    if active_only:
+        query += " AND status IN ('QUEUED', 'RUNNING')"
+    with engine.begin() as conn:
+        conn.execute(sa.text(query), {**{column: values[column] for column in columns}, "run_id": run_id})
@@ -0,0 +1,404 @@
+import tkinter as tk
+from tkcalendar import DateEntry
+import tkinter.ttk as ttk
+import webbrowser
+import argparse
+import queue
+import random
+import threading
+import traceback
+from datetime import datetime
+from schedule_jobs import schedule_jobs, DEFAULT_FREEZE_HOURS
+from solver_config import SolverConfig, ENGINES
+from objectives import OBJECTIVES
+from run_log import DEFAULT_CAPACITY, RingBufferHandler, set_level
+
+# Milliseconds between checks for worker messages and new log lines
+POLL_INTERVAL = 100
+# Milliseconds between frames of the console animation
+ANIMATION_INTERVAL = 80
+
+# GUI class for scheduling
+#
+# Runs go to a worker thread (CP-SAT releases the GIL while it searches, and independent components are
+# solved in worker processes), which reports back through a queue that the Tk main loop polls.
+class SchedulerGUI:
+    def __init__(self, root, solver_config=None, animation=False):
+        self.root = root
+        self.solver_config = solver_config or SolverConfig.from_env()
+        self.root.title("Timely Scheduler")
+        self.root.geometry("1000x700")
+
+        # Label and date picker for starting date
+        self.label = tk.Label(root, text="Select Schedule Start Date:")
+        self.label.pack(pady=10)
+
+        self.date_entry = DateEntry(root, width=12, background='darkblue',
+                                   foreground='white', borderwidth=2, date_pattern='y-mm-dd')
+        self.date_entry.pack(pady=10)
+
+        # Incremental mode: keep started and near-term tasks where they are
+        self.incremental_var = tk.BooleanVar(value=False)
+        self.incremental_check = tk.Checkbutton(root, text="Incremental (keep tasks inside the freeze window)",
+                                                variable=self.incremental_var)
+        self.incremental_check.pack(pady=5)
+
+        self.freeze_frame = tk.Frame(root)
+        self.freeze_label = tk.Label(self.freeze_frame, text="Freeze window (hours):")
+        self.freeze_label.pack(side=tk.LEFT)
+        self.freeze_hours_var = tk.StringVar(value=str(DEFAULT_FREEZE_HOURS))
+        self.freeze_spinbox = tk.Spinbox(self.freeze_frame, from_=0, to=720, width=5,
+                                         textvariable=self.freeze_hours_var)
+        self.freeze_spinbox.pack(side=tk.LEFT)
+        self.freeze_frame.pack(pady=5)
+
+        # Warm start: hint the solver with the previously saved schedule
+        self.warm_start_var = tk.BooleanVar(value=True)
+        self.warm_start_check = tk.Checkbutton(root, text="Warm start from the previous schedule",
+                                               variable=self.warm_start_var)
+        self.warm_start_check.pack(pady=5)
+
+        # Solver parameters, prefilled from the environment and command line
+        self.solver_frame = tk.Frame(root)
+        self.solver_vars = {}
+        for key, label in (("max_time_in_seconds", "Time limit (s):"), ("num_workers", "Workers:"),
+                           ("relative_gap_limit", "Gap limit:"), ("random_seed", "Seed:")):
+            tk.Label(self.solver_frame, text=label).pack(side=tk.LEFT)
+            self.solver_vars[key] = tk.StringVar(value=str(getattr(self.solver_config, key)))
+            tk.Entry(self.solver_frame, width=6, textvariable=self.solver_vars[key]).pack(side=tk.LEFT, padx=(0, 10))
+        tk.Label(self.solver_frame, text="Engine:").pack(side=tk.LEFT)
+        self.solver_vars["engine"] = tk.StringVar(value=self.solver_config.engine)
+        tk.OptionMenu(self.solver_frame, self.solver_vars["engine"], *ENGINES).pack(side=tk.LEFT)
+        tk.Label(self.solver_frame, text="Objective:").pack(side=tk.LEFT)
+        self.solver_vars["objective"] = tk.StringVar(value=self.solver_config.objective)
+        objective_choices = list(OBJECTIVES) + ["tardiness,makespan"]
+        if self.solver_config.objective not in objective_choices:
+            objective_choices.append(self.solver_config.objective)
+        tk.OptionMenu(self.solver_frame, self.solver_vars["objective"], *objective_choices).pack(side=tk.LEFT)
+        self.solver_frame.pack(pady=5)
+
+        # Schedule and stop buttons; stopping keeps the best schedule found so far
+        self.button_frame = tk.Frame(root)
+        self.schedule_button = tk.Button(self.button_frame, text="Run Scheduler", command=self.run_scheduler)
+        self.schedule_button.pack(side=tk.LEFT, padx=5)
+        self.stop_button = tk.Button(self.button_frame, text="Stop (keep best)", command=self.stop_scheduler,
+                                     state=tk.DISABLED)
+        self.stop_button.pack(side=tk.LEFT, padx=5)
+        self.animation_var = tk.BooleanVar(value=animation)
+        self.animation_check = tk.Checkbutton(self.button_frame, text="Animation", variable=self.animation_var,
+                                              command=self.toggle_animation)
+        self.animation_check.pack(side=tk.LEFT, padx=5)
+        self.button_frame.pack(pady=10)
+
+        # Status label
+        self.status_label = tk.Label(root, text="")
+        self.status_label.pack(pady=10)
+
+        # Error label (for displaying errors above the console)
+        self.error_label = tk.Label(root, text="", fg="red")
+        self.error_label.pack(pady=5)
+
+        # Progress of the solver: the latest incumbent
+        self.progress_label = tk.Label(root, text="")
+        self.progress_label.pack(pady=5)
+
+        # Frame for the Matrix console: an optional animation strip above the log
+        self.console_frame = tk.Frame(root, bg="black")
+        self.console_canvas = tk.Canvas(self.console_frame, bg="black", highlightthickness=0, height=80)
+        self.console_text_frame = tk.Frame(self.console_frame, bg="black")
+        self.console_text_area = tk.Text(
+            self.console_text_frame,
+            bg="black",
+            fg="#00FF00",
+            font=("Courier", 12),
+            wrap=tk.WORD,
+            borderwidth=0,
+            highlightthickness=0
+        )
+        self.console_scrollbar = tk.Scrollbar(self.console_text_frame, orient=tk.VERTICAL, command=self.console_text_area.yview)
+        self.console_text_area.configure(yscrollcommand=self.console_scrollbar.set)
+        self.console_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.console_text_area.pack(fill=tk.BOTH, expand=True)
+        self.console_text_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True)
+        self.console_text_area.config(state=tk.DISABLED)
+
+        # Matrix effect variables: one falling character per column, moved rather than redrawn
+        self.chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789@#$%^&*()_+-=[]{}|;:,.<>?"
+        self.column_width = 20  # Width of each column in pixels
+        self.drops = []
+        self.drop_items = []
+        self.matrix_active = False
+
+        # Frame for the table and web interface button
+        self.table_frame = tk.Frame(root)
+        self.table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        # Web interface button (initially hidden)
+        self.web_button = tk.Button(self.table_frame, text="View on Web Interface",
+                                   command=self.open_web_interface)
+        # Table for displaying the schedule (initially empty)
+        self.tree = None
+
+        # Bounded log of the current run, shown in the console
+        self.output_buffer = RingBufferHandler()
+        self.console_sequence = 0
+
+        # State of the run in progress: the worker thread, its message queue and its stop request
+        self.worker = None
+        self.messages = queue.Queue()
+        self.stop_event = threading.Event()
+        self.closing = False
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+    def init_matrix_effect(self):
+        # One text item per column, created once and moved by animate_matrix
+        self.console_canvas.delete("matrix")
+        num_columns = max(1, self.console_canvas.winfo_width() // self.column_width)
+        self.drops = [random.randint(-20, 0) for _ in range(num_columns)]
+        self.drop_items = [
+            self.console_canvas.create_text(i * self.column_width + self.column_width // 2, 0, text="",
+                                            fill="#00FF00", font=("Courier", 14), tags="matrix")
+            for i in range(num_columns)
+        ]
+
+    def animate_matrix(self):
+        if not self.matrix_active:
+            return
+
+        rows = max(1, self.console_canvas.winfo_height() // self.column_width)
+        for i, item in enumerate(self.drop_items):
+            y = self.drops[i]
+            if 0 <= y < rows:
+                # Fade effect: brighter at the top, dimmer as it falls
+                brightness = max(0, 255 - (y * 40))
+                self.console_canvas.itemconfigure(item, text=random.choice(self.chars),
+                                                  fill=f"#{brightness:02x}FF{brightness:02x}")
+                self.console_canvas.coords(item, i * self.column_width + self.column_width // 2,
+                                           y * self.column_width)
+            else:
+                self.console_canvas.itemconfigure(item, text="")
+
+            # Move the drop down, and restart it at random once it has left the canvas
+            self.drops[i] += 1
+            if self.drops[i] >= rows and random.random() > 0.9:
+                self.drops[i] = random.randint(-20, 0)
+
+        # Schedule the next frame
+        self.root.after(ANIMATION_INTERVAL, self.animate_matrix)
+
+    def start_animation(self):
+        if self.matrix_active:
+            return
+        self.console_canvas.pack(side=tk.TOP, fill=tk.X, before=self.console_text_frame)
+        self.console_canvas.update_idletasks()
+        self.init_matrix_effect()
+        self.matrix_active = True
+        self.animate_matrix()
+
+    def stop_animation(self):
+        self.matrix_active = False
+        self.console_canvas.pack_forget()
+
+    def toggle_animation(self):
+        if self.animation_var.get() and self.worker is not None:
+            self.start_animation()
+        else:
+            self.stop_animation()
+
+    def update_console(self):
+        # Append only the log lines that arrived since the last update
+        lines, self.console_sequence = self.output_buffer.since(self.console_sequence)
+        if not lines:
+            return
+        self.console_text_area.config(state=tk.NORMAL)
+        self.console_text_area.insert(tk.END, "\n".join(lines) + "\n")
+        # Keep the widget as bounded as the log buffer; the text ends in a newline, so its last line is empty
+        excess = int(self.console_text_area.index("end-1c").split(".")[0]) - 1 - DEFAULT_CAPACITY
+        if excess > 0:
+            self.console_text_area.delete("1.0", f"{excess + 1}.0")
+        self.console_text_area.config(state=tk.DISABLED)
+        self.console_text_area.yview(tk.END)  # Auto-scroll to the bottom
+
+    def show_console(self):
+        # Show the Matrix console, starting from an empty log
+        self.console_text_area.config(state=tk.NORMAL)
+        self.console_text_area.delete(1.0, tk.END)
+        self.console_text_area.config(state=tk.DISABLED)
+        self.console_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        if self.animation_var.get():
+            self.start_animation()
+
+    def hide_console(self):
+        # Hide the Matrix console
+        self.stop_animation()
+        self.console_frame.pack_forget()
+
+    def open_web_interface(self):
+        webbrowser.open("https://nmiproduksie.azurewebsites.net/")
+        self.root.destroy()
+
+    def display_schedule(self, schedule):
+        if self.tree:
+            self.tree.destroy()
+
+        self.web_button.pack(pady=5)
+
+        self.tree = ttk.Treeview(self.table_frame, columns=("Task Number", "Start Time", "End Time", "Resources Used"),
+                                show="headings")
+        self.tree.heading("Task Number", text="Task Number")
+        self.tree.heading("Start Time", text="Start Time")
+        self.tree.heading("End Time", text="End Time")
+        self.tree.heading("Resources Used", text="Resources Used")
+
+        self.tree.column("Task Number", width=150)
+        self.tree.column("Start Time", width=200)
+        self.tree.column("End Time", width=200)
+        self.tree.column("Resources Used", width=200)
+
+        scrollbar = ttk.Scrollbar(self.table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        for entry in schedule:
+            self.tree.insert("", tk.END, values=(
+                entry["task_number"],
+                entry["start_time"].strftime("%Y-%m-%d %H:%M:%S"),
+                entry["end_time"].strftime("%Y-%m-%d %H:%M:%S"),
+                entry["resources_used"]
+            ))
+
+    def run_scheduler(self):
+        start_date_str = self.date_entry.get()
+        try:
+            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
+            freeze_hours = float(self.freeze_hours_var.get())
+            incremental = self.incremental_var.get()
+            warm_start = self.warm_start_var.get()
+            solver_config = self.solver_config.updated({
+                "max_time_in_seconds": float(self.solver_vars["max_time_in_seconds"].get()),
+                "num_workers": int(self.solver_vars["num_workers"].get()),
+                "relative_gap_limit": float(self.solver_vars["relative_gap_limit"].get()),
+                "random_seed": int(self.solver_vars["random_seed"].get()),
+                "engine": self.solver_vars["engine"].get(),
+                "objective": self.solver_vars["objective"].get(),
+            })
+            self.status_label.config(text="Scheduling in progress...", fg="blue")
+            self.error_label.config(text="")  # Clear any previous error
+            if self.tree:  # Clear the previous schedule table if it exists
+                self.tree.destroy()
+            self.web_button.pack_forget()  # Hide the web button
+            self.progress_label.config(text="")
+
+            # Clear the output buffer
+            self.output_buffer.clear()
+            self.console_sequence = 0
+            self.show_console()  # Show the Matrix console
+
+            # Run the scheduling in a worker thread; poll_worker picks up its messages on the Tk main loop
+            self.stop_event = threading.Event()
+            self.worker = threading.Thread(target=self.schedule_in_thread, daemon=True,
+                                           args=(start_date, incremental, freeze_hours, warm_start, solver_config))
+            self.schedule_button.config(state=tk.DISABLED)
+            self.stop_button.config(state=tk.NORMAL)
+            self.worker.start()
+            self.root.after(POLL_INTERVAL, self.poll_worker)
+
+        except ValueError:
+            self.status_label.config(text="Invalid input. Use YYYY-MM-DD, a number of freeze hours and numeric solver settings.",
+                                     fg="red")
+            self.hide_console()
+
+    # Runs in the worker thread: Tk may only be used from the main thread, so everything goes through the queue
+    def schedule_in_thread(self, start_date, incremental, freeze_hours, warm_start, solver_config):
+        try:
+            schedule = schedule_jobs(start_date, self.output_buffer, incremental=incremental,
+                                     freeze_hours=freeze_hours, warm_start=warm_start, solver_config=solver_config,
+                                     progress=lambda event: self.messages.put(("incumbent", event)),
+                                     stop_event=self.stop_event)
+        except Exception:
+            self.messages.put(("error", traceback.format_exc()))
+        else:
+            self.messages.put(("done", schedule))
+
+    def poll_worker(self):
+        finished = False
+        incumbent = None
+        while True:
+            try:
+                kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "incumbent":
+                incumbent = payload  # Only the latest one is worth showing
+            else:
+                finished = True
+                result = (kind, payload)
+        if incumbent is not None:
+            self.show_incumbent(incumbent)
+        self.update_console()  # After the queue, so a finished run's last lines are shown too
+
+        if not finished:
+            self.root.after(POLL_INTERVAL, self.poll_worker)
+            return
+        self.worker = None
+        self.schedule_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
+        self.stop_animation()
+        if self.closing:
+            self.root.destroy()
+            return
+        kind, payload = result
+        if kind == "error":
+            self.status_label.config(text="Scheduling failed.", fg="red")
+            self.error_label.config(text=payload.strip().splitlines()[-1], fg="red")
+        else:
+            self.handle_schedule_result(payload)
+
+    def show_incumbent(self, event):
+        bound = event["bound"]
+        gap = abs(event["objective"] - bound) / max(1.0, abs(event["objective"]))
+        name = event.get("objective_name", "makespan")
+        self.progress_label.config(text=f"Best so far: {name} {event['objective']:.0f}, bound {bound:.0f}, "
+                                        f"gap {100 * gap:.1f}%, makespan {event['makespan']} min "
+                                        f"after {event['elapsed']:.1f} s")
+
+    def stop_scheduler(self):
+        if self.worker is not None:
+            self.stop_event.set()
+            self.stop_button.config(state=tk.DISABLED)
+            self.status_label.config(text="Stopping; keeping the best schedule found so far...", fg="blue")
+
+    def close(self):
+        # Let a run in progress stop and save its best schedule before the window goes away
+        if self.worker is None:
+            self.root.destroy()
+            return
+        self.closing = True
+        self.stop_scheduler()
+
+    def handle_schedule_result(self, schedule):
+        if schedule:
+            self.status_label.config(text="Scheduling complete! Saved to database.", fg="green")
+            self.display_schedule(schedule)
+            self.hide_console()  # Hide the console on success
+            self.error_label.config(text="")  # Clear any error message
+        else:
+            self.status_label.config(text="Scheduling failed.", fg="red")
+            self.error_label.config(text="Scheduling failed. See console output below for details.", fg="red")
+            # Keep the console visible to show the error details
+
+# Main function to launch the GUI
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Timely Scheduler")
+    SolverConfig.add_arguments(parser)
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Scheduler log level (default: SCHEDULER_LOG_LEVEL or INFO); DEBUG adds per-task detail")
+    parser.add_argument("--animation", action="store_true", help="Start with the console animation switched on")
+    args = parser.parse_args()
+    set_level(args.log_level)
+    solver_config = SolverConfig.from_env().updated(args)
+
+    root = tk.Tk()
+    app = SchedulerGUI(root, solver_config, animation=args.animation)
+    root.mainloop()
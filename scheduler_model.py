@@ -0,0 +1,985 @@
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from multiprocessing.managers import SyncManager
+import queue
+import signal
+import threading
+import time
+from ortools.sat.python import cp_model
+from task_bounds import compute_bounds
+from task_table import task_arrays
+from greedy_scheduler import greedy_for_objective
+from objectives import (add_objective_terms, combine_objective, evaluate_objectives, hint_objective_terms,
+                        parse_objective)
+from resource_calendars import merge_intervals
+from run_log import get_logger
+from run_stats import peak_rss_mb
+
+logger = get_logger(__name__)
+
+# Each task handed to this module is a dict with "task_id", "duration", "resources" (resource and
+# resource group names) and "predecessor_indices" (indices of its predecessors in the same task list), or
+# a TaskTable standing in for the list; build_model reads durations and predecessors from task_arrays.
+# frozen_tasks maps task index -> {"start", "end", "resource_ids"} for tasks pinned in place and
+# task_hints maps task index -> {"start", "resource_ids"} for tasks seeded from a previous schedule.
+# An optional "release" entry on a task is the earliest minute it may start; optional "due" and "weight"
+# entries feed the job-based objectives (see objectives.py). Tasks with a "segment" entry (k, n) are the
+# consecutive segments of one task that pauses over downtime (see scheduling_core.split_paused_tasks):
+# they share the task_id, each waits for the one before, all use the same group members, and the task
+# holds its resources from the start of the first to the end of the last.
+# blocked_intervals maps resource id -> [(start, end), ...] stretches of the axis the resource is
+# unavailable for, e.g. its downtime from resource_calendars. busy_intervals has the same form for work
+# already committed outside the tasks, e.g. by an earlier rolling-horizon window: it blocks the resource
+# just the same, but unlike downtime a paused task cannot hold the resource over it.
+#
+# The solve functions take an optional progress callback, called with an event dict for every improved
+# incumbent: {"type": "incumbent", "objective_name", "objective", "makespan", "bound", "elapsed"} plus
+# "starts" and "ends" when progress_assignments is set. Setting stop_event (a threading.Event) ends the
+# search early and keeps the best incumbent; the search always runs until it has at least one solution.
+
+
+# Function to build the CP-SAT model for a list of tasks
+# hint_source picks the solution hint: "previous" uses task_hints, "greedy" the greedy list schedule and
+# "auto" the previous schedule when there is one, otherwise the greedy schedule.
+# A task that needs a resource group gets one optional interval and one boolean per member, with exactly
+# one boolean true. group_encoding="selector" adds the older member-id IntVar with two reified
+# equalities per member on top, kept only so benchmarks can compare the two encodings.
+# group_cumulative adds a redundant cumulative constraint per group with the group size as capacity.
+# Groups in interchangeable_groups that qualify (see _pooled_groups) are modelled as a single cumulative
+# capacity instead; their members are assigned after the solve by assign_pool_members.
+# objective lists the objectives to minimize in priority order; the model minimizes the first one and
+# the terms of all of them are returned in "objective_terms" for a lexicographic solve.
+def build_model(tasks, resource_mapping, resource_group_mapping, frozen_tasks=None, task_hints=None,
+                blocked_intervals=None, hint_source="auto", greedy_priority="critical_path",
+                group_encoding="boolean", group_cumulative=False, interchangeable_groups=None,
+                objective=("makespan",), log=logger.info, busy_intervals=None):
+    frozen_tasks = frozen_tasks or {}
+    task_hints = task_hints or {}
+    downtime = blocked_intervals or {}
+    busy_intervals = busy_intervals or {}
+    blocked_intervals = {res_id: merge_intervals(downtime.get(res_id, []) + busy_intervals.get(res_id, []))
+                         for res_id in set(downtime) | set(busy_intervals)} if busy_intervals else downtime
+    objective = parse_objective(objective)
+    arrays = task_arrays(tasks)
+    durations, _, pred_offsets, pred_indices = (array.tolist() for array in arrays)
+    pooled_groups = _pooled_groups(tasks, resource_mapping, resource_group_mapping, frozen_tasks,
+                                   blocked_intervals, interchangeable_groups or (), log)
+    model = cp_model.CpModel()
+
+    # Define the horizon as the makespan of a greedy schedule, and bound every start time between its
+    # critical-path earliest start and the latest start that still meets that horizon
+    greedy = greedy_for_objective(tasks, resource_mapping, resource_group_mapping, frozen_tasks, downtime,
+                                  priority=greedy_priority, objective=objective, busy_intervals=busy_intervals,
+                                  arrays=arrays)
+    if objective[0] != "makespan":
+        # The best schedule for these may finish later than the greedy one, so the horizon leaves room for
+        # every free task to run one after another once everything already fixed has finished
+        committed = max([greedy["makespan"]] + [end for intervals in blocked_intervals.values() for _, end in intervals])
+        horizon = committed + sum(duration for i, duration in enumerate(durations) if i not in frozen_tasks)
+    else:
+        horizon = greedy["makespan"]
+    earliest, latest = compute_bounds(tasks, horizon, frozen_tasks, arrays)
+    # Stretches that start after the horizon cannot meet any task, so a calendar computed months ahead
+    # adds nothing to the model beyond it
+    blocked_intervals = {
+        res_id: [(start, end) for start, end in intervals if start < horizon]
+        for res_id, intervals in blocked_intervals.items()
+    }
+    log(f"Horizon set to {horizon} minutes (approximately {horizon / (60 * 24):.2f} days)")
+
+    # Variables: Start and end times for each task
+    task_starts = {}
+    task_ends = {}
+    for i, duration in enumerate(durations):
+        task_starts[i] = model.NewIntVar(earliest[i], latest[i], f"start_{i}")
+        task_ends[i] = model.NewIntVar(earliest[i] + duration, latest[i] + duration, f"end_{i}")
+        model.Add(task_ends[i] == task_starts[i] + duration)
+
+    # With the domains this tight a cold solve can struggle to find any solution, so unless a previous
+    # schedule is to be followed, hint the greedy schedule, which is feasible by construction
+    if hint_source == "greedy" or (hint_source == "auto" and not task_hints):
+        task_hints = {
+            i: {"start": greedy["starts"][i], "resource_ids": greedy["assignments"][i]}
+            for i in range(len(tasks)) if i not in frozen_tasks
+        }
+
+    # Seed free tasks with their previous start times
+    hinted_ends = {i: frozen_tasks[i]["start"] + durations[i] for i in frozen_tasks}
+    for i, previous in task_hints.items():
+        start = min(max(previous["start"], earliest[i]), latest[i])
+        model.AddHint(task_starts[i], start)
+        hinted_ends[i] = start + durations[i]
+
+    # Predecessor constraints
+    for i in range(len(durations)):
+        if i in frozen_tasks:  # Frozen tasks are already committed on the floor (see frozen_precedence_violations)
+            continue
+        for pred_index in pred_indices[pred_offsets[i]:pred_offsets[i + 1]]:
+            model.Add(task_starts[i] >= task_ends[pred_index])
+
+    # Resource constraints, starting with stretches where a resource is already unavailable
+    resource_intervals = {}
+    plain_intervals = {}  # Resource id -> intervals of tasks that do not pause
+    segment_choices = {}  # (task id, group name) -> the member choices all segments of a task share
+    task_resource_assignments = {}  # Task index -> fixed resource ids and (res_id, bool) choices per group
+    group_demands = {}  # Group name -> {task index: number of members the task needs from the group}
+    pool_demands = {group_name: {} for group_name in pooled_groups}  # Same, for pooled groups
+    for res_id, intervals in blocked_intervals.items():
+        for k, (start, end) in enumerate(intervals):
+            resource_intervals.setdefault(res_id, []).append(
+                model.NewIntervalVar(start, end - start, end, f"blocked_{res_id}_{k}")
+            )
+
+    for i, task in enumerate(tasks):
+        if i in frozen_tasks:
+            # Frozen tasks occupy the resources they were previously assigned
+            for res_id in frozen_tasks[i]["resource_ids"]:
+                interval = model.NewIntervalVar(
+                    task_starts[i], durations[i], task_ends[i], f"interval_{i}_res_{res_id}"
+                )
+                resource_intervals.setdefault(res_id, []).append(interval)
+                plain_intervals.setdefault(res_id, []).append(interval)
+            task_resource_assignments[i] = list(frozen_tasks[i]["resource_ids"])
+            continue
+
+        task_resources = task["resources"]
+        if not task_resources:
+            log(f"Warning: Task {task['task_id']} has no resources specified.")
+            continue
+
+        for res in task_resources:
+            if res in resource_mapping:
+                res_id = resource_mapping[res]
+                if res_id != -1:
+                    interval = model.NewIntervalVar(
+                        task_starts[i], durations[i], task_ends[i], f"interval_{i}_res_{res_id}"
+                    )
+                    resource_intervals.setdefault(res_id, []).append(interval)
+                    if "segment" not in task:
+                        plain_intervals.setdefault(res_id, []).append(interval)
+                    if i not in task_resource_assignments:
+                        task_resource_assignments[i] = []
+                    task_resource_assignments[i].append(res_id)
+            elif res in pooled_groups:
+                # The group name stands in for a member until assign_pool_members picks one
+                pool_demands[res][i] = pool_demands[res].get(i, 0) + 1
+                if i not in task_resource_assignments:
+                    task_resource_assignments[i] = []
+                task_resource_assignments[i].append(res)
+            elif res in resource_group_mapping:
+                group_resources = resource_group_mapping[res]
+                if not group_resources:
+                    log(f"Error: Resource group {res} has no resources for task {task['task_id']}.")
+                    continue
+
+                shared = segment_choices.get((task["task_id"], res)) if "segment" in task else None
+                if shared is not None:
+                    # A later segment runs on the members chosen for the first one
+                    for res_id, is_active in shared:
+                        resource_intervals.setdefault(res_id, []).append(model.NewOptionalIntervalVar(
+                            task_starts[i], durations[i], task_ends[i], is_active, f"interval_{i}_res_{res_id}"
+                        ))
+                    group_demands.setdefault(res, {})
+                    group_demands[res][i] = group_demands[res].get(i, 0) + 1
+                    task_resource_assignments.setdefault(i, []).append(shared)
+                    continue
+
+                member_choices = []
+                for res_id in group_resources:
+                    is_active = model.NewBoolVar(f"use_res_{res_id}_for_task_{i}")
+                    interval = model.NewOptionalIntervalVar(
+                        task_starts[i],
+                        durations[i],
+                        task_ends[i],
+                        is_active,
+                        f"interval_{i}_res_{res_id}"
+                    )
+                    resource_intervals.setdefault(res_id, []).append(interval)
+                    if "segment" not in task:
+                        plain_intervals.setdefault(res_id, []).append(interval)
+                    member_choices.append((res_id, is_active))
+
+                model.AddExactlyOne([is_active for _, is_active in member_choices])
+                if "segment" in task:
+                    segment_choices[(task["task_id"], res)] = member_choices
+
+                # Hint the group member that did this task in the previous schedule
+                previous_ids = []
+                if i in task_hints:
+                    previous_ids = [res_id for res_id in group_resources if res_id in task_hints[i]["resource_ids"]]
+                    if previous_ids:
+                        for res_id, is_active in member_choices:
+                            model.AddHint(is_active, res_id == previous_ids[0])
+
+                if group_encoding == "selector":
+                    selected_resource = model.NewIntVarFromDomain(
+                        cp_model.Domain.FromValues(group_resources),
+                        f"selected_resource_{i}_{res}"
+                    )
+                    for res_id, is_active in member_choices:
+                        model.Add(selected_resource == res_id).OnlyEnforceIf(is_active)
+                        model.Add(selected_resource != res_id).OnlyEnforceIf(is_active.Not())
+                    if previous_ids:
+                        model.AddHint(selected_resource, previous_ids[0])
+
+                group_demands.setdefault(res, {})
+                group_demands[res][i] = group_demands[res].get(i, 0) + 1
+                if i not in task_resource_assignments:
+                    task_resource_assignments[i] = []
+                task_resource_assignments[i].append(member_choices)
+
+    # Pooled groups: any set of tasks whose combined demand never exceeds the group size can be spread
+    # over the members, so the solver never has to choose between identical members. The members' common
+    # downtime takes the whole capacity.
+    for group_name, demands in pool_demands.items():
+        if demands:
+            members = resource_group_mapping[group_name]
+            intervals = [model.NewIntervalVar(task_starts[i], durations[i], task_ends[i],
+                                              f"pool_{group_name}_task_{i}") for i in demands]
+            interval_demands = list(demands.values())
+            for k, (start, end) in enumerate(blocked_intervals.get(members[0], [])):
+                intervals.append(model.NewIntervalVar(start, end - start, end, f"pool_{group_name}_blocked_{k}"))
+                interval_demands.append(len(members))
+            model.AddCumulative(intervals, interval_demands, len(members))
+
+    # Redundant cumulative per group: at any time, the tasks drawing on a group's members (through the
+    # group or by naming a member) cannot need more members than the group has
+    if group_cumulative:
+        for group_name, demands in group_demands.items():
+            members = set(resource_group_mapping[group_name])
+            intervals = []
+            interval_demands = []
+            for i, task in enumerate(tasks):
+                if i in frozen_tasks:
+                    demand = sum(1 for res_id in frozen_tasks[i]["resource_ids"] if res_id in members)
+                else:
+                    demand = demands.get(i, 0) + sum(
+                        1 for res in task["resources"] if res in resource_mapping and resource_mapping[res] in members
+                    )
+                if demand:
+                    intervals.append(model.NewIntervalVar(task_starts[i], durations[i], task_ends[i],
+                                                          f"group_{group_name}_task_{i}"))
+                    interval_demands.append(demand)
+            for res_id in members:
+                for k, (start, end) in enumerate(blocked_intervals.get(res_id, [])):
+                    intervals.append(model.NewIntervalVar(start, end - start, end, f"group_{group_name}_blocked_{res_id}_{k}"))
+                    interval_demands.append(1)
+            model.AddCumulative(intervals, interval_demands, len(members))
+
+    # Enforce no overlap for each resource
+    for res_id, intervals in resource_intervals.items():
+        logger.debug("Resource %s has %d intervals", res_id, len(intervals))
+        model.AddNoOverlap(intervals)
+
+    # A paused task holds its resources from its first segment to its last: only downtime (in the
+    # constraints above) may fall in between, so a second no-overlap keeps other work out of that stretch
+    held_intervals = {}
+    for task_id, indices in _segments(tasks).items():
+        first, last = indices[0], indices[-1]
+        length = model.NewIntVar(0, horizon, f"held_{first}_length")
+        model.Add(length == task_ends[last] - task_starts[first])
+        for res in task_resource_assignments.get(first, []):
+            if isinstance(res, list):
+                for res_id, is_active in res:
+                    held_intervals.setdefault(res_id, []).append(model.NewOptionalIntervalVar(
+                        task_starts[first], length, task_ends[last], is_active, f"held_{first}_res_{res_id}"))
+            else:
+                held_intervals.setdefault(res, []).append(
+                    model.NewIntervalVar(task_starts[first], length, task_ends[last], f"held_{first}_res_{res}"))
+    for res_id, intervals in held_intervals.items():
+        intervals += plain_intervals.get(res_id, [])
+        for k, (start, end) in enumerate(busy_intervals.get(res_id, [])):
+            if start < horizon:
+                intervals.append(model.NewIntervalVar(start, end - start, end, f"busy_{res_id}_{k}"))
+        model.AddNoOverlap(intervals)
+
+    # Objective: Minimize makespan, or the first of the requested objectives
+    makespan = model.NewIntVar(0, horizon, "makespan")
+    model.AddMaxEquality(makespan, [task_ends[i] for i in range(len(tasks))])
+    objective_terms, objective_auxiliaries = add_objective_terms(model, tasks, task_ends, makespan, objective, horizon)
+    hint_objective_terms(model, objective_auxiliaries, hinted_ends)
+    model.Minimize(objective_terms[objective[0]])
+
+    return {
+        "model": model,
+        "horizon": horizon,
+        "task_starts": task_starts,
+        "task_ends": task_ends,
+        "task_resource_assignments": task_resource_assignments,
+        "pool_demands": pool_demands,
+        "makespan": makespan,
+        "objective": objective,
+        "objective_terms": objective_terms,
+        "objective_auxiliaries": objective_auxiliaries,
+    }
+
+
+# Function to pick the interchangeable groups that can be modelled as a plain capacity.
+#
+# Members of such a group must really be identical within this model: no task names a member directly,
+# no other group used by the tasks shares a member, no member carries frozen work or a paused task's
+# segments, and all members have the same blocked intervals (e.g. shop-wide downtime; the pool's
+# cumulative then blocks all of them at once). Any of these ties a task to one particular member, so the
+# group keeps the per-member model.
+def _pooled_groups(tasks, resource_mapping, resource_group_mapping, frozen_tasks, blocked_intervals,
+                   interchangeable_groups, log=logger.info):
+    used_groups = set()
+    pinned = set()
+    for i, task in enumerate(tasks):
+        if i in frozen_tasks:
+            pinned.update(frozen_tasks[i]["resource_ids"])
+            continue
+        for res in task["resources"]:
+            if res in resource_mapping:
+                pinned.add(resource_mapping[res])
+            elif res in resource_group_mapping:
+                used_groups.add(res)
+                if "segment" in task:  # All segments need the same member
+                    pinned.update(resource_group_mapping[res])
+
+    pooled = set()
+    for group_name in used_groups & set(interchangeable_groups):
+        members = set(resource_group_mapping[group_name])
+        shared = any(members & set(resource_group_mapping[other]) for other in used_groups if other != group_name)
+        downtime = {tuple(blocked_intervals.get(res_id, ())) for res_id in members}
+        if members and not shared and not members & pinned and len(downtime) == 1:
+            pooled.add(group_name)
+        else:
+            log(f"Resource group {group_name} is marked interchangeable but its members are not identical "
+                f"in this run; modelling members individually.")
+    return pooled
+
+
+# Function to assign named members to the tasks of a pooled group after the solve.
+#
+# demands maps task index -> number of members needed. Tasks are taken in start order and each gets the
+# members that have been free the longest; as the cumulative constraint held, enough are always free.
+# Returns {task index: [member ids]}.
+def assign_pool_members(starts, ends, demands, members):
+    free_at = {res_id: 0 for res_id in members}
+    assigned = {}
+    for i in sorted(demands, key=lambda i: (starts[i], i)):
+        available = sorted((free_at[res_id], res_id) for res_id in members if free_at[res_id] <= starts[i])
+        picked = [res_id for _, res_id in available[:demands[i]]]
+        if len(picked) < demands[i]:
+            raise ValueError(f"Not enough free members for task {i} at {starts[i]}")
+        for res_id in picked:
+            free_at[res_id] = ends[i]
+        assigned[i] = picked
+    return assigned
+
+
+# Solution callback that publishes every improved incumbent to a progress callback
+class IncumbentPublisher(cp_model.CpSolverSolutionCallback):
+    def __init__(self, built, publish=None, include_assignments=False, objective_name="makespan"):
+        super().__init__()
+        self.built = built
+        self.objective_name = objective_name
+        self.publish = publish
+        self.include_assignments = include_assignments
+        self.solutions = 0
+
+    def on_solution_callback(self):
+        self.solutions += 1
+        if self.publish is None:
+            return
+        event = {
+            "type": "incumbent",
+            "objective_name": self.objective_name,
+            "objective": self.ObjectiveValue(),
+            "makespan": self.Value(self.built["makespan"]),
+            "bound": self.BestObjectiveBound(),
+            "elapsed": self.WallTime(),
+        }
+        if self.include_assignments:
+            count = len(self.built["task_starts"])
+            event["starts"] = [self.Value(self.built["task_starts"][i]) for i in range(count)]
+            event["ends"] = [self.Value(self.built["task_ends"][i]) for i in range(count)]
+        self.publish(event)
+
+
+# Function to stop a running search once stop_event is set and the search has a solution to keep
+def _watch_stop(solver, publisher, stop_event, done):
+    while not done.wait(0.2):
+        if stop_event.is_set() and publisher.solutions > 0:
+            solver.StopSearch()
+            return
+
+
+# Function to run a solve. CP-SAT stops the search on Ctrl+C by itself (keeping the incumbent) but leaves
+# the default SIGINT handler behind, so the caller's handler is put back afterwards.
+def _solve_keeping_sigint(solver, model, callback):
+    if threading.current_thread() is not threading.main_thread():
+        return solver.Solve(model, callback)
+    handler = signal.getsignal(signal.SIGINT)
+    try:
+        return solver.Solve(model, callback)
+    finally:
+        if handler is not None:
+            signal.signal(signal.SIGINT, handler)
+
+
+# Function to build and solve one model; returns plain values so results can cross process boundaries.
+# A lexicographic objective is solved in stages, one per objective, sharing the time limit: after each
+# stage the objective is held at the value reached and the next one is minimized from that solution.
+def solve_tasks(tasks, resource_mapping, resource_group_mapping, solver_config, frozen_tasks=None,
+                task_hints=None, blocked_intervals=None, interchangeable_groups=None, log=logger.info,
+                progress=None, stop_event=None, progress_assignments=False, busy_intervals=None):
+    build_started = time.perf_counter()
+    built = build_model(tasks, resource_mapping, resource_group_mapping, frozen_tasks, task_hints,
+                        blocked_intervals, solver_config.hint_source, solver_config.greedy_priority,
+                        group_cumulative=solver_config.group_cumulative,
+                        interchangeable_groups=interchangeable_groups, objective=solver_config.objective, log=log,
+                        busy_intervals=busy_intervals)
+    build_time = time.perf_counter() - build_started
+
+    model = built["model"]
+    names = built["objective"]
+    result = {
+        "status": "UNKNOWN",
+        "feasible": False,
+        "engine": "cp-sat",
+        "wall_time": 0.0,
+        "build_time": build_time,
+        "task_count": len(tasks),
+        "conflicts": 0,
+        "branches": 0,
+        "solutions": 0,
+        "stopped": False,
+        **model_size(model),
+        "stages": [],
+    }
+    solve_started = time.perf_counter()
+    for k, name in enumerate(names):
+        if k > 0:
+            # Hold the previous objective at the value reached and carry its solution over as the hint
+            previous = result["stages"][-1]
+            model.Add(built["objective_terms"][names[k - 1]] <= int(round(previous["value"])))
+            model.Minimize(built["objective_terms"][name])
+            model.ClearHints()
+            _hint_solution(model, built, solution)
+        remaining = solver_config.max_time_in_seconds - (time.perf_counter() - solve_started)
+        stage_config = solver_config.updated({"max_time_in_seconds": max(remaining / (len(names) - k), 1.0)})
+
+        solver = cp_model.CpSolver()
+        stage_config.apply(solver)
+        publisher = IncumbentPublisher(built, progress, progress_assignments, name)
+        done = threading.Event()
+        if stop_event is not None:
+            watcher = threading.Thread(target=_watch_stop, args=(solver, publisher, stop_event, done), daemon=True)
+            watcher.start()
+        status = _solve_keeping_sigint(solver, model, publisher)
+        done.set()
+
+        result["wall_time"] += solver.WallTime()
+        result["conflicts"] += solver.NumConflicts()
+        result["branches"] += solver.NumBranches()
+        result["solutions"] += publisher.solutions
+        feasible = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        stage = {"objective": name, "status": solver.StatusName(status), "wall_time": solver.WallTime()}
+        if feasible:
+            stage["value"] = solver.ObjectiveValue()
+            stage["bound"] = solver.BestObjectiveBound()
+            solution = _read_solution(solver, built, tasks, resource_group_mapping)
+        result["stages"].append(stage)
+        if not feasible or (stop_event is not None and stop_event.is_set()):
+            break
+    result["stopped"] = stop_event is not None and stop_event.is_set()
+
+    # A later stage that found nothing in its time leaves the earlier stage's solution in place
+    solved = [stage for stage in result["stages"] if "value" in stage]
+    if not solved:
+        result["status"] = result["stages"][-1]["status"]
+        return result
+    complete = len(solved) == len(names) and all(stage["status"] == "OPTIMAL" for stage in solved)
+    result["status"] = "OPTIMAL" if complete else "FEASIBLE"
+    result["feasible"] = True
+    result["objective"] = solved[0]["value"]
+    result["best_bound"] = solved[0]["bound"]
+    result.update(solution)
+    result["objectives"] = evaluate_objectives(tasks, result["ends"])
+    return result
+
+
+# Function to read a solution back from the solver: starts, ends, makespan and resource assignments
+def _read_solution(solver, built, tasks, resource_group_mapping):
+    solution = {
+        "makespan": solver.Value(built["makespan"]),
+        "starts": [solver.Value(built["task_starts"][i]) for i in range(len(tasks))],
+        "ends": [solver.Value(built["task_ends"][i]) for i in range(len(tasks))],
+        "assignments": [
+            [_assigned_resource(solver, res) for res in built["task_resource_assignments"].get(i, [])]
+            for i in range(len(tasks))
+        ],
+    }
+    for group_name, demands in built["pool_demands"].items():
+        picked = assign_pool_members(solution["starts"], solution["ends"], demands, resource_group_mapping[group_name])
+        for i, member_ids in picked.items():
+            members = iter(member_ids)
+            solution["assignments"][i] = [
+                next(members) if res == group_name else res for res in solution["assignments"][i]
+            ]
+    return solution
+
+
+# Function to hint a solution read by _read_solution: its start times, group member choices and objective terms
+def _hint_solution(model, built, solution):
+    for i, start in enumerate(solution["starts"]):
+        model.AddHint(built["task_starts"][i], start)
+    hinted = set()  # The segments of a paused task share their member choices
+    for i, choices in built["task_resource_assignments"].items():
+        for res, assigned in zip(choices, solution["assignments"][i]):
+            if isinstance(res, list) and id(res) not in hinted:
+                hinted.add(id(res))
+                for res_id, is_active in res:
+                    model.AddHint(is_active, res_id == assigned)
+    hint_objective_terms(model, built["objective_auxiliaries"], dict(enumerate(solution["ends"])))
+
+
+# Function to count the variables, constraints and interval constraints of a model
+def model_size(model):
+    proto = model.Proto()
+    return {
+        "variables": len(proto.variables),
+        "constraints": len(proto.constraints),
+        "intervals": sum(1 for constraint in proto.constraints if _is_interval(constraint)),
+    }
+
+
+# Newer OR-Tools releases wrap the model proto in their own classes instead of protobuf messages
+def _is_interval(constraint):
+    if hasattr(constraint, "has_interval"):
+        return constraint.has_interval()
+    return constraint.HasField("interval")
+
+
+# Figures that add up over the models of a decomposed or rolling-horizon solve
+ADDITIVE_STATS = ("build_time", "conflicts", "branches", "solutions", "variables", "constraints", "intervals")
+
+# Figures of which a combined solve keeps the largest
+MAX_STATS = ("worker_peak_rss_mb",)
+
+
+# Function to add one sub-model's solver figures onto a combined result
+def _add_stats(combined, result):
+    for key in ADDITIVE_STATS:
+        if key in result:
+            combined[key] = combined.get(key, 0) + result[key]
+    for key in MAX_STATS:
+        if result.get(key) is not None:
+            combined[key] = max(combined.get(key) or 0, result[key])
+
+
+# Function to read one resource assignment back from the solver: a fixed resource id, the group
+# member whose selection boolean is true, or a pooled group's name left for assign_pool_members
+def _assigned_resource(solver, res):
+    if isinstance(res, list):
+        return next(int(res_id) for res_id, is_active in res if solver.BooleanValue(is_active))
+    if isinstance(res, str):
+        return res
+    return int(res)
+
+
+# Function to group the segments of paused tasks: task id -> segment indices in order
+def _segments(tasks):
+    segments = {}
+    for i, task in enumerate(tasks):
+        if "segment" in task:
+            segments.setdefault(task["task_id"], []).append(i)
+    return segments
+
+
+# Function to collect the resource ids a task may occupy
+def _task_resource_ids(task, resource_mapping, resource_group_mapping, frozen=None):
+    if frozen is not None:
+        return list(frozen["resource_ids"])
+    resource_ids = []
+    for res in task["resources"]:
+        if res in resource_mapping:
+            if resource_mapping[res] != -1:
+                resource_ids.append(resource_mapping[res])
+        elif res in resource_group_mapping:
+            resource_ids.extend(resource_group_mapping[res])
+    return resource_ids
+
+
+# Function to partition tasks into connected components of the resource-sharing graph.
+# Two tasks are connected when they can use a common resource (directly or through a group) or when
+# one is a predecessor of the other; tasks in different components can be scheduled independently.
+# With by_job, tasks of the same job are connected too, so job-based objectives see whole jobs.
+def find_components(tasks, resource_mapping, resource_group_mapping, frozen_tasks=None, by_job=False):
+    frozen_tasks = frozen_tasks or {}
+    parent = list(range(len(tasks)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(a, b):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    first_user = {}  # Resource id -> first task seen using it
+    first_of_job = {}
+    for i, task in enumerate(tasks):
+        for pred_index in task["predecessor_indices"]:
+            union(i, pred_index)
+        if by_job:
+            union(i, first_of_job.setdefault(task["task_id"][0], i))
+        for res_id in _task_resource_ids(task, resource_mapping, resource_group_mapping, frozen_tasks.get(i)):
+            if res_id in first_user:
+                union(i, first_user[res_id])
+            else:
+                first_user[res_id] = i
+
+    components = {}
+    for i in range(len(tasks)):
+        components.setdefault(find(i), []).append(i)
+    return sorted(components.values(), key=len, reverse=True)
+
+
+# Function to gather components smaller than min_tasks into bundles of at least min_tasks tasks, as a pool
+# process costs more to start than such a model takes to solve; tasks of different components can share a
+# model as they have nothing in common. A last bundle that stays too small joins the smallest one before it.
+def bundle_components(components, min_tasks):
+    bundles = [component for component in components if len(component) >= min_tasks]
+    current = []
+    for component in components:
+        if len(component) < min_tasks:
+            current += component
+            if len(current) >= min_tasks:
+                bundles.append(current)
+                current = []
+    if current:
+        if bundles:
+            bundles[-1] = bundles[-1] + current
+        else:
+            bundles.append(current)
+    return sorted((sorted(bundle) for bundle in bundles), key=len, reverse=True)
+
+
+# Function to split the time budget of a decomposed solve between its components. The processes give
+# time_limit * processes seconds of solving in all, shared in proportion to the components' task counts,
+# so a component queued behind others gets its own share rather than what the first ones left over. No
+# component gets more than the whole time limit or less than a second.
+def component_time_limits(components, time_limit, processes):
+    task_count = sum(len(component) for component in components)
+    return [min(time_limit, max(time_limit * processes * len(component) / task_count, 1.0))
+            for component in components]
+
+
+# Function to extract one component's tasks, frozen tasks, hints, blocked and busy intervals, re-indexed
+# locally
+def _component_problem(component, tasks, frozen_tasks, task_hints, blocked_intervals, busy_intervals,
+                       resource_mapping, resource_group_mapping):
+    local_index = {global_index: local for local, global_index in enumerate(component)}
+    local_tasks = [
+        dict(tasks[i], predecessor_indices=[local_index[p] for p in tasks[i]["predecessor_indices"]])
+        for i in component
+    ]
+    local_frozen = {local_index[i]: frozen_tasks[i] for i in component if i in frozen_tasks}
+    local_hints = {local_index[i]: task_hints[i] for i in component if i in task_hints}
+    component_resources = {
+        res_id
+        for i in component
+        for res_id in _task_resource_ids(tasks[i], resource_mapping, resource_group_mapping, frozen_tasks.get(i))
+    }
+    local_blocked = {res_id: blocked_intervals[res_id] for res_id in component_resources if res_id in blocked_intervals}
+    local_busy = {res_id: busy_intervals[res_id] for res_id in component_resources if res_id in busy_intervals}
+    return local_tasks, local_frozen, local_hints, local_blocked, local_busy
+
+
+# Function to solve one component in a worker process, within its share of the time budget
+def _solve_component(local_tasks, local_frozen, local_hints, local_blocked, local_busy, resource_mapping,
+                     resource_group_mapping, solver_config, time_limit, interchangeable_groups=None,
+                     component=0, channel=None, stop_event=None, progress_assignments=False):
+    config = solver_config.updated({"max_time_in_seconds": time_limit})
+
+    messages = []
+    progress = None
+    if channel is not None:
+        progress = lambda event: channel.put((component, event))
+    result = solve_tasks(local_tasks, resource_mapping, resource_group_mapping, config, local_frozen,
+                         local_hints, local_blocked, interchangeable_groups, log=messages.append,
+                         progress=progress, stop_event=stop_event, progress_assignments=progress_assignments,
+                         busy_intervals=local_busy)
+    result["messages"] = messages
+    # The pool's processes only live for this solve, so their peak so far is their peak in it
+    result["worker_peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+# Pool and manager processes ignore Ctrl+C; the parent turns it into a stop request instead
+def _ignore_sigint():
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+# Function to combine the component incumbents published through channel into global progress events,
+# and to pass a stop request on to the component processes. Runs in a thread until finished is set.
+def _relay_progress(components, task_count, channel, progress, stop_event, child_stop, finished, started):
+    latest = {}
+    while True:
+        if stop_event is not None and stop_event.is_set():
+            child_stop.set()
+        try:
+            component, event = channel.get(timeout=0.2)
+        except queue.Empty:
+            if finished.is_set():
+                return
+            continue
+        latest[component] = event
+        if progress is None:
+            continue
+        # Until every component has an incumbent (components queued behind others in the pool have
+        # none yet) the makespan only covers the components reported so far
+        # In a lexicographic solve components can be at different stages; combine those at this one
+        name = event["objective_name"]
+        same = [other for other in latest.values() if other["objective_name"] == name]
+        combined = {
+            "type": "incumbent",
+            "objective_name": name,
+            "objective": combine_objective(name, [other["objective"] for other in same]),
+            "makespan": max(other["makespan"] for other in latest.values()),
+            "bound": combine_objective(name, [other["bound"] for other in same]),
+            "elapsed": time.time() - started,
+            "components_reported": len(latest),
+            "component_count": len(components),
+        }
+        if "starts" in event and len(latest) == len(components):
+            combined["starts"] = [0] * task_count
+            combined["ends"] = [0] * task_count
+            for k, component_event in latest.items():
+                for local, i in enumerate(components[k]):
+                    combined["starts"][i] = component_event["starts"][local]
+                    combined["ends"][i] = component_event["ends"][local]
+        progress(combined)
+
+
+# Function to solve all tasks, splitting them into independent components solved in a process pool
+# when solver_config.decompose is set. Components under solver_config.decompose_min_tasks are bundled
+# (see bundle_components), and the tasks are solved as one model unless that leaves two or more bundles
+# and more than one solver worker to spread them over. Returns the same shape as solve_tasks with merged
+# values.
+def solve_schedule(tasks, resource_mapping, resource_group_mapping, solver_config, frozen_tasks=None,
+                   task_hints=None, blocked_intervals=None, interchangeable_groups=None, log=logger.info,
+                   progress=None, stop_event=None, progress_assignments=False, busy_intervals=None):
+    frozen_tasks = frozen_tasks or {}
+    task_hints = task_hints or {}
+    blocked_intervals = blocked_intervals or {}
+    busy_intervals = busy_intervals or {}
+
+    components = [list(range(len(tasks)))]
+    if solver_config.decompose and solver_config.num_workers > 1 and len(tasks) > 1:
+        by_job = parse_objective(solver_config.objective) != ["makespan"]
+        components = bundle_components(
+            find_components(tasks, resource_mapping, resource_group_mapping, frozen_tasks, by_job),
+            solver_config.decompose_min_tasks)
+    if len(components) == 1:
+        return solve_tasks(tasks, resource_mapping, resource_group_mapping, solver_config, frozen_tasks,
+                           task_hints, blocked_intervals, interchangeable_groups, log, progress, stop_event,
+                           progress_assignments, busy_intervals)
+
+    processes = min(len(components), solver_config.num_workers)
+    component_config = solver_config.updated({"num_workers": max(1, solver_config.num_workers // processes)})
+    time_limits = component_time_limits(components, solver_config.max_time_in_seconds, processes)
+    log(f"Solving {len(components)} independent components (largest has {len(components[0])} tasks) "
+        f"in {processes} processes")
+
+    started = time.time()
+
+    # Incumbents and stop requests cross the process boundary through a manager's queue and event
+    # Spawned rather than forked: forking copies the caller's threads' locks (logging, the solver's own
+    # threads) in whatever state they are in, which can deadlock the children
+    context = multiprocessing.get_context("spawn")
+    manager = channel = child_stop = relay = None
+    finished = threading.Event()
+    if progress is not None or stop_event is not None:
+        manager = SyncManager(ctx=context)
+        manager.start(_ignore_sigint)
+        channel = manager.Queue()
+        child_stop = manager.Event()
+        relay = threading.Thread(target=_relay_progress, args=(components, len(tasks), channel, progress,
+                                                               stop_event, child_stop, finished, started))
+        relay.start()
+    try:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_ignore_sigint, mp_context=context) as pool:
+            futures = [
+                pool.submit(
+                    _solve_component,
+                    *_component_problem(component, tasks, frozen_tasks, task_hints, blocked_intervals,
+                                        busy_intervals, resource_mapping, resource_group_mapping),
+                    resource_mapping, resource_group_mapping, component_config, time_limits[k], interchangeable_groups,
+                    k, channel, child_stop, progress_assignments
+                )
+                for k, component in enumerate(components)
+            ]
+            results = [future.result() for future in futures]
+    finally:
+        finished.set()
+        if relay is not None:
+            relay.join()
+            manager.shutdown()
+
+    # Merge the component schedules back onto the global task indices
+    merged = {
+        "status": "OPTIMAL",
+        "feasible": True,
+        "engine": "cp-sat",
+        "wall_time": time.time() - started,
+        "task_count": len(tasks),
+        "component_count": len(components),
+        "makespan": 0,
+        "best_bound": 0.0,
+        "starts": [0] * len(tasks),
+        "ends": [0] * len(tasks),
+        "assignments": [[] for _ in tasks],
+    }
+    component_objectives = []
+    component_bounds = []
+    for component, result in zip(components, results):
+        for message in result["messages"]:
+            log(message)
+        _add_stats(merged, result)
+        if not result["feasible"]:
+            log(f"Component with {len(component)} tasks: {result['status']}")
+            merged["status"] = result["status"]
+            merged["feasible"] = False
+            continue
+        if result["status"] == "FEASIBLE" and merged["feasible"]:
+            merged["status"] = "FEASIBLE"
+        merged["makespan"] = max(merged["makespan"], result["makespan"])
+        component_objectives.append(result["objective"])
+        component_bounds.append(result["best_bound"])
+        for local, i in enumerate(component):
+            merged["starts"][i] = result["starts"][local]
+            merged["ends"][i] = result["ends"][local]
+            merged["assignments"][i] = result["assignments"][local]
+    if merged["feasible"]:
+        # Sum objectives add up over the components, makespan is the latest of them
+        name = parse_objective(solver_config.objective)[0]
+        merged["objective"] = combine_objective(name, component_objectives)
+        merged["best_bound"] = combine_objective(name, component_bounds)
+        merged["objectives"] = evaluate_objectives(tasks, merged["ends"])
+    merged["stopped"] = stop_event is not None and stop_event.is_set()
+    return merged
+
+
+# Function to add a busy stretch to a resource's busy intervals, coalescing touching stretches so later
+# windows see one fixed interval per contiguous block of committed work. The list stays sorted, so only
+# the neighbours of the new stretch are looked at, however much work the resource already has.
+def _block(busy_intervals, res_id, start, end):
+    intervals = busy_intervals.setdefault(res_id, [])
+    k = bisect_left(intervals, (start, end))
+    if k > 0 and intervals[k - 1][1] >= start:
+        k -= 1
+        start = intervals[k][0]
+        end = max(end, intervals[k][1])
+    j = k
+    while j < len(intervals) and intervals[j][0] <= end:
+        end = max(end, intervals[j][1])
+        j += 1
+    intervals[k:j] = [(start, end)]
+
+
+# Function to tag a window's incumbents with the window number; the makespan is the window's own
+def _window_progress(progress, number, window_count):
+    if progress is None:
+        return None
+    return lambda event: progress(dict(event, window=number, window_count=window_count))
+
+
+# Function to schedule jobs window by window instead of in one model.
+#
+# job_order lists the task indices of each job, most urgent job first. The jobs are solved
+# window_size at a time; each window's result is then frozen, turned into busy intervals on the
+# resources it uses and into release times for successors, and the window advances. Every sub-model
+# only holds the window's own tasks, so total time grows roughly linearly with the number of jobs.
+# blocked_intervals (e.g. the resources' downtime) applies to every window.
+def solve_rolling_horizon(tasks, job_order, window_size, resource_mapping, resource_group_mapping, solver_config,
+                          frozen_tasks=None, task_hints=None, interchangeable_groups=None, log=logger.info,
+                          progress=None, stop_event=None, blocked_intervals=None):
+    frozen_tasks = frozen_tasks or {}
+    task_hints = task_hints or {}
+    started = time.time()
+    blocked_intervals = blocked_intervals or {}
+    busy = {}  # Resource id -> stretches committed by frozen tasks and earlier windows
+
+    result = {
+        "status": "FEASIBLE",  # Each window may be optimal, but the combined schedule is a heuristic
+        "feasible": True,
+        "engine": "cp-sat",
+        "task_count": len(tasks),
+        "starts": [0] * len(tasks),
+        "ends": [0] * len(tasks),
+        "assignments": [[] for _ in tasks],
+    }
+    scheduled = set()
+    for i, frozen in frozen_tasks.items():
+        result["starts"][i] = frozen["start"]
+        result["ends"][i] = frozen["end"]
+        result["assignments"][i] = list(frozen["resource_ids"])
+        scheduled.add(i)
+        for res_id in frozen["resource_ids"]:
+            if frozen["end"] > frozen["start"]:
+                _block(busy, res_id, frozen["start"], frozen["end"])
+
+    windows = [job_order[k:k + window_size] for k in range(0, len(job_order), window_size)]
+    window_config = solver_config.updated({
+        "max_time_in_seconds": max(solver_config.max_time_in_seconds / max(len(windows), 1), 1.0)
+    })
+    log(f"Rolling horizon: {len(windows)} windows of up to {window_size} jobs, "
+        f"{window_config.max_time_in_seconds:.1f} s each")
+
+    for number, window in enumerate(windows, start=1):
+        window_tasks = [i for job in window for i in job if i not in scheduled]
+        if not window_tasks:
+            continue
+        local_index = {i: local for local, i in enumerate(window_tasks)}
+        local_tasks = []
+        for i in window_tasks:
+            # Predecessors solved in earlier windows become a release time
+            release = max((result["ends"][p] for p in tasks[i]["predecessor_indices"] if p in scheduled), default=0)
+            local_tasks.append(dict(
+                tasks[i],
+                release=max(release, tasks[i].get("release", 0)),
+                predecessor_indices=[local_index[p] for p in tasks[i]["predecessor_indices"] if p in local_index]
+            ))
+        local_hints = {local_index[i]: task_hints[i] for i in window_tasks if i in task_hints}
+
+        window_result = solve_schedule(local_tasks, resource_mapping, resource_group_mapping, window_config,
+                                       task_hints=local_hints, blocked_intervals=blocked_intervals,
+                                       interchangeable_groups=interchangeable_groups, log=log,
+                                       progress=_window_progress(progress, number, len(windows)),
+                                       stop_event=stop_event, busy_intervals=busy)
+        log(f"Window {number}/{len(windows)}: {len(window_tasks)} tasks, {window_result['status']}")
+        _add_stats(result, window_result)
+        if not window_result["feasible"]:
+            result["status"] = window_result["status"]
+            result["feasible"] = False
+            break
+
+        for local, i in enumerate(window_tasks):
+            result["starts"][i] = window_result["starts"][local]
+            result["ends"][i] = window_result["ends"][local]
+            result["assignments"][i] = window_result["assignments"][local]
+            scheduled.add(i)
+        held_from = {task_id: indices[0] for task_id, indices in _segments(local_tasks).items()}
+        for local, i in enumerate(window_tasks):
+            # A paused task keeps its resources from its first segment on, pauses included
+            start = window_result["starts"][held_from.get(tasks[i]["task_id"], local)]
+            for res_id in window_result["assignments"][local]:
+                if result["ends"][i] > start:
+                    _block(busy, res_id, start, result["ends"][i])
+
+    result["wall_time"] = time.time() - started
+    result["window_count"] = len(windows)
+    if result["feasible"]:
+        result["makespan"] = max(result["ends"], default=0)
+        result["objectives"] = evaluate_objectives(tasks, result["ends"])
+        result["objective"] = result["objectives"][parse_objective(solver_config.objective)[0]]
+        result["best_bound"] = 0.0  # No global bound is proven when solving window by window
+    return result
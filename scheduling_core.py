@@ -0,0 +1,588 @@
+import bisect
+import pandas as pd
+from calendar_index import CalendarIndex
+from resource_calendars import longest_free, release_busy, resource_calendars
+from run_stats import RunStats
+from solver_config import SolverConfig
+from scheduler_model import solve_schedule, solve_rolling_horizon
+from greedy_scheduler import greedy_for_objective
+from objectives import parse_objective
+from task_table import TaskTable, prepare_tasks
+from task_bounds import topological_order
+from problem_snapshot import save_problem
+from run_log import bind_run, get_logger
+from datetime import datetime, timedelta
+import logging
+
+logger = get_logger(__name__)
+
+# The scheduling core: from the scheduler's input data to a schedule, without a database.
+#
+# data is the dict fetch_data returns (see data_sources for the other places it can come from). A run is
+#   prepare_problem   calendar, task table, due dates, frozen tasks, hints and downtime
+#   solve_problem     CP-SAT (whole, by component or by rolling window) or the greedy engine
+#   build_schedule    the solution as schedule rows with real start and end times
+# and solve() does all three. Nothing here reads or writes outside the process, so runs can be repeated
+# offline, from snapshots, or many at a time.
+
+# Function to convert times or time strings (e.g., "08:00:00") to minutes since midnight
+def time_to_minutes(time_str):
+    if pd.isna(time_str):
+        return 0
+    if hasattr(time_str, "hour"):
+        return time_str.hour * 60 + time_str.minute
+    # SQLite returns TIME columns as strings with microseconds, e.g. "08:00:00.000000"
+    time_obj = datetime.strptime(str(time_str).split(".")[0], "%H:%M:%S")
+    return time_obj.hour * 60 + time_obj.minute
+
+# Function to map elapsed minutes to a datetime, respecting working hours.
+# Kept for one-off conversions; scheduling runs build a single CalendarIndex and reuse it.
+def elapsed_minutes_to_datetime(elapsed_minutes, start_date, working_hours):
+    return CalendarIndex(start_date, working_hours).to_datetime(elapsed_minutes)
+
+# Hours after the schedule start during which incremental runs keep previously planned tasks in place
+DEFAULT_FREEZE_HOURS = 24
+
+# Times a schedule that runs through downtime beyond the computed calendar is solved again with more of it
+DOWNTIME_ROUNDS = 3
+
+# Function to index the previously saved schedule by task number, with positions on the elapsed-minute axis
+def load_previous_schedule(schedule_df, calendar_index, resource_mapping):
+    previous_schedule = {}
+    if schedule_df is None or schedule_df.empty:
+        return previous_schedule
+
+    for row in schedule_df.itertuples(index=False):
+        start_time = pd.Timestamp(row.start_time).to_pydatetime()
+        end_time = pd.Timestamp(row.end_time).to_pydatetime()
+        resource_names = [r.strip() for r in str(row.resources_used).split(",") if r.strip()]
+        previous_schedule[row.task_number] = {
+            "start_time": start_time,
+            "end_time": end_time,
+            "resources_used": row.resources_used,
+            "start": calendar_index.to_elapsed(start_time),
+            "end": calendar_index.to_elapsed(end_time),
+            "resource_ids": [resource_mapping[name] for name in resource_names if name in resource_mapping]
+        }
+    return previous_schedule
+
+# Function to give every task its job's due minute and weight for the job-based objectives.
+# A promised date without a time of day means the end of that day, which on the elapsed axis is the end
+# of the last working day on or before it. The weight is the job's value (price_each * quantity) scaled
+# to 1..100, so the most valuable job counts 100 times as much as a job worth nothing. tasks is a list of
+# task dicts or a TaskTable, whose due and weight arrays are set.
+def set_due_dates(tasks, job_tasks, jobs_df, calendar_index):
+    values = (pd.to_numeric(jobs_df["price_each"], errors="coerce").fillna(0)
+              * pd.to_numeric(jobs_df["quantity"], errors="coerce").fillna(1)).clip(lower=0)
+    top_value = values.max() if len(values) else 0
+    due_count = 0
+    for job_number, promised_date, value in zip(jobs_df["job_number"], jobs_df["promised_date"], values):
+        due = None
+        if not pd.isna(promised_date):
+            promised = pd.Timestamp(promised_date).to_pydatetime()
+            if promised.hour == 0 and promised.minute == 0:
+                promised += timedelta(days=1)
+            due = calendar_index.to_elapsed(promised)
+            due_count += 1
+        weight = 1 + int(round(99 * value / top_value)) if top_value > 0 else 1
+        if isinstance(tasks, TaskTable):
+            indices = job_tasks.get(job_number, [])
+            tasks.weight[indices] = weight
+            if due is not None:
+                tasks.due[indices] = due
+            continue
+        for i in job_tasks.get(job_number, []):
+            tasks[i]["weight"] = weight
+            if due is not None:
+                tasks[i]["due"] = due
+    return due_count
+
+# Function to split the tasks that are longer than every free stretch of a resource they need into
+# segments that pause over its downtime, the way any task pauses over the shop's closed hours on the axis.
+# A task's segments are at most as long as the shortest of its resources' longest free stretches (for a
+# group, the best member's), share its task id and carry "segment": (k, n); the first keeps the task's
+# predecessors, hint and release, each later one waits for the one before, and the task's successors
+# wait for the last. Frozen tasks are never split. Returns the problem with the split tasks and
+# "segment_of": segment index -> original task index, or the problem itself when nothing needs splitting.
+def split_paused_tasks(problem):
+    tasks = problem["tasks"]
+    frozen_tasks = problem["frozen_tasks"]
+    resource_mapping = problem["resource_mapping"]
+    resource_group_mapping = problem["resource_group_mapping"]
+    blocked_intervals = problem["blocked_intervals"]
+    horizon = problem["downtime_horizon"]
+
+    stretches = {}
+
+    def free(res_id):
+        if res_id not in stretches:
+            stretches[res_id] = longest_free(blocked_intervals.get(res_id, []), horizon)
+        return stretches[res_id]
+
+    counts = []
+    for i, task in enumerate(tasks):
+        limits = []
+        if i not in frozen_tasks:
+            for res in task["resources"]:
+                if res in resource_mapping and resource_mapping[res] != -1:
+                    limits.append(free(resource_mapping[res]))
+                elif resource_group_mapping.get(res):
+                    limits.append(max(free(res_id) for res_id in resource_group_mapping[res]))
+        stretch = min(limits, default=0)
+        counts.append(-(-task["duration"] // stretch) if 0 < stretch < task["duration"] else 1)
+    if all(count == 1 for count in counts):
+        return problem
+
+    first = [0]
+    for count in counts[:-1]:
+        first.append(first[-1] + count)
+    split_tasks = []
+    segment_of = []
+    for i, (task, count) in enumerate(zip(tasks, counts)):
+        predecessors = [first[p] + counts[p] - 1 for p in task["predecessor_indices"]]
+        if count == 1:
+            split_tasks.append(dict(task, predecessor_indices=predecessors))
+            segment_of.append(i)
+            continue
+        length, longer = divmod(task["duration"], count)
+        for k in range(count):
+            segment = dict(task, duration=length + (k < longer), segment=(k, count),
+                           predecessor_indices=predecessors if k == 0 else [len(split_tasks) - 1])
+            if k > 0:
+                segment.pop("release", None)
+            split_tasks.append(segment)
+            segment_of.append(i)
+    paused = [tasks[i]["task_id"] for i, count in enumerate(counts) if count > 1]
+    logger.info("%d tasks are longer than every free stretch of a resource they need and pause over its "
+                "downtime in %d segments, e.g. %s", len(paused), len(split_tasks) - len(tasks) + len(paused),
+                paused[:5])
+    return dict(
+        problem,
+        tasks=split_tasks,
+        job_order=[[first[i] + k for i in indices for k in range(counts[i])] for indices in problem["job_order"]],
+        frozen_tasks={first[i]: frozen for i, frozen in frozen_tasks.items()},
+        task_hints={first[i]: hint for i, hint in problem["task_hints"].items()},
+        segment_of=segment_of,
+    )
+
+
+# Function to turn a result for the split problem of split_paused_tasks back into one for the problem's
+# own tasks: each task starts with its first segment, ends with its last and runs on the first one's
+# resources. The segments of paused tasks are kept in "segments": task index -> [(start, end), ...].
+def join_segments(problem, split, result):
+    if "segment_of" not in split:
+        return result
+    starts = [None] * len(problem["tasks"])
+    ends = [None] * len(problem["tasks"])
+    assignments = [None] * len(problem["tasks"])
+    segments = {}
+    for k, i in enumerate(split["segment_of"]):
+        if starts[i] is None:
+            starts[i] = result["starts"][k]
+            assignments[i] = result["assignments"][k]
+        ends[i] = result["ends"][k]
+        if "segment" in split["tasks"][k]:
+            segments.setdefault(i, []).append((result["starts"][k], result["ends"][k]))
+    return dict(result, starts=starts, ends=ends, assignments=assignments, segments=segments,
+                task_count=len(problem["tasks"]))
+
+
+# Function to compute the resources' downtime again up to at least `horizon`, for a schedule that ran past
+# the downtime computed so far. Frozen work keeps its place as in prepare_problem; a resource the calendars
+# do not know (added by a scenario) follows the resource it was modelled on, or keeps its downtime.
+def extend_downtime(problem, horizon):
+    calendars = problem["calendars"]
+    downtime = calendars.downtime(horizon)
+    known = set(calendars.resource_ids)
+    calendar_of = problem.get("calendar_of", {})
+    blocked_intervals = {}
+    for res_id in problem["resource_ids"]:
+        source = calendar_of.get(res_id, res_id)
+        intervals = downtime.get(source, []) if source in known else problem["blocked_intervals"].get(res_id, [])
+        if intervals:
+            blocked_intervals[res_id] = list(intervals)
+    frozen_busy = {}
+    for frozen in problem["frozen_tasks"].values():
+        for res_id in frozen["resource_ids"]:
+            frozen_busy.setdefault(res_id, []).append((frozen["start"], frozen["end"]))
+    problem["blocked_intervals"], _ = release_busy(blocked_intervals, frozen_busy)
+    problem["downtime_horizon"] = calendars.horizon
+
+
+# Function to count the tasks (or segments) of a result that run through downtime of a resource they
+# are assigned to; frozen tasks keep their place whatever the calendar says
+def downtime_violations(problem, result):
+    blocked_intervals = problem["blocked_intervals"]
+    violations = 0
+    for i, (start, end, assigned) in enumerate(zip(result["starts"], result["ends"], result["assignments"])):
+        if i in problem["frozen_tasks"]:
+            continue
+        for res_id in assigned:
+            intervals = blocked_intervals.get(res_id, [])
+            k = bisect.bisect_right(intervals, (start, float("inf")))
+            if (k > 0 and intervals[k - 1][1] > start) or (k < len(intervals) and intervals[k][0] < end):
+                violations += 1
+                break
+    return violations
+
+
+# Function to list the (predecessor, task) pairs of a result where a frozen task starts before its
+# predecessor ends. Frozen tasks are already on the floor and keep their place, so the model does not
+# constrain them by their predecessors; a predecessor that is new or no longer frozen can then end up
+# after them.
+def frozen_precedence_violations(problem, result):
+    violations = []
+    for i in problem["frozen_tasks"]:
+        for pred_index in problem["tasks"][i]["predecessor_indices"]:
+            if result["ends"][pred_index] > result["starts"][i]:
+                violations.append((pred_index, i))
+    return violations
+
+
+# Function to make the progress callback for a run: log each incumbent, record it, then pass it on.
+# The solver's callback and the progress relay call it from their own threads, so it is bound to the
+# run's log.
+def _incumbent_reporter(stats, progress):
+    def report(event):
+        stats.record_incumbent(event)
+        scope = ""
+        if "window" in event:
+            scope = f" (window {event['window']}/{event['window_count']})"
+        elif event.get("components_reported", 0) < event.get("component_count", 0):
+            scope = f" ({event['components_reported']}/{event['component_count']} components)"
+        name = event.get("objective_name", "makespan")
+        logger.info("Incumbent%s: %s %.0f, bound %.0f, gap %.1f%%, makespan %d after %.1f s", scope, name,
+                    event["objective"], event["bound"], 100 * (stats.incumbent["gap"] or 0.0), event["makespan"],
+                    event["elapsed"])
+        if progress is not None:
+            progress(event)
+    return bind_run(report)
+
+
+# Function to turn the input data into a problem ready to solve: a dict with the task dicts, resource
+# mappings, calendars, frozen tasks, hints and blocked intervals. Returns None (with stats.error set)
+# when the tasks cannot be scheduled at all.
+def prepare_problem(data, start_date, incremental=False, freeze_hours=DEFAULT_FREEZE_HOURS, warm_start=True,
+                    stats=None):
+    stats = stats if stats is not None else RunStats()
+    jobs_df = data["jobs"]
+    tasks_df = data["tasks"]
+    resources_df = data["resources"]
+    calendar_df = data["calendar"]
+    resource_mapping = data["resource_mapping"]
+    resource_group_mapping = data["resource_group_mapping"]
+    interchangeable_groups = data.get("interchangeable_groups", set())
+
+    # Step 1: Prepare working hours from calendar
+    working_hours = {}
+    for _, row in calendar_df.iterrows():
+        day = row["weekday"]  # 1 to 7 (Monday to Sunday)
+        start_minutes = time_to_minutes(row["start_time"])
+        end_minutes = time_to_minutes(row["end_time"])
+        working_hours[day] = (start_minutes, end_minutes)
+
+    day_hours = []
+    for day in range(1, 8):
+        if day in working_hours:
+            start_mins, end_mins = working_hours[day]
+            day_hours.append(f"{day}: {start_mins // 60}:{start_mins % 60:02d}-{end_mins // 60}:{end_mins % 60:02d}")
+        else:
+            day_hours.append(f"{day}: off")
+    logger.info("Working hours by weekday: %s", ", ".join(day_hours))
+
+    # Per-resource hours and dated exceptions (holidays, maintenance, leave) that have not yet passed
+    resource_hours = {}
+    for row in data["resource_calendar"].itertuples(index=False):
+        resource_hours.setdefault(int(row.resource_id), {})[int(row.weekday)] = (
+            time_to_minutes(row.start_time), time_to_minutes(row.end_time))
+    exceptions = []
+    for row in data["calendar_exception"].itertuples(index=False):
+        exception_start = pd.Timestamp(row.start_time).to_pydatetime()
+        exception_end = pd.Timestamp(row.end_time).to_pydatetime()
+        if exception_end > start_date:
+            exceptions.append((None if pd.isna(row.resource_id) else int(row.resource_id), exception_start,
+                               exception_end))
+
+    # Index the calendar once so elapsed minutes convert to datetimes by binary search; the index and the
+    # resources' downtime are cached per calendar version, so an unchanged calendar is not rebuilt
+    calendars = resource_calendars(start_date, working_hours, resources_df["id"].tolist(), resource_hours, exceptions)
+    calendar_index = calendars.index
+    logger.info("Calendar version %s: %d resources with their own hours, %d exceptions, %d shop closures",
+                calendars.version, len(resource_hours), len(exceptions), len(calendars.closed_dates))
+
+    # Step 2: Select eligible jobs and tasks and compute task durations in one vectorized pass
+    eligible_jobs = jobs_df[(jobs_df["completed"] == False) & (jobs_df["blocked"] == False)]
+    logger.info("Eligible jobs (not completed and not blocked): %d of %d", len(eligible_jobs), len(jobs_df))
+
+    # The problem keeps the table itself: the model builders read its arrays (see task_table.task_arrays)
+    all_tasks, missing_predecessors = prepare_tasks(jobs_df, tasks_df)
+    stats.task_count = len(all_tasks)
+    job_tasks = all_tasks.job_tasks()
+    for task_id, pred_task_id in missing_predecessors:
+        logger.warning("Predecessor %s for task %s not found", pred_task_id, task_id)
+
+    logger.info("%d tasks to schedule", len(all_tasks))
+    due_count = set_due_dates(all_tasks, job_tasks, eligible_jobs, calendar_index)
+    logger.info("%d of %d jobs have a promised date", due_count, len(eligible_jobs))
+    if logger.isEnabledFor(logging.DEBUG):
+        for task in all_tasks:
+            logger.debug("Task %s: duration=%s, resources=%s, predecessors=%s", task["task_id"], task["duration"],
+                         task["resources"], task["predecessor_indices"])
+
+    # Check for cycles in the predecessor graph: tasks on a cycle never become ready in a topological pass
+    order, _ = topological_order(all_tasks)
+    if len(order) < len(all_tasks):
+        on_cycle = sorted(set(range(len(all_tasks))) - set(order))
+        logger.error("Cycle detected in predecessor relationships involving tasks %s. Scheduling cannot proceed.",
+                     [all_tasks[i]["task_id"] for i in on_cycle[:10]])
+        stats.error = "Cycle in predecessor relationships"
+        return None
+
+    # Warm start and incremental mode: pin started and near-term tasks (incremental only) and hint
+    # the rest with their previous positions
+    frozen_tasks = {}
+    task_hints = {}
+    if incremental or warm_start:
+        previous_schedule = load_previous_schedule(data["schedule"], calendar_index, resource_mapping)
+        freeze_until = start_date + timedelta(hours=freeze_hours)
+        for i, task_number in enumerate(all_tasks.task_numbers.tolist()):
+            previous = previous_schedule.get(task_number)
+            if previous is None:
+                continue
+            if incremental and previous["start_time"] < freeze_until:
+                frozen_tasks[i] = previous
+                # A frozen task keeps whatever stretch of the axis it already occupies
+                all_tasks.durations[i] = previous["end"] - previous["start"]
+            else:
+                task_hints[i] = previous
+        if incremental:
+            logger.info("Incremental mode: %d tasks frozen until %s", len(frozen_tasks), freeze_until)
+        logger.info("Warm start: %d tasks hinted from the previous schedule", len(task_hints))
+
+    # Downtime of every resource over the stretch the open work could take. Frozen work is already on the
+    # floor, so it keeps its place even where it now overlaps downtime.
+    blocked_intervals = calendars.downtime_for(int(all_tasks.durations.sum()))
+    frozen_busy = {}
+    for frozen in frozen_tasks.values():
+        for res_id in frozen["resource_ids"]:
+            frozen_busy.setdefault(res_id, []).append((frozen["start"], frozen["end"]))
+    blocked_intervals, clashes = release_busy(blocked_intervals, frozen_busy)
+    if clashes:
+        logger.warning("%d downtime intervals overlap frozen tasks; the frozen tasks keep their place", clashes)
+    logger.info("Downtime: %d intervals on %d resources up to elapsed minute %d",
+                sum(len(intervals) for intervals in blocked_intervals.values()), len(blocked_intervals),
+                calendars.horizon)
+
+    # Task indices per job, most urgent jobs first and jobs without a promised date last (the order in
+    # which the rolling horizon takes them)
+    job_order = [
+        job_tasks.get(job_number, [])
+        for job_number in eligible_jobs.sort_values("promised_date", na_position="last")["job_number"]
+    ]
+
+    return {
+        "start_date": start_date,
+        "tasks": all_tasks,
+        "job_order": job_order,
+        "resource_ids": resources_df["id"].tolist(),
+        "resource_mapping": resource_mapping,
+        "resource_group_mapping": resource_group_mapping,
+        "interchangeable_groups": interchangeable_groups,
+        "calendars": calendars,
+        "frozen_tasks": frozen_tasks,
+        "task_hints": task_hints,
+        "blocked_intervals": blocked_intervals,
+        "downtime_horizon": calendars.horizon,
+    }
+
+
+# Function to solve a prepared problem with the configured engine, falling back to the greedy list
+# schedule when the solver finds nothing. Tasks longer than their resources' free stretches are split
+# first (see split_paused_tasks). A schedule that runs past the downtime computed so far is checked
+# against the downtime extended to its end and solved again when it runs through some, up to
+# DOWNTIME_ROUNDS times; if it still does, the result is returned as infeasible (with stats.error set)
+# rather than break the calendar. Returns the solver result (see scheduler_model) for the problem's tasks.
+def solve_problem(problem, solver_config=None, stats=None, progress=None, stop_event=None):
+    stats = stats if stats is not None else RunStats()
+
+    # Steps 3 and 4: Build and solve the OR-Tools model, one model per independent component
+    solver_config = solver_config or SolverConfig.from_env()
+    stats.solver_config = solver_config.to_dict()
+    logger.info("Solver parameters: %s", solver_config.describe())
+    report = _incumbent_reporter(stats, progress)
+    worker_peaks = []  # Peak memory of the pool processes of a decomposed solve, over every round
+    for attempt in range(DOWNTIME_ROUNDS + 1):
+        split = split_paused_tasks(problem)
+        result = _solve_split(split, solver_config, report, stop_event)
+        if result.get("worker_peak_rss_mb") is not None:
+            worker_peaks.append(result["worker_peak_rss_mb"])
+        if not result["feasible"] or result["makespan"] <= problem["downtime_horizon"]:
+            break
+        logger.info("The schedule runs to elapsed minute %d, past the downtime computed up to %d; extending it",
+                    result["makespan"], problem["downtime_horizon"])
+        extend_downtime(problem, result["makespan"])
+        violations = downtime_violations(dict(split, blocked_intervals=problem["blocked_intervals"]), result)
+        if not violations:
+            break
+        if attempt == DOWNTIME_ROUNDS or result.get("stopped"):
+            logger.error("%d tasks of the schedule run through resource downtime beyond the calendar it was "
+                         "solved with", violations)
+            stats.error = "Schedule runs through resource downtime"
+            result = dict(result, feasible=False)
+            break
+        logger.warning("%d tasks run through resource downtime; solving again with the downtime up to %d",
+                       violations, problem["downtime_horizon"])
+    result = join_segments(problem, split, result)
+    if worker_peaks:
+        result["worker_peak_rss_mb"] = max(worker_peaks)
+    if result["feasible"]:
+        violations = frozen_precedence_violations(problem, result)
+        tasks = problem["tasks"]
+        for pred_index, i in violations:
+            logger.warning("Frozen task %s starts before its predecessor %s ends", tasks[i]["task_id"],
+                           tasks[pred_index]["task_id"])
+        result["precedence_violations"] = len(violations)
+    stats.record_solver(result)
+
+    return result
+
+
+# Function to solve a problem once with the configured engine, falling back to the greedy list schedule
+def _solve_split(problem, solver_config, report, stop_event):
+    all_tasks = problem["tasks"]
+    resource_mapping = problem["resource_mapping"]
+    resource_group_mapping = problem["resource_group_mapping"]
+    interchangeable_groups = problem["interchangeable_groups"]
+    frozen_tasks = problem["frozen_tasks"]
+    task_hints = problem["task_hints"]
+    blocked_intervals = problem["blocked_intervals"]
+
+    if solver_config.engine == "greedy":
+        result = greedy_for_objective(all_tasks, resource_mapping, resource_group_mapping, frozen_tasks,
+                                      blocked_intervals, priority=solver_config.greedy_priority,
+                                      objective=solver_config.objective)
+    elif solver_config.rolling_window:
+        result = solve_rolling_horizon(all_tasks, problem["job_order"], solver_config.rolling_window, resource_mapping,
+                                       resource_group_mapping, solver_config, frozen_tasks, task_hints,
+                                       interchangeable_groups, progress=report, stop_event=stop_event,
+                                       blocked_intervals=blocked_intervals)
+    else:
+        result = solve_schedule(all_tasks, resource_mapping, resource_group_mapping, solver_config,
+                                frozen_tasks, task_hints, blocked_intervals, interchangeable_groups,
+                                progress=report, stop_event=stop_event)
+    logger.info("Solver status: %s after %.2f s%s", result["status"], result["wall_time"],
+                " (stopped on request)" if result.get("stopped") else "")
+
+    # Rather than leave the floor without a schedule, fall back to the greedy list schedule
+    if not result["feasible"]:
+        logger.warning("No solution found by the solver; falling back to the greedy list schedule.")
+        worker_peak = result.get("worker_peak_rss_mb")
+        result = greedy_for_objective(all_tasks, resource_mapping, resource_group_mapping, frozen_tasks,
+                                      blocked_intervals, priority=solver_config.greedy_priority,
+                                      objective=solver_config.objective)
+        if worker_peak is not None:
+            result["worker_peak_rss_mb"] = worker_peak
+    return result
+
+
+# Function to turn a feasible result into schedule rows {"task_number", "start_time", "end_time",
+# "resources_used"}, with frozen tasks keeping their published times
+def build_schedule(problem, result, solver_config=None):
+    solver_config = solver_config or SolverConfig.from_env()
+    all_tasks = problem["tasks"]
+    resource_mapping = problem["resource_mapping"]
+    frozen_tasks = problem["frozen_tasks"]
+    calendars = problem["calendars"]
+    calendar_index = calendars.index
+
+    # Step 5: Output the schedule
+    objective_name = "makespan" if result["engine"] == "greedy" else parse_objective(solver_config.objective)[0]
+    if objective_name == "makespan":
+        logger.info("Schedule found! Makespan: %d elapsed minutes (best bound %.0f)", result["makespan"],
+                    result["best_bound"])
+    else:
+        logger.info("Schedule found! Makespan: %d elapsed minutes; %s %.0f (best bound %.0f)", result["makespan"],
+                    objective_name, result["objective"], result["best_bound"])
+    logger.info("Objectives: %s", ", ".join(f"{name}={value}" for name, value in result["objectives"].items()))
+    verbose = logger.isEnabledFor(logging.DEBUG)
+    schedule = []
+    id_to_resource = {v: k for k, v in resource_mapping.items()}
+    resource_usage = {res_id: [] for res_id in problem["resource_ids"]}
+
+    # Convert all start and end offsets to datetimes in one batch
+    starts = result["starts"]
+    ends = result["ends"]
+    start_datetimes = calendar_index.to_datetimes(starts)
+    end_datetimes = calendar_index.to_datetimes(ends)
+
+    for i, task in enumerate(all_tasks):
+        start = starts[i]
+        end = ends[i]
+        start_datetime = start_datetimes[i]
+        end_datetime = end_datetimes[i]
+        if i in frozen_tasks:  # Keep the exact times that were previously published
+            start_datetime = frozen_tasks[i]["start_time"]
+            end_datetime = frozen_tasks[i]["end_time"]
+
+        assigned_resources = result["assignments"][i]
+        resource_names = [id_to_resource.get(res_id, str(res_id)) for res_id in assigned_resources]
+        resources_used = ",".join(resource_names)
+
+        for res_id in assigned_resources:
+            resource_usage[res_id].append((task["task_id"], start, end, start_datetime, end_datetime))
+
+        if verbose:
+            logger.debug("Task %s: start=%s, end=%s, resources=%s", task["task_id"], start_datetime,
+                         end_datetime, resource_names)
+        schedule.append({
+            "task_number": task["task_id"][1],
+            "start_time": start_datetime,
+            "end_time": end_datetime,
+            "resources_used": resources_used
+        })
+
+    for res_id, usage in resource_usage.items():
+        if not usage:
+            continue
+        usage.sort(key=lambda x: x[1])
+        if verbose:
+            logger.debug("Resource %s usage (elapsed minutes): %s", id_to_resource.get(res_id, res_id),
+                         "; ".join(f"{task_id} {start}-{end} ({start_dt} to {end_dt})"
+                                   for task_id, start, end, start_dt, end_dt in usage))
+        for j in range(len(usage) - 1):
+            task1, start1, end1 = usage[j][:3]
+            task2, start2, end2 = usage[j + 1][:3]
+            if end1 > start2:
+                logger.warning("Overlap detected on resource %s: task %s (ends %s) overlaps with task %s "
+                               "(starts %s)", id_to_resource.get(res_id, res_id), task1, end1, task2, start2)
+
+    return schedule
+
+
+# Function to schedule the input data in one call: prepare, solve and build the schedule rows.
+# Returns the schedule, or None (with stats.error set) when no schedule could be made. Timings and solver
+# figures are collected in stats; progress and stop_event are passed to the solver as in schedule_jobs.
+# With problem_dir, the prepared problem is also saved there for replay (see problem_snapshot).
+def solve(data, start_date, solver_config=None, incremental=False, freeze_hours=DEFAULT_FREEZE_HOURS,
+          warm_start=True, stats=None, progress=None, stop_event=None, problem_dir=None):
+    stats = stats if stats is not None else RunStats()
+    solver_config = solver_config or SolverConfig.from_env()
+    stats.begin("preprocess")
+    problem = prepare_problem(data, start_date, incremental, freeze_hours, warm_start, stats)
+    if problem is None:
+        return None
+    if problem_dir:
+        try:
+            save_problem(problem, problem_dir, solver_config)
+        except Exception as e:
+            logger.warning("Could not save the problem snapshot to %s: %s", problem_dir, e)
+
+    stats.begin("solve")
+    result = solve_problem(problem, solver_config, stats, progress, stop_event)
+
+    stats.begin("convert")
+    if not result["feasible"]:
+        logger.error("No solution found.")
+        stats.error = stats.error or "No solution found"
+        return None
+    return build_schedule(problem, result, solver_config)
@@ -0,0 +1,206 @@
+from dataclasses import dataclass, asdict, field, fields
+import os
+from ortools.sat.python import cp_model
+from greedy_scheduler import PRIORITY_RULES
+from objectives import OBJECTIVES, parse_objective
+
+# CP-SAT search branching strategies, exposed by name as module constants of cp_model
+SEARCH_BRANCHING_NAMES = [
+    "AUTOMATIC_SEARCH", "FIXED_SEARCH", "PORTFOLIO_SEARCH", "LP_SEARCH", "PSEUDO_COST_SEARCH",
+    "PORTFOLIO_WITH_QUICK_RESTART_SEARCH", "HINT_SEARCH", "PARTIAL_FIXED_SEARCH", "RANDOMIZED_SEARCH",
+]
+
+ENGINES = ["cp-sat", "greedy"]
+HINT_SOURCES = ["auto", "previous", "greedy"]
+
+
+def _default_workers():
+    return os.cpu_count() or 1
+
+
+# Function to read a yes/no setting that arrives as JSON or text: a boolean, 0 or 1, or true/false, 1/0 or
+# yes/no in any case; anything else is a ValueError rather than a silent True
+def parse_flag(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ("1", "true", "yes"):
+        return True
+    if isinstance(value, str) and value.strip().lower() in ("0", "false", "no"):
+        return False
+    raise ValueError(f"Expected true or false, got {value!r}")
+
+
+# CP-SAT parameters used for a scheduling run.
+#
+# Values come from the defaults below, then SCHEDULER_* environment variables, then command-line
+# flags or the GUI, each layer overriding the previous one.
+@dataclass
+class SolverConfig:
+    max_time_in_seconds: float = 60.0
+    num_workers: int = field(default_factory=_default_workers)
+    relative_gap_limit: float = 0.0  # Stop once (objective - bound) / objective drops to this value
+    random_seed: int = 1
+    search_branching: str = "AUTOMATIC_SEARCH"
+    log_search_progress: bool = False
+    decompose: bool = True  # Solve independent groups of jobs as separate models in a process pool
+    decompose_min_tasks: int = 50  # Smallest model worth a pool process; smaller components are solved together
+    rolling_window: int = 0  # Solve this many jobs at a time, most urgent first; 0 solves all jobs at once
+    engine: str = "cp-sat"  # "cp-sat", or "greedy" for a quick list schedule without the solver
+    hint_source: str = "auto"  # "auto", "previous" or "greedy"; see scheduler_model.build_model
+    greedy_priority: str = "critical_path"  # Priority rule for the greedy list schedule
+    group_cumulative: bool = False  # Add a redundant cumulative constraint per resource group
+    objective: str = "makespan"  # One of objectives.OBJECTIVES, or several comma-separated in priority order
+
+    # Build a configuration from SCHEDULER_* environment variables, falling back to the defaults
+    @classmethod
+    def from_env(cls, environ=None):
+        environ = os.environ if environ is None else environ
+        config = cls()
+        if environ.get("SCHEDULER_MAX_TIME"):
+            config.max_time_in_seconds = float(environ["SCHEDULER_MAX_TIME"])
+        if environ.get("SCHEDULER_NUM_WORKERS"):
+            config.num_workers = int(environ["SCHEDULER_NUM_WORKERS"])
+        if environ.get("SCHEDULER_RELATIVE_GAP"):
+            config.relative_gap_limit = float(environ["SCHEDULER_RELATIVE_GAP"])
+        if environ.get("SCHEDULER_RANDOM_SEED"):
+            config.random_seed = int(environ["SCHEDULER_RANDOM_SEED"])
+        if environ.get("SCHEDULER_SEARCH_BRANCHING"):
+            config.search_branching = environ["SCHEDULER_SEARCH_BRANCHING"].upper()
+        if environ.get("SCHEDULER_LOG_SEARCH"):
+            config.log_search_progress = environ["SCHEDULER_LOG_SEARCH"].lower() in ("1", "true", "yes")
+        if environ.get("SCHEDULER_DECOMPOSE"):
+            config.decompose = environ["SCHEDULER_DECOMPOSE"].lower() in ("1", "true", "yes")
+        if environ.get("SCHEDULER_DECOMPOSE_MIN_TASKS"):
+            config.decompose_min_tasks = int(environ["SCHEDULER_DECOMPOSE_MIN_TASKS"])
+        if environ.get("SCHEDULER_ROLLING_WINDOW"):
+            config.rolling_window = int(environ["SCHEDULER_ROLLING_WINDOW"])
+        if environ.get("SCHEDULER_ENGINE"):
+            config.engine = environ["SCHEDULER_ENGINE"].lower()
+        if environ.get("SCHEDULER_HINT_SOURCE"):
+            config.hint_source = environ["SCHEDULER_HINT_SOURCE"].lower()
+        if environ.get("SCHEDULER_GREEDY_PRIORITY"):
+            config.greedy_priority = environ["SCHEDULER_GREEDY_PRIORITY"].lower()
+        if environ.get("SCHEDULER_GROUP_CUMULATIVE"):
+            config.group_cumulative = environ["SCHEDULER_GROUP_CUMULATIVE"].lower() in ("1", "true", "yes")
+        if environ.get("SCHEDULER_OBJECTIVE"):
+            config.objective = environ["SCHEDULER_OBJECTIVE"].lower()
+        config.validate()
+        return config
+
+    # Convert settings that arrive as JSON (e.g. the solver object of POST /api/schedule/run) to the types of
+    # the fields, for updated: numbers may be given as strings, names in any case. Unknown settings and values
+    # of the wrong kind raise ValueError.
+    @classmethod
+    def coerce(cls, values):
+        if not isinstance(values, dict):
+            raise ValueError(f"Expected an object of solver settings, got {values!r}")
+        types = {f.name: f.type for f in fields(cls)}
+        unknown = sorted(set(values) - set(types))
+        if unknown:
+            raise ValueError(f"Unknown solver settings {unknown}; expected some of {list(types)}")
+        coerced = {}
+        for key, value in values.items():
+            if value is None:
+                continue
+            if types[key] is bool:
+                value = parse_flag(value)
+            elif isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                raise ValueError(f"Invalid value for {key}: {value!r}")
+            elif types[key] is int:
+                number = float(value)
+                if not number.is_integer():
+                    raise ValueError(f"{key} must be a whole number, got {value!r}")
+                value = int(number)
+            elif types[key] is float:
+                value = float(value)
+            elif key == "search_branching":
+                value = str(value).upper()
+            else:
+                value = str(value).lower()
+            coerced[key] = value
+        return coerced
+
+    # Register the solver flags on an argparse parser
+    @staticmethod
+    def add_arguments(parser):
+        group = parser.add_argument_group("solver")
+        group.add_argument("--time-limit", type=float, dest="max_time_in_seconds",
+                           help="Maximum solve time in seconds")
+        group.add_argument("--workers", type=int, dest="num_workers",
+                           help="Number of parallel CP-SAT search workers (default: all cores)")
+        group.add_argument("--gap", type=float, dest="relative_gap_limit",
+                           help="Stop when the relative optimality gap drops below this value, e.g. 0.02")
+        group.add_argument("--seed", type=int, dest="random_seed", help="Random seed for the solver")
+        group.add_argument("--search-branching", choices=SEARCH_BRANCHING_NAMES, dest="search_branching",
+                           help="CP-SAT search branching strategy")
+        group.add_argument("--log-search", action="store_true", default=None, dest="log_search_progress",
+                           help="Print the CP-SAT search log")
+        group.add_argument("--no-decompose", action="store_false", default=None, dest="decompose",
+                           help="Solve all jobs as one model instead of splitting independent components")
+        group.add_argument("--decompose-min-tasks", type=int, dest="decompose_min_tasks",
+                           help="Only split off independent components of at least this many tasks (default: 50)")
+        group.add_argument("--rolling-window", type=int, dest="rolling_window",
+                           help="Schedule N jobs at a time in promised-date order (0 = all jobs in one model)")
+        group.add_argument("--engine", choices=ENGINES, dest="engine",
+                           help="Scheduling engine: the CP-SAT solver or a quick greedy list schedule")
+        group.add_argument("--hint-source", choices=HINT_SOURCES, dest="hint_source",
+                           help="Where the CP-SAT solution hint comes from")
+        group.add_argument("--greedy-priority", choices=list(PRIORITY_RULES), dest="greedy_priority",
+                           help="Priority rule for the greedy list schedule")
+        group.add_argument("--group-cumulative", action="store_true", default=None, dest="group_cumulative",
+                           help="Add a redundant cumulative constraint per resource group")
+        group.add_argument("--objective", dest="objective",
+                           help=f"Objective to minimize: one of {', '.join(OBJECTIVES)}, or several separated by "
+                                f"commas to minimize them lexicographically, e.g. tardiness,makespan")
+        return parser
+
+    # Return a copy with any non-None values from parsed arguments (or a dict) applied
+    def updated(self, overrides):
+        if not isinstance(overrides, dict):
+            overrides = vars(overrides)
+        values = asdict(self)
+        for key in values:
+            if overrides.get(key) is not None:
+                values[key] = overrides[key]
+        config = SolverConfig(**values)
+        config.validate()
+        return config
+
+    def validate(self):
+        if self.max_time_in_seconds <= 0:
+            raise ValueError("max_time_in_seconds must be positive")
+        if self.num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+        if not 0 <= self.relative_gap_limit < 1:
+            raise ValueError("relative_gap_limit must be between 0 and 1")
+        if self.decompose_min_tasks < 1:
+            raise ValueError("decompose_min_tasks must be at least 1")
+        if self.rolling_window < 0:
+            raise ValueError("rolling_window must be 0 or positive")
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown engine {self.engine!r}; expected one of {ENGINES}")
+        if self.hint_source not in HINT_SOURCES:
+            raise ValueError(f"Unknown hint source {self.hint_source!r}; expected one of {HINT_SOURCES}")
+        if self.greedy_priority not in PRIORITY_RULES:
+            raise ValueError(f"Unknown greedy priority {self.greedy_priority!r}; expected one of {list(PRIORITY_RULES)}")
+        parse_objective(self.objective)
+        if self.search_branching not in SEARCH_BRANCHING_NAMES:
+            raise ValueError(f"Unknown search branching {self.search_branching!r}; expected one of {SEARCH_BRANCHING_NAMES}")
+
+    # Copy the configuration onto a CpSolver
+    def apply(self, solver):
+        solver.parameters.max_time_in_seconds = self.max_time_in_seconds
+        solver.parameters.num_workers = self.num_workers
+        solver.parameters.relative_gap_limit = self.relative_gap_limit
+        solver.parameters.random_seed = self.random_seed
+        solver.parameters.search_branching = getattr(cp_model, self.search_branching)
+        solver.parameters.log_search_progress = self.log_search_progress
+        return solver
+
+    def to_dict(self):
+        return asdict(self)
+
+    def describe(self):
+        return ", ".join(f"{key}={value}" for key, value in asdict(self).items())
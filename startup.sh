@@ -6,6 +6,9 @@ echo "Running startup.sh"
 # Install Python dependencies
 pip install -r backend/requirements.txt
 
+# Bring the database schema up to date
+python migrate.py
+
 # Run the Flask app with Gunicorn
 cd backend
-gunicorn app:app --bind=0.0.0.0:$PORT
+gunicorn app:app --config gunicorn.conf.py --bind=0.0.0.0:$PORT
@@ -0,0 +1,79 @@
+import numpy as np
+from task_table import task_arrays
+
+# Critical-path preprocessing that tightens the CP-SAT variable domains before the model is built.
+#
+# Tasks use the same dicts as scheduler_model: "duration", "resources", "predecessor_indices" and an
+# optional "release", or a TaskTable. Frozen tasks are fixed in place. The passes read durations, release
+# minutes and predecessors from task_arrays(tasks); callers that already have those pass them as arrays.
+
+
+# Function to order tasks so that every predecessor comes before its successors
+def topological_order(tasks, arrays=None):
+    _, _, pred_offsets, pred_indices = arrays if arrays is not None else task_arrays(tasks)
+    count = len(pred_offsets) - 1
+    pending = np.diff(pred_offsets).tolist()
+    successors = [[] for _ in range(count)]
+    for i, pred_index in zip(np.repeat(np.arange(count), pending).tolist(), pred_indices.tolist()):
+        successors[pred_index].append(i)
+
+    order = [i for i in range(count) if pending[i] == 0]
+    for i in order:  # The list grows while we walk it
+        for succ in successors[i]:
+            pending[succ] -= 1
+            if pending[succ] == 0:
+                order.append(succ)
+    return order, successors
+
+
+# Function to compute the earliest start of every task by a forward pass over the predecessor DAG
+def earliest_starts(tasks, frozen_tasks=None, order=None, arrays=None):
+    frozen_tasks = frozen_tasks or {}
+    arrays = arrays if arrays is not None else task_arrays(tasks)
+    if order is None:
+        order, _ = topological_order(tasks, arrays)
+    durations, releases, pred_offsets, pred_indices = (array.tolist() for array in arrays)
+    starts = [0] * len(durations)
+    for i in order:
+        if i in frozen_tasks:
+            starts[i] = frozen_tasks[i]["start"]
+            continue
+        start = releases[i]
+        for pred_index in pred_indices[pred_offsets[i]:pred_offsets[i + 1]]:
+            start = max(start, starts[pred_index] + durations[pred_index])
+        starts[i] = start
+    return starts
+
+
+# Function to compute each task's tail: its duration plus the longest chain of successors after it.
+# Frozen successors are skipped because their precedence is not enforced.
+def tails(tasks, frozen_tasks=None, order=None, successors=None, arrays=None):
+    frozen_tasks = frozen_tasks or {}
+    arrays = arrays if arrays is not None else task_arrays(tasks)
+    if order is None or successors is None:
+        order, successors = topological_order(tasks, arrays)
+    durations = arrays[0].tolist()
+    result = [0] * len(durations)
+    for i in reversed(order):
+        result[i] = durations[i] + max(
+            (result[succ] for succ in successors[i] if succ not in frozen_tasks), default=0
+        )
+    return result
+
+
+# Function to compute start-time domains for the CP-SAT model.
+#
+# Returns (earliest, latest): the forward-pass earliest start of every task and the latest start that
+# still finishes all of its successors by the horizon. When the horizon is the makespan of a feasible
+# schedule (e.g. a greedy list schedule), every schedule at least as good lies inside these bounds.
+def compute_bounds(tasks, horizon, frozen_tasks=None, arrays=None):
+    frozen_tasks = frozen_tasks or {}
+    arrays = arrays if arrays is not None else task_arrays(tasks)
+    order, successors = topological_order(tasks, arrays)
+    earliest = earliest_starts(tasks, frozen_tasks, order, arrays)
+    task_tails = tails(tasks, frozen_tasks, order, successors, arrays)
+    latest = [
+        frozen_tasks[i]["start"] if i in frozen_tasks else max(horizon - task_tails[i], earliest[i])
+        for i in range(len(earliest))
+    ]
+    return earliest, latest
@@ -0,0 +1,152 @@
+from itertools import chain
+import numpy as np
+import pandas as pd
+
+
+# Compact, array-backed table of the tasks to schedule.
+#
+# Row i of every array describes task i. Predecessors are stored in CSR form: the predecessor indices
+# of task i are pred_indices[pred_offsets[i]:pred_offsets[i + 1]]. release is the earliest minute a task
+# may start (0 for none); due and weight hold the job-based objective inputs (see objectives.py), -1 where
+# a task has none. resources is any sequence giving the resource names of task i.
+#
+# The table is a read-only sequence of task dicts, so it can be handed to anything that takes the task
+# list of scheduler_model; each row is built when it is read, and changing it does not change the table.
+# The model builders read durations and predecessors straight from the arrays (see task_arrays).
+class TaskTable:
+    def __init__(self, job_numbers, task_numbers, durations, resources, pred_offsets, pred_indices, release=None,
+                 due=None, weight=None):
+        self.job_numbers = job_numbers
+        self.task_numbers = task_numbers
+        self.durations = durations
+        self.resources = resources
+        self.pred_offsets = pred_offsets
+        self.pred_indices = pred_indices
+        self.release = release if release is not None else np.zeros(len(durations), dtype=np.int64)
+        self.due = due if due is not None else np.full(len(durations), -1, dtype=np.int64)
+        self.weight = weight if weight is not None else np.full(len(durations), -1, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.durations)
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"Task index {i} out of range for {len(self)} tasks")
+        i %= len(self)
+        return self._row(_item(self.job_numbers[i]), _item(self.task_numbers[i]), int(self.durations[i]),
+                         list(self.resources[i]), self.predecessors_of(i).tolist(), int(self.release[i]),
+                         int(self.due[i]), int(self.weight[i]))
+
+    def __iter__(self):
+        pred_indices = self.pred_indices.tolist()
+        offsets = self.pred_offsets.tolist()
+        for i, row in enumerate(zip(self.job_numbers.tolist(), self.task_numbers.tolist(), self.durations.tolist(),
+                                    self.resources, self.release.tolist(), self.due.tolist(), self.weight.tolist())):
+            job_number, task_number, duration, resources, release, due, weight = row
+            yield self._row(job_number, task_number, duration, list(resources),
+                            pred_indices[offsets[i]:offsets[i + 1]], release, due, weight)
+
+    @staticmethod
+    def _row(job_number, task_number, duration, resources, predecessor_indices, release, due, weight):
+        task = {
+            "task_id": (job_number, task_number),
+            "duration": duration,
+            "resources": resources,
+            "predecessor_indices": predecessor_indices,
+        }
+        if release > 0:
+            task["release"] = release
+        if due >= 0:
+            task["due"] = due
+        if weight >= 0:
+            task["weight"] = weight
+        return task
+
+    def predecessors_of(self, i):
+        return self.pred_indices[self.pred_offsets[i]:self.pred_offsets[i + 1]]
+
+    # Task indices per job number, in table order
+    def job_tasks(self):
+        job_tasks = {}
+        for i, job_number in enumerate(self.job_numbers.tolist()):
+            job_tasks.setdefault(job_number, []).append(i)
+        return job_tasks
+
+    # Task dicts that can be changed, e.g. to add a release
+    def records(self):
+        return list(self)
+
+
+# Function to turn a NumPy scalar (e.g. from a fixed-width string array) into the Python value
+def _item(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+# Function to get the durations, release minutes and CSR predecessors of a task list as NumPy arrays
+# (durations, releases, pred_offsets, pred_indices). A TaskTable hands out its own arrays; a list of task
+# dicts is packed into the same form.
+def task_arrays(tasks):
+    if isinstance(tasks, TaskTable):
+        return tasks.durations, tasks.release, tasks.pred_offsets, tasks.pred_indices
+    durations = np.fromiter((task["duration"] for task in tasks), dtype=np.int64, count=len(tasks))
+    releases = np.fromiter((task.get("release", 0) for task in tasks), dtype=np.int64, count=len(tasks))
+    pred_offsets = np.zeros(len(tasks) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter((len(task["predecessor_indices"]) for task in tasks), dtype=np.int64, count=len(tasks)),
+              out=pred_offsets[1:])
+    pred_indices = np.fromiter(chain.from_iterable(task["predecessor_indices"] for task in tasks), dtype=np.int64,
+                               count=int(pred_offsets[-1]))
+    return durations, releases, pred_offsets, pred_indices
+
+
+# Function to select the tasks to schedule and compute their durations in one pass.
+#
+# Jobs that are completed or blocked and tasks that are completed are dropped, every remaining task is
+# joined to its job's quantity, and duration = setup_time + time_each * quantity (at least 1 minute).
+# Tasks keep the job book order: jobs in jobs_df order, tasks in tasks_df order within each job.
+# Returns (table, missing_predecessors) where missing_predecessors lists (task_id, predecessor_id) pairs
+# whose predecessor is not among the scheduled tasks.
+def prepare_tasks(jobs_df, tasks_df):
+    eligible_jobs = jobs_df.loc[~jobs_df["completed"].astype(bool) & ~jobs_df["blocked"].astype(bool),
+                                ["job_number", "quantity"]]
+    eligible_jobs = eligible_jobs.drop_duplicates("job_number").reset_index(drop=True)
+    eligible_jobs["job_order"] = np.arange(len(eligible_jobs))
+
+    open_tasks = tasks_df.loc[~tasks_df["completed"].astype(bool),
+                              ["job_number", "task_number", "setup_time", "time_each", "resources", "predecessors"]]
+    open_tasks = open_tasks.assign(task_order=np.arange(len(open_tasks)))
+    tasks = open_tasks.merge(eligible_jobs, on="job_number", how="inner")
+    tasks = tasks.sort_values(["job_order", "task_order"], kind="stable").reset_index(drop=True)
+
+    setup_time = pd.to_numeric(tasks["setup_time"], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+    time_each = pd.to_numeric(tasks["time_each"], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+    quantity = pd.to_numeric(tasks["quantity"], errors="coerce").fillna(1).to_numpy(dtype=np.float64)
+    durations = np.maximum(1, setup_time + time_each * quantity).astype(np.int64)
+
+    job_numbers = tasks["job_number"].to_numpy(dtype=object)
+    task_numbers = tasks["task_number"].to_numpy(dtype=object)
+    resources = [list(r) if isinstance(r, (list, tuple, np.ndarray)) else [] for r in tasks["resources"]]
+
+    # Resolve predecessors to task indices with one merge on (job_number, task_number)
+    preds = tasks[["job_number", "predecessors"]].assign(successor=np.arange(len(tasks))).explode("predecessors")
+    preds = preds.dropna(subset=["predecessors"])
+    preds = preds[(preds["predecessors"] != "") & (preds["predecessors"].str.lower() != "nan")]
+    index = pd.DataFrame({"job_number": job_numbers, "predecessors": task_numbers,
+                          "predecessor": np.arange(len(tasks))})
+    preds = preds.merge(index, on=["job_number", "predecessors"], how="left")
+
+    missing = preds[preds["predecessor"].isna()]
+    missing_predecessors = [
+        ((job_number, task_numbers[successor]), (job_number, pred_task_number))
+        for job_number, pred_task_number, successor in zip(
+            missing["job_number"], missing["predecessors"], missing["successor"]
+        )
+    ]
+
+    found = preds.dropna(subset=["predecessor"]).sort_values("successor", kind="stable")
+    successors = found["successor"].to_numpy(dtype=np.int64)
+    pred_indices = found["predecessor"].to_numpy(dtype=np.int64)
+    pred_offsets = np.zeros(len(tasks) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(successors, minlength=len(tasks)), out=pred_offsets[1:])
+
+    table = TaskTable(job_numbers, task_numbers, durations, resources, pred_offsets, pred_indices)
+    return table, missing_predecessors
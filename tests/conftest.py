@@ -0,0 +1,41 @@
+import os
+import sqlite3
+import sys
+import pytest
+
+# The scheduler modules live in the repository root, one level above the tests
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from data_sources import DatabaseSource
+
+# The scheduler's tables, as a SQLite database has them
+SCHEMA = """
+    CREATE TABLE job (id INTEGER PRIMARY KEY, job_number TEXT, promised_date TIMESTAMP, quantity INTEGER,
+                      price_each REAL, completed BOOLEAN, blocked BOOLEAN);
+    CREATE TABLE task (id INTEGER PRIMARY KEY, task_number TEXT, job_number TEXT, setup_time INTEGER,
+                       time_each REAL, predecessors TEXT, resources TEXT, completed BOOLEAN);
+    CREATE TABLE resource (id INTEGER PRIMARY KEY, name TEXT, type TEXT);
+    CREATE TABLE resource_group (id INTEGER PRIMARY KEY, name TEXT, interchangeable BOOLEAN);
+    CREATE TABLE resource_group_association (resource_id INTEGER, group_id INTEGER);
+    CREATE TABLE calendar (id INTEGER PRIMARY KEY, weekday INTEGER, start_time TIME, end_time TIME);
+    CREATE TABLE resource_calendar (resource_id INTEGER, weekday INTEGER, start_time TIME, end_time TIME);
+    CREATE TABLE calendar_exception (id INTEGER PRIMARY KEY, resource_id INTEGER, start_time TIMESTAMP,
+                                     end_time TIMESTAMP, reason TEXT);
+    CREATE TABLE schedule (id INTEGER PRIMARY KEY, task_number TEXT, start_time TIMESTAMP, end_time TIMESTAMP,
+                           resources_used TEXT);
+    INSERT INTO calendar (weekday, start_time, end_time) VALUES
+        (1, '07:00:00', '16:00:00'), (2, '07:00:00', '16:00:00'), (3, '07:00:00', '16:00:00'),
+        (4, '07:00:00', '16:00:00'), (5, '07:00:00', '16:00:00');
+"""
+
+
+# A scheduler database in a SQLite file, with the shop working 07:00-16:00 on weekdays and the rows of the
+# test module's ROWS (INSERT statements); returns a DatabaseSource reading it
+@pytest.fixture
+def database(tmp_path, request):
+    path = tmp_path / "scheduler.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA + request.module.ROWS)
+    return DatabaseSource(f"sqlite:///{path}")
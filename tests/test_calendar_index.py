@@ -0,0 +1,39 @@
+from datetime import date, datetime
+from calendar_index import CalendarIndex
+
+START_DATE = datetime(2025, 3, 3)  # A Monday
+
+# 07:00-16:00 Monday to Thursday, 07:00-12:00 on Friday, nothing at the weekend
+WORKING_HOURS = {1: (420, 960), 2: (420, 960), 3: (420, 960), 4: (420, 960), 5: (420, 720)}
+
+
+def test_to_datetime_follows_working_hours():
+    index = CalendarIndex(START_DATE, WORKING_HOURS)
+
+    assert index.to_datetime(0) == datetime(2025, 3, 3, 7)
+    # The end of a day stays on that day; the next minute is the next morning
+    assert index.to_datetime(540) == datetime(2025, 3, 3, 16)
+    assert index.to_datetime(541) == datetime(2025, 3, 4, 7, 1)
+    # Friday's short day ends after 4 * 540 + 300 minutes and the week carries on on Monday
+    assert index.to_datetime(2460) == datetime(2025, 3, 7, 12)
+    assert index.to_datetime(2461) == datetime(2025, 3, 10, 7, 1)
+
+
+def test_to_elapsed_inverts_to_datetime():
+    index = CalendarIndex(START_DATE, WORKING_HOURS, closed_dates={date(2025, 3, 5)})
+    offsets = list(range(0, 30000, 37))
+
+    assert [index.to_elapsed(index.to_datetime(offset)) for offset in offsets] == offsets
+    assert index.to_datetimes(offsets) == [index.to_datetime(offset) for offset in offsets]
+    # The closed Wednesday is skipped like a weekend
+    assert index.to_datetime(1081) == datetime(2025, 3, 6, 7, 1)
+
+
+def test_to_elapsed_snaps_outside_working_hours():
+    index = CalendarIndex(START_DATE, WORKING_HOURS)
+
+    assert index.to_elapsed(datetime(2025, 3, 1)) == 0
+    assert index.to_elapsed(datetime(2025, 3, 3, 5)) == 0
+    assert index.to_elapsed(datetime(2025, 3, 3, 18)) == 540
+    # A Saturday snaps to the end of Friday
+    assert index.to_elapsed(datetime(2025, 3, 8, 10)) == 2460
@@ -0,0 +1,73 @@
+from scheduler_model import bundle_components, component_time_limits, find_components, solve_schedule
+from solver_config import SolverConfig
+
+RESOURCE_MAPPING = {"Pieter": 1, "Weld1": 2, "Weld2": 3, "Saw": 4}
+RESOURCE_GROUP_MAPPING = {"Welders": [2, 3]}
+
+# J1 welds on Weld1, J2 on either welder and J3 saws; J4 is Pieter's, J5 has two unrelated tasks
+TASKS = [
+    {"task_id": ("J1", "J1-10"), "duration": 60, "resources": ["Weld1"], "predecessor_indices": []},
+    {"task_id": ("J2", "J2-10"), "duration": 30, "resources": ["Welders"], "predecessor_indices": []},
+    {"task_id": ("J3", "J3-10"), "duration": 45, "resources": ["Saw"], "predecessor_indices": []},
+    {"task_id": ("J3", "J3-20"), "duration": 20, "resources": ["Saw"], "predecessor_indices": [2]},
+    {"task_id": ("J4", "J4-10"), "duration": 40, "resources": ["Pieter"], "predecessor_indices": []},
+    {"task_id": ("J5", "J5-10"), "duration": 15, "resources": [], "predecessor_indices": []},
+    {"task_id": ("J5", "J5-20"), "duration": 25, "resources": [], "predecessor_indices": []},
+]
+
+
+def test_components_share_resources_through_groups():
+    components = find_components(TASKS, RESOURCE_MAPPING, RESOURCE_GROUP_MAPPING)
+    # Weld1 is one of the Welders, so J1 and J2 are connected; J3's tasks are linked by their precedence
+    assert sorted(components) == [[0, 1], [2, 3], [4], [5], [6]]
+
+
+def test_frozen_tasks_connect_through_the_resources_they_hold():
+    # J5-10 names no resource, but it was frozen on Pieter
+    frozen = {5: {"start": 0, "end": 15, "resource_ids": [1]}}
+    components = find_components(TASKS, RESOURCE_MAPPING, RESOURCE_GROUP_MAPPING, frozen)
+    assert sorted(components) == [[0, 1], [2, 3], [4, 5], [6]]
+
+
+def test_sum_objectives_keep_jobs_together():
+    components = find_components(TASKS, RESOURCE_MAPPING, RESOURCE_GROUP_MAPPING, by_job=True)
+    assert sorted(components) == [[0, 1], [2, 3], [4], [5, 6]]
+
+
+def test_small_components_are_bundled():
+    assert bundle_components([[0, 1, 2], [3, 4], [5], [6]], 2) == [[0, 1, 2], [3, 4], [5, 6]]
+    # A last bundle that stays too small joins the one before it
+    assert bundle_components([[0, 1, 2], [3, 4], [5]], 2) == [[0, 1, 2], [3, 4, 5]]
+    assert bundle_components([[0, 1], [2], [3]], 10) == [[0, 1, 2, 3]]
+
+
+def test_time_limits_follow_task_counts():
+    components = [[0, 1, 2], [3], [4, 5, 6, 7, 8, 9]]
+    # One process solves them one after another within the time limit
+    assert component_time_limits(components, 10, 1) == [3.0, 1.0, 6.0]
+    # Two processes give twice the solving time, but no component more than the limit
+    assert component_time_limits(components, 10, 2) == [6.0, 2.0, 10]
+
+
+def test_decomposed_solve_merges_the_components():
+    config = SolverConfig(max_time_in_seconds=5, num_workers=2, decompose_min_tasks=1)
+    result = solve_schedule(TASKS, RESOURCE_MAPPING, RESOURCE_GROUP_MAPPING, config)
+    whole = solve_schedule(TASKS, RESOURCE_MAPPING, RESOURCE_GROUP_MAPPING, config.updated({"decompose": False}))
+
+    assert result["component_count"] == 5 and "component_count" not in whole
+    assert result["feasible"] and result["status"] == "OPTIMAL"
+    assert result["makespan"] == whole["makespan"] == 65
+    # Every task lands back on its global index with its own duration and resources
+    for i, task in enumerate(TASKS):
+        assert result["ends"][i] - result["starts"][i] == task["duration"]
+    assert result["starts"][3] >= result["ends"][2]
+    assert result["assignments"][2] == result["assignments"][3] == [4]
+    # J2 welds on Weld2, or on Weld1 outside J1's hour
+    assert (result["assignments"][1] == [3] or result["ends"][1] <= result["starts"][0]
+            or result["starts"][1] >= result["ends"][0])
+
+
+def test_one_worker_solves_one_model():
+    config = SolverConfig(max_time_in_seconds=5, num_workers=1, decompose_min_tasks=1)
+    result = solve_schedule(TASKS, RESOURCE_MAPPING, RESOURCE_GROUP_MAPPING, config)
+    assert result["feasible"] and "component_count" not in result
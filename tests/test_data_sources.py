@@ -0,0 +1,31 @@
+from datetime import datetime
+from data_sources import SNAPSHOT_TEXT, SnapshotSource, write_snapshot
+from scheduling_core import prepare_problem
+
+START_DATE = datetime(2025, 3, 3)
+
+# Job, task and resource names that look like numbers, as some shops number them
+ROWS = """
+    INSERT INTO job VALUES (1, '100', '2025-03-07 16:00:00', 1, 100.0, 0, 0);
+    INSERT INTO task VALUES (1, '10', '100', 0, 60, NULL, '7', 0),
+                            (2, '20', '100', 0, 30, '10', '7', 0);
+    INSERT INTO resource VALUES (1, '7', 'M');
+    INSERT INTO schedule VALUES (1, '10', '2025-03-03 08:00:00', '2025-03-03 09:00:00', '7');
+"""
+
+
+def test_csv_snapshot_keeps_numeric_looking_names(database, tmp_path):
+    data = database.load()
+    write_snapshot(data, tmp_path / "snapshot")
+    loaded = SnapshotSource(tmp_path / "snapshot").load()
+
+    for name in ("jobs", "tasks", "resources", "schedule"):
+        columns = SNAPSHOT_TEXT[name]
+        assert loaded[name][columns].to_dict("records") == data[name][columns].to_dict("records")
+
+    # The snapshot keeps the precedence and the resource of the database problem
+    problem = prepare_problem(database.load(), START_DATE)
+    replayed = prepare_problem(loaded, START_DATE)
+    assert [task["task_id"] for task in replayed["tasks"]] == [("100", "10"), ("100", "20")]
+    assert [task["predecessor_indices"] for task in replayed["tasks"]] == [[], [0]]
+    assert [task["resources"] for task in replayed["tasks"]] == [task["resources"] for task in problem["tasks"]]
@@ -0,0 +1,25 @@
+import sqlalchemy as sa
+from database import database_url, make_engine
+
+
+def test_db_settings_come_before_database_url(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///backend.db")
+    for name, value in {"DB_HOST": "db", "DB_NAME": "scheduler", "DB_USER": "planner", "DB_PASS": "secret",
+                        "DB_PORT": "5432"}.items():
+        monkeypatch.setenv(name, value)
+    assert database_url() == "postgresql+psycopg2://planner:secret@db:5432/scheduler"
+
+    # Without DB_HOST, e.g. where only the backend is configured, DATABASE_URL is used
+    monkeypatch.delenv("DB_HOST")
+    assert database_url() == "sqlite:///backend.db"
+
+
+def test_sqlite_file_with_a_quote_in_its_path(tmp_path):
+    path = tmp_path / "shop's.db"
+    engine = make_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(sa.text("CREATE TABLE public.job (job_number TEXT)"))
+        conn.execute(sa.text("INSERT INTO job VALUES ('J1')"))
+    with engine.connect() as conn:
+        assert conn.execute(sa.text("SELECT job_number FROM public.job")).scalar() == "J1"
+    engine.dispose()
@@ -0,0 +1,19 @@
+from fetch_data import analyze_data
+
+# J1-10 is completed and no longer fetched; J1-30 waits on the open J1-20
+ROWS = """
+    INSERT INTO job VALUES (1, 'J1', '2025-03-07 16:00:00', 1, 100.0, 0, 0);
+    INSERT INTO task VALUES (1, 'J1-10', 'J1', 0, 60, NULL, NULL, 1),
+                            (2, 'J1-20', 'J1', 0, 30, 'J1-10', NULL, 0),
+                            (3, 'J1-30', 'J1', 0, 30, 'J1-20', NULL, 0);
+"""
+
+
+def test_completed_predecessors_are_satisfied(database, capsys):
+    data = database.load()
+    assert list(data["tasks"]["task_number"]) == ["J1-20", "J1-30"]
+
+    analyze_data(data)
+    report = capsys.readouterr().out.split("Tasks Waiting on Open Predecessors:")[1].splitlines()
+    waiting = [line.split()[2] for line in report[2:] if line.strip()]
+    assert waiting == ["J1-30"]
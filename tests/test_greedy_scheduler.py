@@ -0,0 +1,54 @@
+import pytest
+from greedy_scheduler import greedy_schedule
+
+RESOURCE_MAPPING = {"Pieter": 1, "Weld1": 2, "Weld2": 3}
+RESOURCE_GROUP_MAPPING = {"Welders": [2, 3]}
+
+# Two welding tasks that both feed J1-30 on Pieter, and an unrelated task for Pieter
+TASKS = [
+    {"task_id": ("J1", "J1-10"), "duration": 60, "resources": ["Welders"], "predecessor_indices": []},
+    {"task_id": ("J1", "J1-20"), "duration": 30, "resources": ["Welders"], "predecessor_indices": []},
+    {"task_id": ("J1", "J1-30"), "duration": 40, "resources": ["Pieter"], "predecessor_indices": [0, 1]},
+    {"task_id": ("J2", "J2-10"), "duration": 20, "resources": ["Pieter"], "predecessor_indices": []},
+]
+
+
+# Function to list every (start, end) a resource is held in a result, sorted
+def holds(result, res_id):
+    return sorted((start, end) for start, end, assigned in zip(result["starts"], result["ends"], result["assignments"])
+                  if res_id in assigned)
+
+
+@pytest.mark.parametrize("priority", ["critical_path", "shortest", "longest", "fifo", "due_date"])
+def test_greedy_schedule_is_feasible(priority):
+    blocked = {1: [(0, 30)]}
+    result = greedy_schedule(TASKS, RESOURCE_MAPPING, RESOURCE_GROUP_MAPPING, blocked_intervals=blocked,
+                             priority=priority)
+
+    assert result["feasible"]
+    for i, task in enumerate(TASKS):
+        assert result["ends"][i] - result["starts"][i] == task["duration"]
+        assert all(result["ends"][p] <= result["starts"][i] for p in task["predecessor_indices"])
+    # Each welding task gets one welder, and the two run side by side
+    assert sorted(result["assignments"][0] + result["assignments"][1]) == [2, 3]
+    assert result["starts"][0] == result["starts"][1] == 0
+    for res_id in (1, 2, 3):
+        intervals = holds(result, res_id) + blocked.get(res_id, [])
+        intervals.sort()
+        assert all(end <= next_start for (_, end), (next_start, _) in zip(intervals, intervals[1:]))
+    assert result["makespan"] == 100
+    assert result["best_bound"] <= result["makespan"]
+
+
+def test_greedy_schedule_keeps_frozen_tasks():
+    frozen = {3: {"start": 60, "end": 80, "resource_ids": [1]}}
+    result = greedy_schedule(TASKS, RESOURCE_MAPPING, RESOURCE_GROUP_MAPPING, frozen_tasks=frozen)
+
+    assert (result["starts"][3], result["ends"][3], result["assignments"][3]) == (60, 80, [1])
+    # J1-30 is ready at minute 60 but Pieter is taken until 80
+    assert result["starts"][2] == 80
+
+
+def test_greedy_schedule_rejects_an_unknown_priority_rule():
+    with pytest.raises(ValueError):
+        greedy_schedule(TASKS, RESOURCE_MAPPING, RESOURCE_GROUP_MAPPING, priority="random")
@@ -0,0 +1,63 @@
+from scheduler_model import build_model, model_size, solve_tasks
+from solver_config import SolverConfig
+
+RESOURCE_MAPPING = {"Weld1": 1, "Weld2": 2}
+RESOURCE_GROUP_MAPPING = {"Welders": [1, 2]}
+
+# Three tasks on either welder and one on Weld1: four welding hours over two welders
+TASKS = [
+    {"task_id": ("J1", "J1-10"), "duration": 60, "resources": ["Welders"], "predecessor_indices": []},
+    {"task_id": ("J2", "J2-10"), "duration": 60, "resources": ["Welders"], "predecessor_indices": []},
+    {"task_id": ("J3", "J3-10"), "duration": 60, "resources": ["Welders"], "predecessor_indices": []},
+    {"task_id": ("J4", "J4-10"), "duration": 60, "resources": ["Weld1"], "predecessor_indices": []},
+]
+
+
+# Function to build the model of TASKS with one group encoding
+def built_model(group_encoding, group_cumulative=False):
+    return build_model(TASKS, RESOURCE_MAPPING, RESOURCE_GROUP_MAPPING, group_encoding=group_encoding,
+                       group_cumulative=group_cumulative)["model"]
+
+
+# Function to count the cumulative constraints of a model, on protobuf and on newer OR-Tools protos
+def cumulative_count(model):
+    return sum(1 for constraint in model.Proto().constraints
+               if (constraint.has_cumulative() if hasattr(constraint, "has_cumulative")
+                   else constraint.HasField("cumulative")))
+
+
+def test_boolean_encoding_has_no_member_id_variables():
+    boolean = built_model("boolean")
+    selector = built_model("selector")
+    boolean_names = [variable.name for variable in boolean.Proto().variables]
+    selector_names = [variable.name for variable in selector.Proto().variables]
+
+    assert not any(name.startswith("selected_resource_") for name in boolean_names)
+    assert sum(1 for name in selector_names if name.startswith("selected_resource_")) == 3
+    # One boolean per member for each group task, in both encodings
+    for names in (boolean_names, selector_names):
+        assert sum(1 for name in names if name.startswith("use_res_")) == 6
+    # The selector adds one IntVar and two reified equalities per member on top
+    assert model_size(selector)["variables"] == model_size(boolean)["variables"] + 3
+    assert model_size(selector)["constraints"] == model_size(boolean)["constraints"] + 3 * 2 * 2
+
+
+def test_group_cumulative_adds_one_cumulative_per_group():
+    assert cumulative_count(built_model("boolean")) == 0
+    assert cumulative_count(built_model("boolean", group_cumulative=True)) == 1
+
+
+def test_assignments_are_read_from_the_member_booleans():
+    config = SolverConfig(max_time_in_seconds=5, num_workers=2)
+    result = solve_tasks(TASKS, RESOURCE_MAPPING, RESOURCE_GROUP_MAPPING, config)
+    cumulative = solve_tasks(TASKS, RESOURCE_MAPPING, RESOURCE_GROUP_MAPPING, config.updated({"group_cumulative": True}))
+
+    assert result["status"] == cumulative["status"] == "OPTIMAL"
+    assert result["makespan"] == cumulative["makespan"] == 120
+    assert all(len(assigned) == 1 and assigned[0] in (1, 2) for assigned in result["assignments"])
+    assert result["assignments"][3] == [1]
+    # Tasks on the same welder never overlap
+    for res_id in (1, 2):
+        spans = sorted((result["starts"][i], result["ends"][i]) for i, assigned in enumerate(result["assignments"])
+                       if assigned == [res_id])
+        assert all(end <= next_start for (_, end), (next_start, _) in zip(spans, spans[1:]))
@@ -0,0 +1,63 @@
+from datetime import datetime
+import pandas as pd
+from run_stats import RunStats
+from scheduling_core import prepare_problem, solve
+from solver_config import SolverConfig
+
+START_DATE = datetime(2025, 3, 3)
+
+# J1-10 was planned on Monday morning, inside the default 24-hour freeze window, and J1-20 on Wednesday
+ROWS = """
+    INSERT INTO job VALUES (1, 'J1', '2025-03-07 16:00:00', 1, 100.0, 0, 0);
+    INSERT INTO task VALUES (1, 'J1-10', 'J1', 10, 30, NULL, 'Welders', 0),
+                            (2, 'J1-20', 'J1', 0, 60, 'J1-10', 'Pieter', 0);
+    INSERT INTO resource VALUES (1, 'Pieter', 'H'), (2, 'Weld1', 'M'), (3, 'Weld2', 'M');
+    INSERT INTO resource_group VALUES (1, 'Welders', 0);
+    INSERT INTO resource_group_association VALUES (2, 1), (3, 1);
+    INSERT INTO schedule VALUES (1, 'J1-10', '2025-03-03 08:00:00', '2025-03-03 09:00:00', 'Weld2'),
+                                (2, 'J1-20', '2025-03-05 07:00:00', '2025-03-05 08:00:00', 'Pieter');
+"""
+
+
+def test_incremental_run_keeps_tasks_inside_the_freeze_window(database):
+    data = database.load()
+    problem = prepare_problem(data, START_DATE, incremental=True)
+    assert [problem["tasks"][i]["task_id"][1] for i in problem["frozen_tasks"]] == ["J1-10"]
+    assert [problem["tasks"][i]["task_id"][1] for i in problem["task_hints"]] == ["J1-20"]
+
+    rows = {row["task_number"]: row for row in solve(data, START_DATE, SolverConfig(max_time_in_seconds=5),
+                                                     incremental=True)}
+    assert (rows["J1-10"]["start_time"], rows["J1-10"]["end_time"]) == (datetime(2025, 3, 3, 8), datetime(2025, 3, 3, 9))
+    assert rows["J1-10"]["resources_used"] == "Weld2"
+    # J1-20 is only hinted, so it moves up to follow the frozen task
+    assert rows["J1-20"]["start_time"] == datetime(2025, 3, 3, 9)
+
+
+def test_freeze_window_ends_after_freeze_hours(database):
+    problem = prepare_problem(database.load(), datetime(2025, 3, 3, 7), incremental=True, freeze_hours=1)
+    assert problem["frozen_tasks"] == {}
+    assert len(problem["task_hints"]) == 2
+
+    problem = prepare_problem(database.load(), START_DATE, incremental=False)
+    assert problem["frozen_tasks"] == {}
+
+
+def test_frozen_task_ahead_of_its_predecessor_is_reported(database, caplog):
+    # J1-20 was started on Monday at 07:10 without J1-10, which needs 40 minutes and is now to be scheduled
+    data = database.load()
+    data["schedule"] = pd.DataFrame({"task_number": ["J1-20"], "start_time": [datetime(2025, 3, 3, 7, 10)],
+                                     "end_time": [datetime(2025, 3, 3, 8, 10)], "resources_used": ["Pieter"]})
+    stats = RunStats()
+    rows = {row["task_number"]: row for row in solve(data, START_DATE, SolverConfig(max_time_in_seconds=5),
+                                                     incremental=True, stats=stats)}
+
+    assert rows["J1-20"]["start_time"] == datetime(2025, 3, 3, 7, 10)
+    assert rows["J1-10"]["end_time"] > rows["J1-20"]["start_time"]
+    assert stats.solver["precedence_violations"] == 1
+    assert "Frozen task ('J1', 'J1-20') starts before its predecessor ('J1', 'J1-10') ends" in caplog.text
+
+
+def test_no_violations_when_predecessors_come_first(database):
+    stats = RunStats()
+    solve(database.load(), START_DATE, SolverConfig(max_time_in_seconds=5), incremental=True, stats=stats)
+    assert stats.solver["precedence_violations"] == 0
@@ -0,0 +1,51 @@
+import threading
+import time
+from instance_generator import DEFAULT_START_DATE, generate_instance
+from scheduler_model import solve_tasks
+from scheduling_core import prepare_problem
+from solver_config import SolverConfig
+
+TIME_LIMIT = 60
+
+
+# Function to check that a result keeps every precedence and never puts two tasks on one resource at once
+def check_feasible(tasks, result):
+    busy = {}
+    for i, task in enumerate(tasks):
+        assert result["ends"][i] - result["starts"][i] == task["duration"]
+        for pred_index in task["predecessor_indices"]:
+            assert result["starts"][i] >= result["ends"][pred_index]
+        for res_id in result["assignments"][i]:
+            busy.setdefault(res_id, []).append((result["starts"][i], result["ends"][i]))
+    for intervals in busy.values():
+        intervals.sort()
+        assert all(end <= start for (_, end), (start, _) in zip(intervals, intervals[1:]))
+
+
+def test_stop_event_keeps_the_published_incumbent():
+    # CP-SAT does not prove this makespan optimal within a minute; the greedy hint gives it a first
+    # incumbent right away
+    problem = prepare_problem(generate_instance(jobs=80, seed=3), DEFAULT_START_DATE, warm_start=False)
+    tasks = list(problem["tasks"])
+    config = SolverConfig(max_time_in_seconds=TIME_LIMIT, num_workers=2)
+    stop_event = threading.Event()
+    events = []
+
+    # Stop once an incumbent came in, as a planner would from the GUI
+    def progress(event):
+        events.append(event)
+        stop_event.set()
+
+    started = time.perf_counter()
+    result = solve_tasks(tasks, problem["resource_mapping"], problem["resource_group_mapping"], config,
+                         blocked_intervals=problem["blocked_intervals"], log=lambda message: None,
+                         progress=progress, stop_event=stop_event, progress_assignments=True)
+
+    assert time.perf_counter() - started < TIME_LIMIT / 2
+    assert result["stopped"] and result["feasible"] and result["status"] == "FEASIBLE"
+    check_feasible(tasks, result)
+    # Every improved incumbent was published with its figures and assignment, the last one being the result
+    assert events and result["solutions"] == len(events)
+    assert all(event["type"] == "incumbent" and event["objective_name"] == "makespan" for event in events)
+    assert all(event["bound"] <= event["objective"] and len(event["starts"]) == len(tasks) for event in events)
+    assert events[-1]["makespan"] == result["makespan"] and events[-1]["ends"] == result["ends"]
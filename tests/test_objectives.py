@@ -0,0 +1,35 @@
+import pytest
+from objectives import evaluate_objectives, parse_objective
+
+# J1 (two tasks in a chain) is due at 100 with weight 3, J2 at 90 with weight 2 and J3 has no promised date.
+# J3-10 waits on J1-20, which still leaves J1-20 the final task of J1.
+TASKS = [
+    {"task_id": ("J1", "J1-10"), "predecessor_indices": [], "due": 100, "weight": 3},
+    {"task_id": ("J1", "J1-20"), "predecessor_indices": [0], "due": 100, "weight": 3},
+    {"task_id": ("J2", "J2-10"), "predecessor_indices": [], "due": 90, "weight": 2},
+    {"task_id": ("J3", "J3-10"), "predecessor_indices": [1]},
+]
+
+
+def test_evaluate_objectives():
+    assert evaluate_objectives(TASKS, [50, 120, 80, 200]) == {
+        "makespan": 200,
+        "tardiness": 3 * 20,
+        "late_jobs": 1,
+        "weighted_completion": 3 * 120 + 2 * 80 + 200,
+    }
+    # A job finished exactly on its due minute is not late
+    assert evaluate_objectives(TASKS, [50, 100, 90, 110])["late_jobs"] == 0
+    assert evaluate_objectives([], [])["makespan"] == 0
+
+
+def test_parse_objective():
+    assert parse_objective("makespan") == ["makespan"]
+    assert parse_objective(" tardiness, makespan ") == ["tardiness", "makespan"]
+    assert parse_objective(["late_jobs", "weighted_completion"]) == ["late_jobs", "weighted_completion"]
+
+
+@pytest.mark.parametrize("spec", ["", " , ", "lateness", "makespan,makespan", []])
+def test_parse_objective_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        parse_objective(spec)
@@ -0,0 +1,29 @@
+import pytest
+from scheduler_model import assign_pool_members
+
+MEMBERS = [2, 3, 4]
+
+
+def test_assign_pool_members_never_double_books_a_member():
+    starts = [0, 5, 10, 10, 15]
+    ends = [10, 15, 20, 12, 30]
+    demands = {0: 2, 1: 1, 2: 1, 3: 1, 4: 2}
+    assigned = assign_pool_members(starts, ends, demands, MEMBERS)
+
+    assert {i: len(picked) for i, picked in assigned.items()} == demands
+    for res_id in MEMBERS:
+        held = sorted((starts[i], ends[i]) for i, picked in assigned.items() if res_id in picked)
+        assert all(end <= next_start for (_, end), (next_start, _) in zip(held, held[1:]))
+    # Task 1 starts while task 0 holds two members, so it gets the third
+    assert assigned[1] == [4]
+
+
+def test_assign_pool_members_takes_the_longest_free_member():
+    assigned = assign_pool_members([0, 0, 20], [5, 10, 25], {0: 1, 1: 1, 2: 1}, [2, 3])
+    # Member 2 has been free since minute 5 and member 3 since minute 10
+    assert assigned == {0: [2], 1: [3], 2: [2]}
+
+
+def test_assign_pool_members_rejects_an_overbooked_pool():
+    with pytest.raises(ValueError):
+        assign_pool_members([0, 5], [10, 15], {0: 2, 1: 2}, MEMBERS)
@@ -0,0 +1,77 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from problem_snapshot import load_problem, save_problem
+from scheduling_core import build_schedule, prepare_problem, solve_problem
+from solver_config import SolverConfig
+
+START_DATE = datetime(2025, 3, 3)
+
+# J1-10 is frozen and J1-20 hinted from the previous schedule; Pieter has his own hours and a day off
+ROWS = """
+    INSERT INTO job VALUES (1, 'J1', '2025-03-05 16:00:00', 1, 100.0, 0, 0),
+                           (2, 'J2', NULL, 3, 0, 0, 0);
+    INSERT INTO task VALUES (1, 'J1-10', 'J1', 10, 30, NULL, 'Welders', 0),
+                            (2, 'J1-20', 'J1', 0, 60, 'J1-10', 'Pieter', 0),
+                            (3, 'J2-10', 'J2', 15, 20, NULL, 'Welders', 0),
+                            (4, 'J2-20', 'J2', 0, 45, 'J2-10', 'Pieter, Weld2', 0);
+    INSERT INTO resource VALUES (1, 'Pieter', 'H'), (2, 'Weld1', 'M'), (3, 'Weld2', 'M');
+    INSERT INTO resource_group VALUES (1, 'Welders', 1);
+    INSERT INTO resource_group_association VALUES (2, 1), (3, 1);
+    INSERT INTO resource_calendar VALUES (1, 1, '09:00:00', '15:00:00'), (1, 2, '09:00:00', '15:00:00');
+    INSERT INTO calendar_exception VALUES (1, 1, '2025-03-05 00:00:00', '2025-03-06 00:00:00', 'Leave');
+    INSERT INTO schedule VALUES (1, 'J1-10', '2025-03-03 08:00:00', '2025-03-03 09:00:00', 'Weld2'),
+                                (2, 'J1-20', '2025-03-04 09:00:00', '2025-03-04 10:00:00', 'Pieter');
+"""
+
+KEYS = ("start_date", "resource_ids", "resource_mapping", "resource_group_mapping",
+        "interchangeable_groups", "blocked_intervals", "downtime_horizon")
+
+
+# Function to drop what a snapshot does not keep (the previous schedule's resources_used text)
+def previous_positions(previous):
+    return {i: {key: value for key, value in entry.items() if key != "resources_used"} for i, entry in previous.items()}
+
+
+def test_snapshot_round_trip(database, tmp_path):
+    problem = prepare_problem(database.load(), START_DATE, incremental=True)
+    solver_config = SolverConfig(engine="greedy", objective="tardiness,makespan")
+    save_problem(problem, tmp_path / "snapshot", solver_config)
+    loaded, loaded_config = load_problem(tmp_path / "snapshot")
+
+    assert {key: loaded[key] for key in KEYS} == {key: problem[key] for key in KEYS}
+    # The tasks and the job order are read from the memory-mapped arrays row by row
+    assert list(loaded["tasks"]) == list(problem["tasks"])
+    assert list(loaded["job_order"]) == problem["job_order"]
+    assert isinstance(loaded["tasks"].durations, np.memmap)
+    assert loaded["frozen_tasks"] == previous_positions(problem["frozen_tasks"])
+    assert loaded["task_hints"] == previous_positions(problem["task_hints"])
+    assert loaded["calendars"].version == problem["calendars"].version
+    assert loaded["calendars"].downtime(5000) == problem["calendars"].downtime(5000)
+    assert loaded_config.to_dict() == solver_config.to_dict()
+
+    # The replay schedules the same as the original problem
+    expected = build_schedule(problem, solve_problem(problem, solver_config), solver_config)
+    assert build_schedule(loaded, solve_problem(loaded, loaded_config), loaded_config) == expected
+
+
+def test_snapshot_without_solver_config(database, tmp_path):
+    save_problem(prepare_problem(database.load(), START_DATE), tmp_path / "snapshot")
+    _, solver_config = load_problem(tmp_path / "snapshot")
+    assert solver_config is None
+
+    meta = tmp_path / "snapshot" / "meta.json"
+    meta.write_text(meta.read_text().replace('"version": 1', '"version": 0'))
+    with pytest.raises(ValueError):
+        load_problem(tmp_path / "snapshot")
+
+
+def test_rolling_horizon_replay(database, tmp_path):
+    problem = prepare_problem(database.load(), START_DATE)
+    solver_config = SolverConfig(max_time_in_seconds=5, rolling_window=1, decompose=False)
+    save_problem(problem, tmp_path / "snapshot", solver_config)
+    loaded, loaded_config = load_problem(tmp_path / "snapshot")
+
+    # The windows take slices of the lazily read job order
+    expected = build_schedule(problem, solve_problem(problem, solver_config), solver_config)
+    assert build_schedule(loaded, solve_problem(loaded, loaded_config), loaded_config) == expected
@@ -0,0 +1,81 @@
+from datetime import datetime, time
+import pytest
+import scheduling_core
+from resource_calendars import clipped_hours
+from run_stats import RunStats
+from scheduling_core import DOWNTIME_ROUNDS, prepare_problem, solve, solve_problem
+from solver_config import SolverConfig
+
+START_DATE = datetime(2025, 3, 3)
+
+# Pieter works 09:00-11:00 on weekdays, so J1-20 (300 minutes) cannot run in one go; the shop works 07:00-16:00
+ROWS = """
+    INSERT INTO job VALUES (1, 'J1', '2025-03-07 16:00:00', 1, 100.0, 0, 0),
+                           (2, 'J2', '2025-03-07 16:00:00', 1, 50.0, 0, 0);
+    INSERT INTO task VALUES (1, 'J1-10', 'J1', 0, 60, NULL, 'Welders', 0),
+                            (2, 'J1-20', 'J1', 0, 300, 'J1-10', 'Pieter', 0),
+                            (3, 'J2-10', 'J2', 0, 90, NULL, 'Pieter', 0);
+    INSERT INTO resource VALUES (1, 'Pieter', 'H'), (2, 'Weld1', 'M'), (3, 'Weld2', 'M');
+    INSERT INTO resource_group VALUES (1, 'Welders', 0);
+    INSERT INTO resource_group_association VALUES (2, 1), (3, 1);
+    INSERT INTO resource_calendar VALUES
+        (1, 1, '09:00:00', '11:00:00'), (1, 2, '09:00:00', '11:00:00'), (1, 3, '09:00:00', '11:00:00'),
+        (1, 4, '09:00:00', '11:00:00'), (1, 5, '09:00:00', '11:00:00');
+"""
+
+
+@pytest.mark.parametrize("options", [
+    {"engine": "greedy"},
+    {"max_time_in_seconds": 5},
+    {"max_time_in_seconds": 5, "rolling_window": 1},
+])
+def test_long_task_pauses_over_resource_off_hours(database, options):
+    schedule = solve(database.load(), START_DATE, SolverConfig(**options))
+    rows = {row["task_number"]: row for row in schedule}
+
+    # J1-20 runs over several of Pieter's mornings instead of being pushed past the calendar
+    assert rows["J1-20"]["end_time"].date() > rows["J1-20"]["start_time"].date()
+    assert max(row["end_time"] for row in schedule) <= datetime(2025, 3, 6, 11)
+    pieter = sorted((row["start_time"], row["end_time"]) for row in schedule if row["resources_used"] == "Pieter")
+    assert all(time(9) <= start.time() and end.time() <= time(11) for start, end in pieter)
+    # J2-10 does not slip into the mornings Pieter keeps for J1-20
+    assert all(end <= next_start for (_, end), (next_start, _) in zip(pieter, pieter[1:]))
+
+
+def test_hours_outside_the_shop_are_reported(caplog):
+    working_hours = {day: (420, 960) for day in range(1, 6)}  # 07:00-16:00 on weekdays
+    resource_hours = {
+        1: {1: (540, 660), 2: (540, 660)},  # Inside the shop's hours
+        2: {1: (360, 900), 6: (480, 720)},  # Starts at 06:00 on Monday and works Saturday mornings
+        3: {5: (420, 1020)},  # Stays until 17:00 on Friday
+    }
+    assert clipped_hours(working_hours, resource_hours) == {2: [1, 6], 3: [5]}
+
+    scheduling_core.resource_calendars(START_DATE, working_hours, [1, 2, 3], resource_hours)
+    assert "Resource 2 works outside the shop's hours on weekdays [1, 6]" in caplog.text
+    assert "Resource 3 works outside the shop's hours on weekdays [5]" in caplog.text
+    assert "Resource 1 " not in caplog.text
+
+
+def test_schedule_that_keeps_running_through_downtime_fails(database, monkeypatch):
+    problem = prepare_problem(database.load(), START_DATE)
+    rounds = []
+
+    # Stands in for a solver that puts everything on Pieter on the first morning past the computed calendar,
+    # before his hours start, however much of the calendar it is given (the shop's days are 540 minutes)
+    def solve_split(split, solver_config, report, stop_event):
+        rounds.append(split["downtime_horizon"])
+        start = -(-split["downtime_horizon"] // 540) * 540
+        ends = [start + task["duration"] for task in split["tasks"]]
+        return {"status": "FEASIBLE", "feasible": True, "engine": "greedy", "wall_time": 0.0, "makespan": max(ends),
+                "starts": [start] * len(ends), "ends": ends, "assignments": [[1]] * len(ends)}
+
+    monkeypatch.setattr(scheduling_core, "_solve_split", solve_split)
+    stats = RunStats()
+    result = solve_problem(problem, SolverConfig(engine="greedy"), stats)
+
+    assert not result["feasible"]
+    assert stats.error == "Schedule runs through resource downtime"
+    # Solved once, then again after each of the DOWNTIME_ROUNDS extensions of the calendar
+    assert len(rounds) == DOWNTIME_ROUNDS + 1
+    assert rounds == sorted(set(rounds))
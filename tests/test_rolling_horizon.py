@@ -0,0 +1,58 @@
+from datetime import datetime
+from scheduler_model import solve_rolling_horizon
+from scheduling_core import prepare_problem
+from solver_config import SolverConfig
+
+RESOURCE_MAPPING = {"Pieter": 1, "Weld1": 2}
+
+# Three jobs that all need Pieter; J2 also welds before Pieter finishes it
+TASKS = [
+    {"task_id": ("J1", "J1-10"), "duration": 60, "resources": ["Pieter"], "predecessor_indices": []},
+    {"task_id": ("J2", "J2-10"), "duration": 30, "resources": ["Weld1"], "predecessor_indices": []},
+    {"task_id": ("J2", "J2-20"), "duration": 45, "resources": ["Pieter"], "predecessor_indices": [1]},
+    {"task_id": ("J3", "J3-10"), "duration": 20, "resources": ["Pieter"], "predecessor_indices": []},
+]
+
+# Promised dates put J3 first and J1 last; J2 has none
+ROWS = """
+    INSERT INTO job VALUES (1, 'J1', '2025-03-14 16:00:00', 1, 100.0, 0, 0),
+                           (2, 'J2', NULL, 1, 100.0, 0, 0),
+                           (3, 'J3', '2025-03-05 16:00:00', 1, 100.0, 0, 0);
+    INSERT INTO task VALUES (1, 'J1-10', 'J1', 0, 60, NULL, 'Pieter', 0),
+                            (2, 'J2-10', 'J2', 0, 30, NULL, 'Weld1', 0),
+                            (3, 'J2-20', 'J2', 0, 45, 'J2-10', 'Pieter', 0),
+                            (4, 'J3-10', 'J3', 0, 20, NULL, 'Pieter', 0);
+    INSERT INTO resource VALUES (1, 'Pieter', 'H'), (2, 'Weld1', 'M');
+"""
+
+CONFIG = SolverConfig(max_time_in_seconds=5, num_workers=1, decompose=False)
+
+
+def test_windows_take_the_most_urgent_jobs_first():
+    # J3, then J1, then J2, one job per window
+    result = solve_rolling_horizon(TASKS, [[3], [0], [1, 2]], 1, RESOURCE_MAPPING, {}, CONFIG,
+                                   log=lambda message: None)
+
+    assert result["feasible"] and result["window_count"] == 3
+    # Each window is fitted around the work the earlier ones committed on Pieter
+    assert (result["starts"][3], result["ends"][3]) == (0, 20)
+    assert (result["starts"][0], result["ends"][0]) == (20, 80)
+    assert result["starts"][1] == 0 and result["starts"][2] == 80
+    assert result["makespan"] == 125
+
+
+def test_frozen_work_blocks_every_window():
+    frozen = {3: {"start": 10, "end": 30, "resource_ids": [1]}}
+    result = solve_rolling_horizon(TASKS, [[3], [0], [1, 2]], 2, RESOURCE_MAPPING, {}, CONFIG,
+                                   frozen_tasks=frozen, log=lambda message: None)
+
+    assert result["window_count"] == 2
+    assert (result["starts"][3], result["ends"][3]) == (10, 30)
+    pieter = sorted((result["starts"][i], result["ends"][i]) for i in (0, 2, 3))
+    assert all(end <= start for (_, end), (start, _) in zip(pieter, pieter[1:]))
+
+
+def test_job_order_follows_promised_dates(database):
+    problem = prepare_problem(database.load(), datetime(2025, 3, 3))
+    order = [[problem["tasks"][i]["task_id"][1] for i in job] for job in problem["job_order"]]
+    assert order == [["J3-10"], ["J1-10"], ["J2-10", "J2-20"]]
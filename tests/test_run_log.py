@@ -0,0 +1,75 @@
+import threading
+from datetime import datetime
+from run_log import RingBufferHandler, bind_run, capture_log, get_logger
+from scheduling_core import solve
+from solver_config import SolverConfig
+
+logger = get_logger("test_run_log")
+
+# Two jobs on separate resources, so a decomposed solve relays its incumbents from a thread of its own
+ROWS = """
+    INSERT INTO job VALUES (1, 'J1', '2025-03-07 16:00:00', 1, 100.0, 0, 0),
+                           (2, 'J2', '2025-03-07 16:00:00', 1, 50.0, 0, 0);
+    INSERT INTO task VALUES (1, 'J1-10', 'J1', 0, 60, NULL, 'Weld1', 0),
+                            (2, 'J2-10', 'J2', 0, 90, NULL, 'Pieter', 0);
+    INSERT INTO resource VALUES (1, 'Pieter', 'H'), (2, 'Weld1', 'M');
+"""
+
+
+# Function to run one capture per name in threads of their own, all at the same time; returns the log lines.
+# A run that fails releases the others and its exception is raised here.
+def run_concurrently(target, names):
+    handlers = {name: RingBufferHandler() for name in names}
+    barrier = threading.Barrier(len(names), timeout=60)
+    errors = []
+
+    def run(name):
+        try:
+            with capture_log(handlers[name]):
+                barrier.wait()
+                target(name)
+                barrier.wait()
+        except BaseException as e:
+            errors.append(e)
+            barrier.abort()
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        # The run that failed first, rather than the ones it released
+        raise next((e for e in errors if not isinstance(e, threading.BrokenBarrierError)), errors[0])
+    return {name: handler.getvalue().splitlines() for name, handler in handlers.items()}
+
+
+def test_concurrent_captures_keep_their_own_records():
+    def target(name):
+        for k in range(50):
+            logger.info("run %s line %d", name, k)
+        # A thread the run starts logs into it once bound
+        helper = threading.Thread(target=bind_run(lambda: logger.info("run %s helper", name)))
+        helper.start()
+        helper.join()
+
+    logs = run_concurrently(target, ["A", "B"])
+    for name in ("A", "B"):
+        assert len(logs[name]) == 51
+        assert all(f"run {name} " in line for line in logs[name])
+        assert logs[name][-1].endswith(f"run {name} helper")
+
+
+def test_concurrent_solves_keep_their_own_incumbents(database):
+    data = database.load()
+    options = {"single": {}, "decomposed": {"decompose": True, "decompose_min_tasks": 1, "num_workers": 2}}
+
+    def target(name):
+        solve(data, datetime(2025, 3, 3), SolverConfig(**{"max_time_in_seconds": 5, "decompose": False, **options[name]}))
+
+    logs = run_concurrently(target, list(options))
+    for name, lines in logs.items():
+        assert sum("Solver parameters" in line for line in lines) == 1
+        assert any("Incumbent" in line for line in lines)
+    assert not any("components)" in line for line in logs["single"])
+    assert any("Solving 2 independent components" in line for line in logs["decomposed"])
@@ -0,0 +1,71 @@
+from datetime import datetime
+import pytest
+from run_stats import RunStats, current_rss_mb, reset_peak_rss
+from scheduling_core import solve
+from solver_config import SolverConfig
+
+# Two jobs on separate resources, so a decomposed solve has two components to hand to its pool
+ROWS = """
+    INSERT INTO job VALUES (1, 'J1', '2025-03-07 16:00:00', 1, 100.0, 0, 0),
+                           (2, 'J2', '2025-03-07 16:00:00', 1, 50.0, 0, 0);
+    INSERT INTO task VALUES (1, 'J1-10', 'J1', 0, 60, NULL, 'Weld1', 0),
+                            (2, 'J2-10', 'J2', 0, 90, NULL, 'Pieter', 0);
+    INSERT INTO resource VALUES (1, 'Pieter', 'H'), (2, 'Weld1', 'M');
+"""
+
+
+# Function to touch 256 MB and let it go again
+def allocate_memory():
+    block = bytearray(256 * 1024 * 1024)
+    block[::4096] = b"\1" * len(block[::4096])
+    del block
+
+
+def test_phase_peak_memory_is_the_phase_own():
+    if not reset_peak_rss():
+        pytest.skip("The peak resident memory cannot be reset on this system")
+    stats = RunStats(dedicated_process=True)
+    with stats.phase("allocate"):
+        allocate_memory()
+    with stats.phase("idle"):
+        pass
+    stats.finish("SUCCEEDED")
+
+    allocate, idle = stats.phases
+    assert allocate["peak_rss_mb"] - idle["peak_rss_mb"] > 200
+    assert allocate["peak_scope"] == idle["peak_scope"] == "phase"
+    assert stats.to_row()["peak_rss_mb"] == allocate["peak_rss_mb"]
+    assert stats.to_row()["peak_rss_scope"] == "phase"
+
+
+def test_shared_process_keeps_its_peak():
+    # A run sharing its process (e.g. the backend's thread mode) must not wipe the peak other runs measure
+    if current_rss_mb() is None:
+        pytest.skip("The resident memory is not available on this system")
+    other = RunStats(dedicated_process=True)
+    other.begin("solve")
+    stats = RunStats()
+    with stats.phase("allocate"):
+        allocate_memory()
+    with stats.phase("idle"):
+        pass
+    stats.finish("SUCCEEDED")
+    other.finish("SUCCEEDED")
+
+    allocate, idle = stats.phases
+    assert idle["peak_rss_mb"] >= allocate["peak_rss_mb"] > idle["baseline_rss_mb"] + 200
+    assert idle["peak_scope"] == "process" and stats.to_row()["peak_rss_scope"] == "process"
+    assert "(process-wide)" in stats.summary()
+    assert other.phases[0]["peak_rss_mb"] >= allocate["peak_rss_mb"]
+
+
+def test_decomposed_solve_reports_its_workers_memory(database):
+    stats = RunStats()
+    schedule = solve(database.load(), datetime(2025, 3, 3), SolverConfig(max_time_in_seconds=5, decompose=True,
+                                                                           decompose_min_tasks=1, num_workers=2),
+                     stats=stats)
+    stats.finish("SUCCEEDED")
+
+    assert len(schedule) == 2
+    assert stats.solver["component_count"] == 2
+    assert stats.to_row()["worker_peak_rss_mb"] > 0
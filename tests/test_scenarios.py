@@ -0,0 +1,58 @@
+from datetime import datetime
+import pytest
+import scenarios
+from data_sources import SnapshotSource, write_snapshot
+from scheduling_core import build_schedule, solve_problem
+from solver_config import SolverConfig
+
+START_DATE = datetime(2025, 3, 3)
+
+# Open job J1, blocked job J2 and completed job J3 (see the database fixture in conftest.py)
+ROWS = """
+    INSERT INTO job VALUES (1, 'J1', '2025-03-05 16:00:00', 1, 100.0, 0, 0),
+                           (2, 'J2', '2025-03-06 16:00:00', 2, 50.0, 0, 1),
+                           (3, 'J3', '2025-03-04 16:00:00', 1, 10.0, 1, 0);
+    INSERT INTO task VALUES (1, 'J1-10', 'J1', 10, 30, NULL, 'Welders', 0),
+                            (2, 'J1-20', 'J1', 0, 60, 'J1-10', 'Pieter', 0),
+                            (3, 'J2-10', 'J2', 15, 20, NULL, 'Welders', 0),
+                            (4, 'J2-20', 'J2', 0, 45, 'J2-10', 'Pieter', 0),
+                            (5, 'J3-10', 'J3', 0, 10, NULL, 'Pieter', 0);
+    INSERT INTO resource VALUES (1, 'Pieter', 'H'), (2, 'Weld1', 'M'), (3, 'Weld2', 'M');
+    INSERT INTO resource_group VALUES (1, 'Welders', 0);
+    INSERT INTO resource_group_association VALUES (2, 1), (3, 1);
+"""
+
+
+# Function to solve a scenario problem with the greedy engine and return the scheduled task numbers
+def scheduled_tasks(problem):
+    solver_config = SolverConfig(engine="greedy")
+    result = solve_problem(problem, solver_config)
+    return sorted(entry["task_number"] for entry in build_schedule(problem, result, solver_config))
+
+
+def test_database_source_leaves_out_blocked_jobs_by_default(database):
+    data = database.load()
+    assert list(data["jobs"]["job_number"]) == ["J1"]
+    assert list(data["tasks"]["task_number"]) == ["J1-10", "J1-20"]
+
+    base = scenarios.prepare_base(data, START_DATE)
+    with pytest.raises(ValueError):
+        scenarios.apply_deltas(base, [{"type": "unblock_job", "job": "J2"}])
+
+
+def test_unblock_job_loaded_from_database(database):
+    base = scenarios.prepare_base(database.load(include_blocked=True), START_DATE)
+
+    assert scheduled_tasks(scenarios.apply_deltas(base, [])) == ["J1-10", "J1-20"]
+    assert scheduled_tasks(scenarios.apply_deltas(base, [{"type": "unblock_job", "job": "J2"}])) == [
+        "J1-10", "J1-20", "J2-10", "J2-20"]
+
+
+def test_unblock_job_loaded_from_snapshot(database, tmp_path):
+    write_snapshot(database.load(include_blocked=True), tmp_path / "snapshot")
+    base = scenarios.prepare_base(SnapshotSource(tmp_path / "snapshot").load(), START_DATE)
+
+    assert scheduled_tasks(scenarios.apply_deltas(base, [{"type": "unblock_job", "job": "J2"}])) == [
+        "J1-10", "J1-20", "J2-10", "J2-20"]
+    assert scheduled_tasks(scenarios.apply_deltas(base, [{"type": "block_job", "job": "J1"},
+                                                         {"type": "unblock_job", "job": "J2"}])) == ["J2-10", "J2-20"]
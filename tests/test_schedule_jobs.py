@@ -0,0 +1,70 @@
+import json
+import os
+import signal
+import pytest
+import sqlalchemy as sa
+import schedule_jobs
+from data_sources import write_snapshot
+from schedule_jobs import main
+
+# J1 welds and then goes to Pieter; J2 is Pieter's alone
+ROWS = """
+    INSERT INTO job VALUES (1, 'J1', '2025-03-07 16:00:00', 1, 100.0, 0, 0),
+                           (2, 'J2', '2025-03-07 16:00:00', 1, 50.0, 0, 0);
+    INSERT INTO task VALUES (1, 'J1-10', 'J1', 0, 60, NULL, 'Weld1', 0),
+                            (2, 'J1-20', 'J1', 0, 30, 'J1-10', 'Pieter', 0),
+                            (3, 'J2-10', 'J2', 0, 45, NULL, 'Pieter', 0);
+    INSERT INTO resource VALUES (1, 'Pieter', 'H'), (2, 'Weld1', 'M');
+"""
+
+ARGS = ["--start-date", "2025-03-03", "--sink", "none", "--engine", "greedy", "--log-level", "ERROR"]
+
+
+# Function to write the test database to a snapshot directory that --source reads
+@pytest.fixture
+def snapshot(database, tmp_path):
+    write_snapshot(database.load(), tmp_path / "input")
+    return str(tmp_path / "input")
+
+
+def test_scheduled_run_exits_0(snapshot, capsys):
+    assert main(["--source", snapshot, "--json"] + ARGS) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result["ok"] and result["status"] == "SUCCEEDED"
+    assert sorted(entry["task_number"] for entry in result["schedule"]) == ["J1-10", "J1-20", "J2-10"]
+
+
+def test_failed_run_exits_1(database, tmp_path, capsys):
+    # J1-10 also waits on J1-20, so the predecessors form a cycle and nothing can be scheduled
+    with database.engine().begin() as conn:
+        conn.execute(sa.text("UPDATE task SET predecessors = 'J1-20' WHERE task_number = 'J1-10'"))
+    write_snapshot(database.load(), tmp_path / "input")
+
+    assert main(["--source", str(tmp_path / "input")] + ARGS) == 1
+    assert "Scheduling failed: Cycle in predecessor relationships" in capsys.readouterr().err
+
+
+def test_bad_arguments_exit_2(snapshot):
+    for argv in (["--time-limit", "-1"], ["--start-date", "03/03/2025"], ["--engine", "annealing"]):
+        with pytest.raises(SystemExit) as exit_info:
+            main(["--source", snapshot] + argv)
+        assert exit_info.value.code == 2
+
+
+def test_sigint_stops_the_search(snapshot, monkeypatch):
+    seen = {}
+
+    # Stands in for the run: a first Ctrl+C sets the stop event, a second one aborts
+    def run_schedule(start_date, solver_config, stop_event=None, **kwargs):
+        os.kill(os.getpid(), signal.SIGINT)
+        seen["stopped"] = stop_event.is_set()
+        with pytest.raises(KeyboardInterrupt):
+            os.kill(os.getpid(), signal.SIGINT)
+        return {"ok": True, "schedule": [], "solver": {"makespan": 0}}
+
+    monkeypatch.setattr(schedule_jobs, "run_schedule", run_schedule)
+    handler = signal.getsignal(signal.SIGINT)
+    assert main(["--source", snapshot] + ARGS) == 0
+    assert seen["stopped"]
+    # The previous handler is back once the run is over
+    assert signal.getsignal(signal.SIGINT) is handler
@@ -0,0 +1,193 @@
+import logging
+import queue
+import threading
+import pytest
+
+pytest.importorskip("tkcalendar")
+
+import scheduler_gui
+from run_log import RingBufferHandler
+from scheduler_gui import POLL_INTERVAL, SchedulerGUI
+
+# The worker thread and the queue it reports through are plain Python; these tests drive them on a
+# SchedulerGUI without a Tk window, with stand-ins that record what the main loop would show
+
+
+# Stand-in for a Tk widget that keeps its last options
+class Widget:
+    def __init__(self):
+        self.options = {}
+
+    def config(self, **options):
+        self.options.update(options)
+
+    def pack_forget(self):
+        pass
+
+
+# Stand-in for the console's Text widget: the text, with Tk's line.column indices
+class Text(Widget):
+    def __init__(self):
+        super().__init__()
+        self.text = ""
+
+    def insert(self, index, text):
+        self.text += text
+
+    def index(self, index):
+        lines = self.text.split("\n")
+        return f"{len(lines)}.{len(lines[-1])}"
+
+    def delete(self, first, last):
+        self.text = "\n".join(self.text.split("\n")[int(last.split(".")[0]) - 1:])
+
+    def yview(self, *args):
+        pass
+
+
+# Stand-in for the Tk root: after() callbacks are recorded rather than run
+class Root:
+    def __init__(self):
+        self.scheduled = []
+        self.destroyed = False
+
+    def after(self, delay, callback):
+        self.scheduled.append((delay, callback))
+
+    def destroy(self):
+        self.destroyed = True
+
+
+# Function to make a SchedulerGUI with just the state its worker, queue and console use
+def headless_gui():
+    gui = SchedulerGUI.__new__(SchedulerGUI)
+    gui.root = Root()
+    for name in ("status_label", "error_label", "progress_label", "schedule_button", "stop_button",
+                 "console_canvas"):
+        setattr(gui, name, Widget())
+    gui.console_text_area = Text()
+    gui.output_buffer = RingBufferHandler()
+    gui.console_sequence = 0
+    gui.matrix_active = False
+    gui.worker = None
+    gui.messages = queue.Queue()
+    gui.stop_event = threading.Event()
+    gui.closing = False
+    gui.results = []
+    gui.handle_schedule_result = gui.results.append
+    return gui
+
+
+# Function to run schedule_in_thread in a worker thread, as run_scheduler does, and wait for it
+def run_worker(gui):
+    gui.worker = threading.Thread(target=gui.schedule_in_thread, daemon=True,
+                                  args=(None, False, 0, True, None))
+    gui.worker.start()
+    gui.worker.join(timeout=10)
+
+
+# Function to take everything the worker put on the queue
+def drain(gui):
+    messages = []
+    while not gui.messages.empty():
+        messages.append(gui.messages.get_nowait())
+    return messages
+
+
+def test_worker_reports_through_the_queue(monkeypatch):
+    calls = {}
+
+    def schedule_jobs(start_date, output_buffer, progress, stop_event, **kwargs):
+        calls["thread"] = threading.current_thread()
+        calls["stop_event"] = stop_event
+        progress({"makespan": 120})
+        progress({"makespan": 90})
+        return [{"task_number": "J1-10"}]
+
+    monkeypatch.setattr(scheduler_gui, "schedule_jobs", schedule_jobs)
+    gui = headless_gui()
+    run_worker(gui)
+
+    # The run does not happen on the thread of the Tk main loop, and it can be stopped
+    assert calls["thread"] is not threading.main_thread()
+    assert calls["stop_event"] is gui.stop_event
+    assert drain(gui) == [("incumbent", {"makespan": 120}), ("incumbent", {"makespan": 90}),
+                          ("done", [{"task_number": "J1-10"}])]
+
+
+def test_worker_reports_its_error(monkeypatch):
+    def schedule_jobs(*args, **kwargs):
+        raise RuntimeError("Database unavailable")
+
+    monkeypatch.setattr(scheduler_gui, "schedule_jobs", schedule_jobs)
+    gui = headless_gui()
+    run_worker(gui)
+
+    [(kind, payload)] = drain(gui)
+    assert kind == "error" and payload.strip().splitlines()[-1] == "RuntimeError: Database unavailable"
+
+    gui.worker = object()
+    gui.messages.put((kind, payload))
+    gui.poll_worker()
+    assert gui.error_label.options["text"] == "RuntimeError: Database unavailable"
+    assert gui.status_label.options["text"] == "Scheduling failed."
+
+
+def test_poll_shows_the_latest_incumbent_and_the_result():
+    gui = headless_gui()
+    gui.worker = object()
+    event = {"objective": 100.0, "bound": 80.0, "makespan": 100, "elapsed": 1.5}
+
+    # While the run goes on, the poll only shows its progress and comes back
+    gui.messages.put(("incumbent", dict(event, objective=120.0, makespan=120)))
+    gui.messages.put(("incumbent", event))
+    gui.poll_worker()
+    assert gui.progress_label.options["text"] == ("Best so far: makespan 100, bound 80, gap 20.0%, "
+                                                  "makespan 100 min after 1.5 s")
+    assert gui.root.scheduled == [(POLL_INTERVAL, gui.poll_worker)]
+    assert gui.worker is not None and gui.results == []
+
+    gui.messages.put(("done", [{"task_number": "J1-10"}]))
+    gui.poll_worker()
+    assert gui.results == [[{"task_number": "J1-10"}]]
+    assert len(gui.root.scheduled) == 1
+    assert gui.worker is None
+    assert gui.schedule_button.options["state"] == "normal" and gui.stop_button.options["state"] == "disabled"
+
+
+def test_console_appends_only_new_lines(monkeypatch):
+    monkeypatch.setattr(scheduler_gui, "DEFAULT_CAPACITY", 3)
+    gui = headless_gui()
+    gui.output_buffer.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger("test_scheduler_gui")
+    logger.propagate = False
+    numbers = iter(range(1, 6))
+
+    def log(count):
+        logger.addHandler(gui.output_buffer)
+        for _ in range(count):
+            logger.warning("line %d", next(numbers))
+        logger.removeHandler(gui.output_buffer)
+
+    log(2)
+    gui.update_console()
+    assert gui.console_text_area.text == "line 1\nline 2\n"
+    # Nothing new: the console is left as it is
+    gui.update_console()
+    assert gui.console_text_area.text == "line 1\nline 2\n"
+    # The console keeps no more lines than the log buffer
+    log(3)
+    gui.update_console()
+    assert gui.console_text_area.text == "line 3\nline 4\nline 5\n"
+
+
+def test_closing_waits_for_the_run_to_stop():
+    gui = headless_gui()
+    gui.worker = object()
+    gui.close()
+    assert gui.stop_event.is_set() and not gui.root.destroyed
+
+    # The worker saves its best schedule and finishes; only then does the window go
+    gui.messages.put(("done", [{"task_number": "J1-10"}]))
+    gui.poll_worker()
+    assert gui.root.destroyed and gui.results == []
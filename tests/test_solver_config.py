@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import pytest
+from ortools.sat.python import cp_model
+from instance_generator import DEFAULT_START_DATE, generate_instance
+from run_stats import RunStats
+from scheduling_core import solve
+from solver_config import SolverConfig, parse_flag
+
+
+def test_parse_flag_is_strict():
+    assert [parse_flag(value) for value in (True, 1, "true", "Yes", " 1 ")] == [True] * 5
+    assert [parse_flag(value) for value in (False, 0, "false", "NO", "0")] == [False] * 5
+    for value in ("", "off", 2, 1.0, None, []):
+        with pytest.raises(ValueError):
+            parse_flag(value)
+
+
+def test_coerce_converts_json_settings():
+    coerced = SolverConfig.coerce({"max_time_in_seconds": "30", "num_workers": "4", "decompose": "false",
+                                   "engine": "Greedy", "search_branching": "fixed_search", "random_seed": None})
+    assert coerced == {"max_time_in_seconds": 30.0, "num_workers": 4, "decompose": False, "engine": "greedy",
+                       "search_branching": "FIXED_SEARCH"}
+    config = SolverConfig().updated(coerced)
+    assert config.max_time_in_seconds == 30.0 and config.num_workers == 4 and config.engine == "greedy"
+
+
+@pytest.mark.parametrize("values", [
+    {"max_time": 30},
+    {"max_time_in_seconds": "thirty"},
+    {"num_workers": 2.5},
+    {"num_workers": True},
+    {"log_search_progress": "maybe"},
+    {"objective": ["makespan"]},
+    ["max_time_in_seconds"],
+])
+def test_coerce_rejects_bad_settings(values):
+    with pytest.raises(ValueError):
+        SolverConfig.coerce(values)
+
+
+def test_updated_rejects_bad_names():
+    with pytest.raises(ValueError):
+        SolverConfig().updated(SolverConfig.coerce({"engine": "gurobi"}))
+
+
+def test_environment_then_flags_override_the_defaults():
+    assert SolverConfig().num_workers == (os.cpu_count() or 1)
+    config = SolverConfig.from_env({"SCHEDULER_MAX_TIME": "20", "SCHEDULER_NUM_WORKERS": "16",
+                                    "SCHEDULER_RELATIVE_GAP": "0.05", "SCHEDULER_RANDOM_SEED": "7",
+                                    "SCHEDULER_SEARCH_BRANCHING": "fixed_search", "SCHEDULER_LOG_SEARCH": "yes"})
+    assert (config.max_time_in_seconds, config.num_workers, config.relative_gap_limit, config.random_seed,
+            config.search_branching, config.log_search_progress) == (20.0, 16, 0.05, 7, "FIXED_SEARCH", True)
+
+    parser = SolverConfig.add_arguments(argparse.ArgumentParser())
+    flagged = config.updated(parser.parse_args(["--workers", "4", "--gap", "0.02"]))
+    # Flags that are not given keep the environment's values
+    assert (flagged.num_workers, flagged.relative_gap_limit, flagged.max_time_in_seconds) == (4, 0.02, 20.0)
+    with pytest.raises(ValueError):
+        SolverConfig.from_env({"SCHEDULER_NUM_WORKERS": "0"})
+
+
+def test_apply_sets_the_cp_sat_parameters():
+    config = SolverConfig(max_time_in_seconds=12, num_workers=3, relative_gap_limit=0.1, random_seed=5,
+                          search_branching="PORTFOLIO_SEARCH")
+    parameters = config.apply(cp_model.CpSolver()).parameters
+    assert (parameters.max_time_in_seconds, parameters.num_workers, parameters.relative_gap_limit,
+            parameters.random_seed) == (12, 3, 0.1, 5)
+    assert parameters.search_branching == cp_model.PORTFOLIO_SEARCH
+
+
+def test_run_records_its_solver_parameters():
+    config = SolverConfig(max_time_in_seconds=5, num_workers=2, relative_gap_limit=0.01, engine="greedy")
+    stats = RunStats()
+    solve(generate_instance(jobs=3), DEFAULT_START_DATE, config, stats=stats)
+    assert json.loads(stats.to_row()["solver_config"]) == config.to_dict()
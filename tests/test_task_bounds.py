@@ -0,0 +1,49 @@
+from greedy_scheduler import greedy_schedule
+from scheduler_model import build_model
+from task_bounds import compute_bounds, topological_order
+
+RESOURCE_MAPPING = {"Pieter": 1, "Weld1": 2}
+
+# J1 is a chain 10 -> 20 -> 30 with J1-20 released at minute 50; J2-10 also waits for J1-10
+TASKS = [
+    {"task_id": ("J1", "J1-10"), "duration": 30, "resources": ["Weld1"], "predecessor_indices": []},
+    {"task_id": ("J1", "J1-20"), "duration": 20, "resources": ["Pieter"], "predecessor_indices": [0], "release": 50},
+    {"task_id": ("J1", "J1-30"), "duration": 40, "resources": ["Weld1"], "predecessor_indices": [1]},
+    {"task_id": ("J2", "J2-10"), "duration": 10, "resources": ["Pieter"], "predecessor_indices": [0]},
+]
+
+
+def test_forward_and_backward_passes():
+    earliest, latest = compute_bounds(TASKS, 200)
+    # Earliest starts follow the chain and the release; latest starts leave room for every successor
+    assert earliest == [0, 50, 70, 30]
+    assert latest == [110, 140, 160, 190]
+
+
+def test_frozen_tasks_keep_their_place():
+    frozen = {1: {"start": 100, "end": 120, "resource_ids": [1]}}
+    earliest, latest = compute_bounds(TASKS, 200, frozen)
+    assert (earliest[1], latest[1]) == (100, 100)
+    assert earliest[2] == 120
+    # J1-10 no longer has to finish before the frozen J1-20, only before J2-10
+    assert latest[0] == 160
+
+
+def test_cycles_leave_tasks_out_of_the_order():
+    # J1-10 waiting for J1-30 closes the chain into a cycle, and J2-10 waits on the cycle
+    tasks = [dict(TASKS[0], predecessor_indices=[2])] + TASKS[1:]
+    order, _ = topological_order(tasks)
+    assert order == []
+    assert topological_order(TASKS)[0] == [0, 1, 3, 2]
+
+
+def test_model_domains_come_from_the_greedy_makespan():
+    greedy = greedy_schedule(TASKS, RESOURCE_MAPPING, {})
+    built = build_model(TASKS, RESOURCE_MAPPING, {}, log=lambda message: None)
+    assert built["horizon"] == greedy["makespan"] == 110
+
+    earliest, latest = compute_bounds(TASKS, built["horizon"])
+    domains = {var.name: list(var.domain) for var in built["model"].Proto().variables}
+    for i in range(len(TASKS)):
+        assert domains[f"start_{i}"] == [earliest[i], latest[i]]
+    assert domains["makespan"] == [0, 110]
@@ -0,0 +1,69 @@
+import pandas as pd
+from ortools.sat.python import cp_model
+from greedy_scheduler import greedy_schedule
+from scheduler_model import build_model
+from task_table import prepare_tasks, task_arrays
+
+JOBS = pd.DataFrame({
+    "job_number": ["J2", "J1", "J3", "J4"],
+    "quantity": [2, 1, 1, 1],
+    "completed": [False, False, True, False],
+    "blocked": [False, False, False, True],
+})
+
+TASKS = pd.DataFrame({
+    "job_number": ["J1", "J1", "J1", "J2", "J2", "J3", "J4"],
+    "task_number": ["J1-10", "J1-20", "J1-30", "J2-10", "J2-20", "J3-10", "J4-10"],
+    "setup_time": [10, 0, 0, 15, None, 0, 0],
+    "time_each": [30, 0, 45, 20, 7.5, 10, 10],
+    "resources": [["Welders"], ["Pieter"], ["Pieter"], ["Welders"], [], ["Pieter"], ["Pieter"]],
+    "predecessors": [[], ["J1-10"], ["J1-20", "J1-99"], [], ["J2-10", ""], [], []],
+    "completed": [False, True, False, False, False, False, False],
+})
+
+
+def test_prepare_tasks_drops_closed_work_and_keeps_job_order():
+    table, _ = prepare_tasks(JOBS, TASKS)
+    records = table.records()
+
+    # Completed J3, blocked J4 and the completed task J1-20 are left out; jobs keep the jobs_df order
+    assert [record["task_id"] for record in records] == [
+        ("J2", "J2-10"), ("J2", "J2-20"), ("J1", "J1-10"), ("J1", "J1-30")]
+    assert table.job_tasks() == {"J2": [0, 1], "J1": [2, 3]}
+    # setup_time + time_each * quantity, with a missing setup time as 0 and at least one minute
+    assert [record["duration"] for record in records] == [55, 15, 40, 45]
+    assert records[1]["resources"] == []
+
+
+def test_prepare_tasks_reports_missing_predecessors():
+    table, missing = prepare_tasks(JOBS, TASKS)
+    records = table.records()
+
+    assert records[1]["predecessor_indices"] == [0]
+    # J1-30 waits on the completed J1-20 and the unknown J1-99, neither of which is scheduled
+    assert records[3]["predecessor_indices"] == []
+    assert sorted(missing) == [(("J1", "J1-30"), ("J1", "J1-20")), (("J1", "J1-30"), ("J1", "J1-99"))]
+
+
+def test_task_arrays_of_a_list_match_the_table():
+    table, _ = prepare_tasks(JOBS, TASKS)
+    for packed, own in zip(task_arrays(table.records()), task_arrays(table)):
+        assert packed.tolist() == own.tolist()
+    assert task_arrays(table)[0] is table.durations
+
+
+def test_model_builders_take_the_table():
+    table, _ = prepare_tasks(JOBS, TASKS)
+    resource_mapping = {"Pieter": 1, "Weld1": 2, "Weld2": 3}
+    resource_group_mapping = {"Welders": [2, 3]}
+
+    greedy = greedy_schedule(table, resource_mapping, resource_group_mapping)
+    assert greedy == dict(greedy_schedule(table.records(), resource_mapping, resource_group_mapping),
+                          wall_time=greedy["wall_time"])
+    assert [end - start for start, end in zip(greedy["starts"], greedy["ends"])] == [55, 15, 40, 45]
+
+    built = build_model(table, resource_mapping, resource_group_mapping, log=lambda message: None)
+    solver = cp_model.CpSolver()
+    assert solver.Solve(built["model"]) == cp_model.OPTIMAL
+    # J2-20 follows J2-10 while the other welder does J1-10 and Pieter J1-30
+    assert solver.Value(built["makespan"]) == 70
@@ -0,0 +1,64 @@
+from datetime import datetime
+from scheduler_model import build_model
+from scheduling_core import prepare_problem, solve
+from solver_config import SolverConfig
+
+START_DATE = datetime(2025, 3, 3)
+
+# The previous schedule put J1-10 on Weld2 on Monday and J2-10 on Pieter on Tuesday; J3-10 is new and
+# takes a welder for over a day
+ROWS = """
+    INSERT INTO job VALUES (1, 'J1', '2025-03-07 16:00:00', 1, 100.0, 0, 0),
+                           (2, 'J2', '2025-03-07 16:00:00', 1, 100.0, 0, 0),
+                           (3, 'J3', '2025-03-07 16:00:00', 1, 100.0, 0, 0);
+    INSERT INTO task VALUES (1, 'J1-10', 'J1', 0, 60, NULL, 'Welders', 0),
+                            (2, 'J2-10', 'J2', 0, 30, NULL, 'Pieter', 0),
+                            (3, 'J3-10', 'J3', 0, 600, NULL, 'Welders', 0);
+    INSERT INTO resource VALUES (1, 'Pieter', 'H'), (2, 'Weld1', 'M'), (3, 'Weld2', 'M');
+    INSERT INTO resource_group VALUES (1, 'Welders', 0);
+    INSERT INTO resource_group_association VALUES (2, 1), (3, 1);
+    INSERT INTO schedule VALUES (1, 'J1-10', '2025-03-03 09:00:00', '2025-03-03 10:00:00', 'Weld2'),
+                                (2, 'J2-10', '2025-03-04 07:00:00', '2025-03-04 07:30:00', 'Pieter');
+"""
+
+
+# Function to read the solution hint of a model as variable name -> hinted value
+def hints(model):
+    proto = model.Proto()
+    return {proto.variables[var].name: value for var, value in zip(proto.solution_hint.vars, proto.solution_hint.values)}
+
+
+def test_previous_schedule_becomes_task_hints(database):
+    problem = prepare_problem(database.load(), START_DATE, warm_start=True)
+    hinted = {problem["tasks"][i]["task_id"][1]: hint for i, hint in problem["task_hints"].items()}
+
+    assert sorted(hinted) == ["J1-10", "J2-10"]
+    # Positions are elapsed working minutes: Monday 09:00 is two hours in, Tuesday 07:00 one shop day in
+    assert (hinted["J1-10"]["start"], hinted["J1-10"]["resource_ids"]) == (120, [3])
+    assert (hinted["J2-10"]["start"], hinted["J2-10"]["resource_ids"]) == (540, [1])
+
+    problem = prepare_problem(database.load(), START_DATE, warm_start=False)
+    assert problem["task_hints"] == {}
+
+
+def test_hints_seed_starts_and_group_members(database):
+    problem = prepare_problem(database.load(), START_DATE, warm_start=True)
+    built = build_model(problem["tasks"], problem["resource_mapping"], problem["resource_group_mapping"],
+                        task_hints=problem["task_hints"], hint_source="previous", log=lambda message: None)
+    hinted = hints(built["model"])
+
+    # The previous starts, which lie inside the tasks' domains, and the Weld2 member of the Welders for J1-10
+    assert hinted["start_0"] == 120 and hinted["start_1"] == 540
+    assert hinted["use_res_3_for_task_0"] == 1 and hinted["use_res_2_for_task_0"] == 0
+    # J3-10 was not in the previous schedule, so nothing is hinted for it
+    assert "start_2" not in hinted and not any(name.endswith("for_task_2") for name in hinted)
+
+
+def test_warm_started_solve_improves_on_the_hints(database):
+    config = SolverConfig(max_time_in_seconds=5, num_workers=1, decompose=False, hint_source="previous")
+    rows = {row["task_number"]: row for row in solve(database.load(), START_DATE, config, warm_start=True)}
+
+    # The hints only seed the search: J3-10 sets the makespan from the start, J1-10 fits on the other welder
+    assert rows["J3-10"]["start_time"] == datetime(2025, 3, 3, 7)
+    assert all(row["end_time"] <= rows["J3-10"]["end_time"] for row in rows.values())
+    assert rows["J1-10"]["resources_used"] != rows["J3-10"]["resources_used"]